@@ -0,0 +1,44 @@
+"""Import throughput with the default and with every date marker format enabled.
+
+Run from the repository root: ``python -m benchmarks.bench_marker_grammar``.
+"""
+
+from __future__ import annotations
+
+import time
+
+from brainmap_for_writing.importer import BUILTIN_MARKER_FORMATS, get_marker_grammar, import_txt_lines
+
+
+def _make_lines(blocks: int) -> list[str]:
+    lines: list[str] = []
+    for i in range(blocks):
+        lines.append(f"【{2200 + i // 336:04d}.{i // 28 % 12 + 1:02d}.{i % 28 + 1:02d}】\n")
+        lines.append("CNS 睿智在瓦卡拉狄 Ⅲ 上获得了惊人的发现 —— 行星充满了外星生命！\n")
+        lines.append("这是历史上第一次，我们遇到和地球完全不一样的生命形态。\n")
+        lines.append("\n")
+    return lines
+
+
+def _throughput(names: tuple[str, ...], lines: list[str], repeat: int = 3) -> float:
+    grammar = get_marker_grammar(names)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        import_txt_lines(lines, grammar=grammar)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def main() -> None:
+    lines = _make_lines(25_000)
+    all_names = tuple(BUILTIN_MARKER_FORMATS)
+    one = _throughput(all_names[:1], lines)
+    five = _throughput(all_names, lines)
+    print(f"lines: {len(lines)}")
+    print(f"1 pattern : {one:,.0f} lines/s")
+    print(f"{len(all_names)} patterns: {five:,.0f} lines/s ({five / one:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
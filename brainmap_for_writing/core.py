@@ -39,6 +39,7 @@ class Node:
     story_txt_path: Optional[str] = None
     x: float = 0.0
     y: float = 0.0
+    pinned: bool = False
 
 
 @dataclass
@@ -49,6 +50,24 @@ class Edge:
     collapsed: bool = False
 
 
+@dataclass
+class Bounds:
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+    def include(self, x: float, y: float) -> None:
+        if x < self.min_x:
+            self.min_x = x
+        if x > self.max_x:
+            self.max_x = x
+        if y < self.min_y:
+            self.min_y = y
+        if y > self.max_y:
+            self.max_y = y
+
+
 @dataclass
 class Graph:
     nodes: dict[str, Node] = field(default_factory=dict)
@@ -56,6 +75,14 @@ class Graph:
     legend: dict[str, str] = field(default_factory=dict)
     system_prompt: str = ""
     world_document: str = ""
+    marker_formats: list[str] = field(default_factory=list)
+    # Extent of placed node positions; None means "not computed yet". Kept
+    # conservative: it only grows until a full layout recomputes it.
+    bounds: Optional[Bounds] = field(default=None, compare=False, repr=False)
+
+    def include_position(self, x: float, y: float) -> None:
+        if self.bounds is not None:
+            self.bounds.include(x, y)
 
     def add_node(self, node: Node) -> None:
         self.nodes[node.id.value] = node
@@ -67,6 +94,17 @@ class Graph:
             raise ValueError(f"Unknown target node: {edge.target.value}")
         self.edges[edge.id.value] = edge
 
+    def add_edges(self, edges: Iterable[Edge]) -> list[Edge]:
+        batch = list(edges)
+        for edge in batch:
+            if edge.source.value not in self.nodes:
+                raise ValueError(f"Unknown source node: {edge.source.value}")
+            if edge.target.value not in self.nodes:
+                raise ValueError(f"Unknown target node: {edge.target.value}")
+        for edge in batch:
+            self.edges[edge.id.value] = edge
+        return batch
+
     def remove_edge(self, edge_id: EdgeId) -> None:
         self.edges.pop(edge_id.value, None)
 
@@ -153,6 +191,7 @@ def graph_to_dict(graph: Graph) -> dict[str, Any]:
         "legend": dict(graph.legend),
         "system_prompt": graph.system_prompt,
         "world_document": graph.world_document,
+        "marker_formats": list(graph.marker_formats),
         "nodes": [
             {
                 "id": n.id.value,
@@ -164,6 +203,7 @@ def graph_to_dict(graph: Graph) -> dict[str, Any]:
                 "story_txt_path": n.story_txt_path,
                 "x": n.x,
                 "y": n.y,
+                "pinned": n.pinned,
             }
             for n in graph.iter_nodes()
         ],
@@ -191,6 +231,7 @@ def graph_from_dict(data: dict[str, Any]) -> Graph:
     raw_legend = data.get("legend", {})
     raw_system_prompt = data.get("system_prompt", "")
     raw_world_document = data.get("world_document", "")
+    raw_marker_formats = data.get("marker_formats", [])
     if not isinstance(raw_nodes, list) or not isinstance(raw_edges, list):
         raise ValueError("Project data must contain 'nodes' and 'edges' arrays")
 
@@ -201,8 +242,14 @@ def graph_from_dict(data: dict[str, Any]) -> Graph:
         raise ValueError("Project data 'system_prompt' must be a string")
     if not isinstance(raw_world_document, str):
         raise ValueError("Project data 'world_document' must be a string")
-
-    graph = Graph(system_prompt=raw_system_prompt, world_document=raw_world_document)
+    if not isinstance(raw_marker_formats, list) or not all(isinstance(f, str) for f in raw_marker_formats):
+        raise ValueError("Project data 'marker_formats' must be an array of strings")
+
+    graph = Graph(
+        system_prompt=raw_system_prompt,
+        world_document=raw_world_document,
+        marker_formats=list(raw_marker_formats),
+    )
     for k, v in raw_legend.items():
         if isinstance(k, str) and isinstance(v, str):
             graph.legend[k] = v
@@ -268,6 +315,10 @@ def graph_from_dict(data: dict[str, Any]) -> Graph:
         else:
             raise ValueError("Node 'story_txt_path' must be a string or null")
 
+        raw_pinned = raw.get("pinned", False)
+        if not isinstance(raw_pinned, bool):
+            raise ValueError("Node 'pinned' must be a boolean")
+
         graph.add_node(
             Node(
                 id=NodeId(node_id),
@@ -279,6 +330,7 @@ def graph_from_dict(data: dict[str, Any]) -> Graph:
                 story_txt_path=story_txt_path,
                 x=float(x),
                 y=float(y),
+                pinned=raw_pinned,
             )
         )
 
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .layout import ProgressCallback
+
+
+@dataclass(frozen=True)
+class BundlingConfig:
+    # Each cycle doubles the number of segments per edge: 2, 4, 8, 16.
+    cycles: int = 4
+    # Iterations in the first cycle; every later cycle runs two thirds as many.
+    iterations: int = 30
+    # Fraction of the pull towards compatible edges applied per iteration.
+    step: float = 0.5
+    # Weight of the smoothing pull towards each point's neighbours on its own edge.
+    spring: float = 0.5
+    # Edges attract only when their compatibility (0..1) reaches this value.
+    compatibility: float = 0.6
+    # Strongest compatible edges kept per edge.
+    max_neighbours: int = 16
+    # Edges sampled from each neighbouring grid cell when looking for partners.
+    max_candidates_per_cell: int = 32
+
+
+_EPS = 1e-9
+
+_NEAR_DX, _NEAR_DY = (a.ravel() for a in np.meshgrid(np.arange(-1, 2), np.arange(-1, 2), indexing="ij"))
+
+
+def _report(progress: Optional[ProgressCallback], fraction: float) -> None:
+    if progress is not None:
+        progress(min(1.0, max(0.0, fraction)))
+
+
+def _candidate_pairs(mid: np.ndarray, cell_size: float, per_cell: int) -> tuple[np.ndarray, np.ndarray]:
+    # Edges whose midpoints fall in the same or adjacent grid cells, with at
+    # most ``per_cell`` evenly spaced members taken from each cell.
+    cell = np.floor((mid - mid.min(axis=0)) / cell_size).astype(np.int64)
+    span = int(cell[:, 1].max()) + 3
+    key = (cell[:, 0] + 1) * span + (cell[:, 1] + 1)
+    order = np.argsort(key, kind="stable")
+    keys, starts, counts = np.unique(key[order], return_index=True, return_counts=True)
+
+    wanted = key[:, None] + _NEAR_DX[None, :] * span + _NEAR_DY[None, :]
+    idx = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    who, col = np.nonzero(keys[idx] == wanted)
+    c = idx[who, col]
+    reps = np.minimum(counts[c], per_cell)
+    stride = counts[c] // reps
+    src = np.repeat(who, reps)
+    offsets = np.arange(int(reps.sum())) - np.repeat(np.cumsum(reps) - reps, reps)
+    other = order[np.repeat(starts[c], reps) + offsets * np.repeat(stride, reps)]
+    keep = other != src
+    return src[keep], other[keep]
+
+
+def edge_compatibility(
+    a0: np.ndarray, a1: np.ndarray, b0: np.ndarray, b1: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Angle, scale and position compatibility of edge pairs (Holten & van Wijk).
+
+    Returns the compatibility in ``[0, 1]`` and whether the second edge of
+    each pair runs in the opposite direction.
+    """
+    da = a1 - a0
+    db = b1 - b0
+    la = np.hypot(da[:, 0], da[:, 1])
+    lb = np.hypot(db[:, 0], db[:, 1])
+    dot = (da * db).sum(axis=1)
+    angle = np.abs(dot) / (la * lb + _EPS)
+    avg = (la + lb) * 0.5
+    scale = 2.0 / (avg / (np.minimum(la, lb) + _EPS) + np.maximum(la, lb) / (avg + _EPS))
+    gap = ((a0 + a1) - (b0 + b1)) * 0.5
+    position = avg / (avg + np.hypot(gap[:, 0], gap[:, 1]) + _EPS)
+    return angle * scale * position, dot < 0.0
+
+
+def _subdivide(points: np.ndarray) -> np.ndarray:
+    # Insert the midpoint of every segment, keeping the endpoints.
+    n, m, _ = points.shape
+    out = np.empty((n, 2 * m - 1, 2), dtype=points.dtype)
+    out[:, 0::2] = points
+    out[:, 1::2] = (points[:, :-1] + points[:, 1:]) * 0.5
+    return out
+
+
+def bundle_edges(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    config: Optional[BundlingConfig] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> np.ndarray:
+    """Route edges as polylines pulled together into shared bundles.
+
+    A force-directed scheme after Holten & van Wijk: each edge is split into
+    segments whose inner points are attracted towards the corresponding
+    points of its most compatible neighbours (similar direction, length and
+    position), while a spring keeps every edge smooth. Compatible partners
+    are found through a uniform grid over edge midpoints, so the cost grows
+    with the number of edges rather than its square.
+
+    ``sources`` and ``targets`` are ``(n, 2)`` endpoint arrays. Returns an
+    ``(n, 2**cycles + 1, 2)`` array of polyline points from source to target.
+    """
+    cfg = config or BundlingConfig()
+    a = np.asarray(sources, dtype=np.float64).reshape(-1, 2)
+    b = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+    points = np.stack((a, b), axis=1)
+    n = len(points)
+    _report(progress, 0.0)
+    if n < 2:
+        for _ in range(cfg.cycles):
+            points = _subdivide(points)
+        _report(progress, 1.0)
+        return points
+
+    lengths = np.hypot(*(b - a).T)
+    cell_size = float(np.median(lengths[lengths > 0])) if np.any(lengths > 0) else 1.0
+    src, dst = _candidate_pairs((a + b) * 0.5, cell_size, cfg.max_candidates_per_cell)
+    compat, flip = edge_compatibility(a[src], b[src], a[dst], b[dst])
+    keep = compat >= cfg.compatibility
+    src, dst, compat, flip = src[keep], dst[keep], compat[keep], flip[keep]
+
+    # Keep the strongest partners of each edge.
+    order = np.lexsort((-compat, src))
+    src, dst, compat, flip = src[order], dst[order], compat[order], flip[order]
+    first = np.searchsorted(src, src, side="left")
+    keep = np.arange(len(src)) - first < cfg.max_neighbours
+    src, dst, compat, flip = src[keep], dst[keep], compat[keep], flip[keep]
+    weight_sum = np.bincount(src, weights=compat, minlength=n) + 1.0
+    _report(progress, 0.0)
+
+    iterations = [max(1, int(round(cfg.iterations * (2.0 / 3.0) ** c))) for c in range(cfg.cycles)]
+    total = float(sum(iterations))
+    done = 0
+    for cycle in range(cfg.cycles):
+        points = _subdivide(points)
+        m = points.shape[1] - 2
+        step = cfg.step * (0.5**cycle)
+        rows = (src[:, None] * m + np.arange(m)[None, :]).ravel()
+        for _ in range(iterations[cycle]):
+            inner = points[:, 1:-1]
+            partner = points[dst, 1:-1]
+            partner[flip] = partner[flip, ::-1]
+            pull = (partner - inner[src]) * compat[:, None, None]
+            attract = np.stack(
+                (
+                    np.bincount(rows, weights=pull[:, :, 0].ravel(), minlength=n * m),
+                    np.bincount(rows, weights=pull[:, :, 1].ravel(), minlength=n * m),
+                ),
+                axis=1,
+            ).reshape(n, m, 2) / weight_sum[:, None, None]
+            smooth = (points[:, :-2] + points[:, 2:]) * 0.5 - inner
+            points[:, 1:-1] = inner + step * attract + cfg.spring * smooth
+            done += 1
+            _report(progress, done / total)
+    return points
+
+
+def spatial_chunks(points: np.ndarray, chunk_size: int) -> list[np.ndarray]:
+    """Split edges into groups of at most ``chunk_size`` that lie close together.
+
+    Edges are ordered by the grid cell of their midpoint (``points`` as
+    returned by :func:`bundle_edges`) so every group covers a compact area.
+    """
+    n = len(points)
+    if n == 0:
+        return []
+    mid = points[:, points.shape[1] // 2]
+    side = max(1, int(np.ceil(np.sqrt(n / max(chunk_size, 1)))))
+    lo = mid.min(axis=0)
+    span = np.maximum(mid.max(axis=0) - lo, _EPS)
+    cell = np.minimum((mid - lo) / span * side, side - 1).astype(np.int64)
+    # Serpentine row order keeps consecutive cells adjacent.
+    column = np.where(cell[:, 1] % 2 == 0, cell[:, 0], side - 1 - cell[:, 0])
+    order = np.lexsort((column, cell[:, 1]))
+    return [order[i : i + chunk_size] for i in range(0, n, chunk_size)]
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+from bisect import bisect_left, insort
 from collections import defaultdict
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Iterable, Union
+
+import numpy as np
 
 from .core import Edge
 
 
+def _curve_slot(position: int, size: int) -> int:
+    """Curve index of the ``position``-th edge (by id) in a group of ``size``."""
+    if size == 1:
+        return 0
+    k = position // 2 + 1
+    return k if position % 2 == 0 else -k
+
+
 def compute_parallel_edge_indices(edges: Iterable[Edge]) -> dict[str, int]:
     groups: dict[tuple[str, str], list[Edge]] = defaultdict(list)
     for e in edges:
@@ -14,22 +26,175 @@ def compute_parallel_edge_indices(edges: Iterable[Edge]) -> dict[str, int]:
     result: dict[str, int] = {}
     for _, group in groups.items():
         group_sorted = sorted(group, key=lambda e: e.id.value)
-
-        indices: list[int] = []
-        if len(group_sorted) == 1:
-            indices = [0]
-        else:
-            k = 1
-            while len(indices) < len(group_sorted):
-                indices.append(k)
-                if len(indices) < len(group_sorted):
-                    indices.append(-k)
-                k += 1
-
-        for e, idx in zip(group_sorted, indices, strict=False):
-            result[e.id.value] = idx
+        for position, e in enumerate(group_sorted):
+            result[e.id.value] = _curve_slot(position, len(group_sorted))
     return result
 
 
-def curve_step(node_radius: float, edge_width: float) -> float:
-    return max(32.0, node_radius * 1.7 + edge_width * 16.0)
+class ParallelEdgeIndex:
+    """Curve indices of parallel edges, maintained as edges come and go.
+
+    Edges are grouped by ``(source, target)`` and ordered by id within a
+    group, giving the same indices as :func:`compute_parallel_edge_indices`.
+    :meth:`add` and :meth:`remove` cost O(group size) and return the edges
+    whose index changed, so callers only re-route those.
+    """
+
+    def __init__(self, edges: Iterable[Edge] = ()) -> None:
+        self._groups: dict[tuple[str, str], list[str]] = defaultdict(list)
+        self._keys: dict[str, tuple[str, str]] = {}
+        self._indices: dict[str, int] = {}
+        for edge in edges:
+            key = (edge.source.value, edge.target.value)
+            if edge.id.value not in self._keys:
+                self._keys[edge.id.value] = key
+                self._groups[key].append(edge.id.value)
+        for group in self._groups.values():
+            group.sort()
+            for position, edge_id in enumerate(group):
+                self._indices[edge_id] = _curve_slot(position, len(group))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, edge_id: object) -> bool:
+        return edge_id in self._keys
+
+    def curve_index(self, edge_id: str) -> int:
+        return self._indices.get(edge_id, 0)
+
+    def siblings(self, edge_id: str) -> list[str]:
+        key = self._keys.get(edge_id)
+        return list(self._groups[key]) if key is not None else []
+
+    def add(self, edge: Edge) -> dict[str, int]:
+        """Insert ``edge``; return the new index of every edge that changed, itself included."""
+        edge_id = edge.id.value
+        if edge_id in self._keys:
+            return {}
+        key = (edge.source.value, edge.target.value)
+        self._keys[edge_id] = key
+        group = self._groups[key]
+        insort(group, edge_id)
+        return self._reindex(group)
+
+    def remove(self, edge_id: str) -> dict[str, int]:
+        """Drop ``edge_id``; return the new index of every remaining sibling that changed."""
+        key = self._keys.pop(edge_id, None)
+        if key is None:
+            return {}
+        self._indices.pop(edge_id, None)
+        group = self._groups[key]
+        del group[bisect_left(group, edge_id)]
+        if not group:
+            del self._groups[key]
+            return {}
+        return self._reindex(group)
+
+    def _reindex(self, group: list[str]) -> dict[str, int]:
+        changed: dict[str, int] = {}
+        for position, edge_id in enumerate(group):
+            index = _curve_slot(position, len(group))
+            if self._indices.get(edge_id) != index:
+                self._indices[edge_id] = index
+                changed[edge_id] = index
+        return changed
+
+
+def curve_step(
+    node_radius: Union[float, np.ndarray], edge_width: Union[float, np.ndarray]
+) -> Union[float, np.ndarray]:
+    """Offset between neighbouring parallel curves; accepts scalars or arrays."""
+    return np.maximum(32.0, np.multiply(node_radius, 1.7) + np.multiply(edge_width, 16.0))
+
+
+# Arrowhead and endpoint padding, and where along the curve the toggle sits.
+_START_GAP = 6.0
+_END_GAP = 8.0
+_TOGGLE_T = 0.55
+
+
+@dataclass(frozen=True)
+class EdgeGeometry:
+    """Geometry of ``n`` edges as ``(n, 2)`` point arrays.
+
+    Each edge is the quadratic curve ``start`` -> ``control`` -> ``end``.
+    ``toggle`` is the point on the curve where the collapse button sits and
+    ``toggle_control`` the control point of the curve's first part up to it.
+    ``arrow`` holds the tip, left and right corners of each arrowhead as
+    ``(n, 3, 2)``. Rows where ``valid`` is False have (nearly) coincident
+    endpoints and no drawable geometry.
+    """
+
+    valid: np.ndarray
+    start: np.ndarray
+    control: np.ndarray
+    end: np.ndarray
+    toggle_control: np.ndarray
+    toggle: np.ndarray
+    arrow: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def packed(self) -> np.ndarray:
+        """All points as one ``(n, 16)`` array of x, y pairs in field order.
+
+        Converting this with ``tolist()`` is much cheaper than converting
+        each field separately when handing rows to per-item code.
+        """
+        return np.hstack(
+            (self.start, self.control, self.end, self.toggle_control, self.toggle, self.arrow.reshape(-1, 6))
+        )
+
+
+def compute_edge_geometry(
+    source: np.ndarray,
+    target: np.ndarray,
+    source_radius: np.ndarray,
+    target_radius: np.ndarray,
+    curve_index: np.ndarray,
+    edge_width: float,
+) -> EdgeGeometry:
+    """Curves, toggle points and arrowheads for many edges in one pass.
+
+    ``source`` and ``target`` are ``(n, 2)`` centres of the endpoint nodes;
+    radii and curve indices are length ``n``.
+    """
+    a = np.asarray(source, dtype=np.float64).reshape(-1, 2)
+    b = np.asarray(target, dtype=np.float64).reshape(-1, 2)
+    rs = np.asarray(source_radius, dtype=np.float64).reshape(-1, 1)
+    rt = np.asarray(target_radius, dtype=np.float64).reshape(-1, 1)
+    k = np.asarray(curve_index, dtype=np.float64).reshape(-1, 1)
+
+    d = b - a
+    length = np.hypot(d[:, 0], d[:, 1])[:, None]
+    valid = length[:, 0] >= 1.0
+    u = d / np.where(length > 0.0, length, 1.0)
+    normal = np.column_stack((-u[:, 1], u[:, 0]))
+
+    start = a + u * (rs + _START_GAP)
+    end = b - u * (rt + _END_GAP)
+    control = (start + end) * 0.5 + normal * (k * curve_step(rs, edge_width))
+
+    toggle_control = start + (control - start) * _TOGGLE_T
+    lead_out = control + (end - control) * _TOGGLE_T
+    toggle = toggle_control + (lead_out - toggle_control) * _TOGGLE_T
+
+    tangent = end - control
+    tangent_len = np.hypot(tangent[:, 0], tangent[:, 1])[:, None]
+    direction = np.where(tangent_len > 0.0, tangent / np.where(tangent_len > 0.0, tangent_len, 1.0), (1.0, 0.0))
+    size = np.maximum(12.0, rs * 1.1)
+    back = end - direction * size
+    side = np.column_stack((-direction[:, 1], direction[:, 0])) * (size * 0.5)
+    arrow = np.stack((end, back + side, back - side), axis=1)
+
+    return EdgeGeometry(
+        valid=valid,
+        start=start,
+        control=control,
+        end=end,
+        toggle_control=toggle_control,
+        toggle=toggle,
+        arrow=arrow,
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Callable, Iterable, Optional
 
 from .core import Edge, Graph, Node
 
@@ -12,12 +12,24 @@ class DeleteSnapshot:
     edges: tuple[Edge, ...]
 
 
-def delete_nodes_and_edges(graph: Graph, node_ids: Iterable[str], edge_ids: Iterable[str]) -> DeleteSnapshot:
+def delete_nodes_and_edges(
+    graph: Graph,
+    node_ids: Iterable[str],
+    edge_ids: Iterable[str],
+    incident_edges: Optional[Callable[[Iterable[str]], Iterable[str]]] = None,
+) -> DeleteSnapshot:
+    """Remove nodes, their incident edges and the given edges from ``graph``.
+
+    ``incident_edges`` maps node ids to the ids of edges touching them (e.g.
+    an adjacency index); without it every edge in the graph is scanned.
+    """
     node_id_set = {nid for nid in node_ids if isinstance(nid, str) and nid}
     edge_id_set = {eid for eid in edge_ids if isinstance(eid, str) and eid}
 
     incident_edge_ids: set[str] = set()
-    if node_id_set:
+    if node_id_set and incident_edges is not None:
+        incident_edge_ids.update(incident_edges(node_id_set))
+    elif node_id_set:
         for e in graph.iter_edges():
             if e.source.value in node_id_set or e.target.value in node_id_set:
                 incident_edge_ids.add(e.id.value)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, TextIO
+
+from .core import Graph, Node
+from .importer import DateMarkerGrammar, escape_text_line, get_marker_grammar
+from .visibility import compute_visible_nodes
+
+
+def format_date_marker(dt: datetime, grammar: Optional[DateMarkerGrammar] = None) -> str:
+    """``dt`` as a marker ``grammar`` (default: the bracket format) reads back."""
+    return (grammar or get_marker_grammar()).render(dt)
+
+
+def export_txt(
+    graph: Graph,
+    out: TextIO,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    visible_only: bool = False,
+    grammar: Optional[DateMarkerGrammar] = None,
+) -> int:
+    """Write nodes as marker-separated text that the importer reads back.
+
+    Markers are written in the first format of ``grammar`` (default: the
+    graph's formats), the grammar the file is read back with. Text lines
+    it would take for a marker, and blank lines inside undated text, are
+    escaped so every node round-trips as one node. Matching nodes are
+    collected and sorted before writing, so memory grows with one
+    reference per exported node; texts are streamed, not copied.
+    """
+    if grammar is None:
+        grammar = get_marker_grammar(graph.marker_formats)
+    visible = compute_visible_nodes(graph) if visible_only else None
+    ranged = start is not None or end is not None
+
+    dated: list[Node] = []
+    undated: list[Node] = []
+    for node in graph.iter_nodes():
+        if visible is not None and node.id.value not in visible:
+            continue
+        if node.event_date is None:
+            if not ranged and node.text.strip():
+                undated.append(node)
+            continue
+        if start is not None and node.event_date < start:
+            continue
+        if end is not None and node.event_date > end:
+            continue
+        dated.append(node)
+
+    # Undated blocks must precede the first marker, otherwise the importer
+    # would fold them into the preceding dated block.
+    undated.sort(key=lambda n: n.id.value)
+    dated.sort(key=lambda n: (n.event_date, n.id.value))
+
+    written = 0
+    for node in undated:
+        if written:
+            out.write("\n")
+        _write_text(out, node.text.strip(), grammar, escape_blank=True)
+        written += 1
+
+    for node in dated:
+        assert node.event_date is not None
+        if written:
+            out.write("\n")
+        out.write(format_date_marker(node.event_date, grammar))
+        out.write("\n")
+        text = node.text.strip()
+        if text:
+            _write_text(out, text, grammar, escape_blank=False)
+        written += 1
+    return written
+
+
+def _write_text(out: TextIO, text: str, grammar: DateMarkerGrammar, escape_blank: bool) -> None:
+    for line in text.split("\n"):
+        out.write(escape_text_line(line, grammar, escape_blank))
+        out.write("\n")
+
+
+def export_txt_file(
+    path: str,
+    graph: Graph,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    visible_only: bool = False,
+    grammar: Optional[DateMarkerGrammar] = None,
+) -> int:
+    with open(path, "w", encoding="utf-8") as f:
+        return export_txt(graph, f, start=start, end=end, visible_only=visible_only, grammar=grammar)
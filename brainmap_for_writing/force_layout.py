@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .core import Graph
+
+
+@dataclass(frozen=True)
+class ForceLayoutConfig:
+    spring_length: float = 120.0
+    spring_strength: float = 0.04
+    repulsion: float = 9000.0
+    gravity: float = 0.002
+    initial_temperature: float = 60.0
+    cooling: float = 0.97
+    min_temperature: float = 0.5
+    # Average nodes per quadtree cell below which a neighbourhood is
+    # resolved exactly, and the deepest level cells are split to.
+    leaf_size: int = 4
+    max_depth: int = 20
+
+
+_EPS = 1e-6
+
+# Cell offsets: the 6x6 block of children of the parent's neighbours, and the
+# 3x3 neighbourhood resolved exactly where a node stops descending.
+_FAR_DX, _FAR_DY = (a.ravel() for a in np.meshgrid(np.arange(6), np.arange(6), indexing="ij"))
+_NEAR_DX, _NEAR_DY = (a.ravel() for a in np.meshgrid(np.arange(-1, 2), np.arange(-1, 2), indexing="ij"))
+
+
+def _accumulate(force: np.ndarray, targets: np.ndarray, dx: np.ndarray, dy: np.ndarray, weight: np.ndarray, k: float) -> None:
+    scale = k * weight / (dx * dx + dy * dy + _EPS)
+    n = len(force)
+    force[:, 0] += np.bincount(targets, weights=dx * scale, minlength=n)
+    force[:, 1] += np.bincount(targets, weights=dy * scale, minlength=n)
+
+
+def _lookup(keys: np.ndarray, wanted: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    idx = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    return idx, keys[idx] == wanted
+
+
+def barnes_hut_repulsion(pos: np.ndarray, k: float, leaf_size: int = 4, max_depth: int = 20) -> np.ndarray:
+    """Approximate all-pairs ``k / d`` repulsion on a quadtree in O(n log n).
+
+    The tree is implicit: level ``L`` is a ``2**L`` grid over the bounding
+    square. At each level a node interacts with the aggregated centre of mass
+    of every cell that is well separated from its own cell but whose parent
+    was not (at most 27 cells), which is the Barnes-Hut opening criterion for
+    theta ~ 0.7. A node descends only while its 3x3 neighbourhood holds more
+    than ``leaf_size`` points per cell on average; then it interacts exactly
+    with that neighbourhood. Dense clusters are thus refined further than
+    sparse areas, so an outlier stretching the bounding square does not
+    crowd everything into a few cells. Only points closer together than
+    ``2**-max_depth`` of the square still interact exactly in bulk.
+    """
+    n = len(pos)
+    force = np.zeros((n, 2), dtype=np.float64)
+    if n < 2:
+        return force
+
+    lo = pos.min(axis=0)
+    span = float((pos.max(axis=0) - lo).max()) or 1.0
+    depth = max(1, max_depth)
+    grid = 1 << depth
+    cell = np.clip(((pos - lo) / span * grid).astype(np.int64), 0, grid - 1)
+    ix = cell[:, 0]
+    iy = cell[:, 1]
+    near_limit = 9 * max(leaf_size, 1)
+    active = np.arange(n)
+
+    for level in range(1, depth + 1):
+        shift = depth - level
+        g = 1 << level
+        cx = ix >> shift
+        cy = iy >> shift
+        key = cx * g + cy
+        order = np.argsort(key, kind="stable")
+        keys, starts, counts = np.unique(key[order], return_index=True, return_counts=True)
+        inv = np.searchsorted(keys, key)
+        mass = counts.astype(np.float64)
+        com_x = np.bincount(inv, weights=pos[:, 0]) / mass
+        com_y = np.bincount(inv, weights=pos[:, 1]) / mass
+        ax = cx[active]
+        ay = cy[active]
+
+        tx = (((ax >> 1) << 1) - 2)[:, None] + _FAR_DX[None, :]
+        ty = (((ay >> 1) << 1) - 2)[:, None] + _FAR_DY[None, :]
+        ok = (np.abs(tx - ax[:, None]) > 1) | (np.abs(ty - ay[:, None]) > 1)
+        ok &= (tx >= 0) & (tx < g) & (ty >= 0) & (ty < g)
+        row, col = np.nonzero(ok)
+        c, hit = _lookup(keys, tx[row, col] * g + ty[row, col])
+        who = active[row[hit]]
+        c = c[hit]
+        if len(who):
+            _accumulate(force, who, pos[who, 0] - com_x[c], pos[who, 1] - com_y[c], mass[c], k)
+
+        # The 3x3 neighbourhood: resolved exactly once small enough,
+        # otherwise split into the next level's far and near cells.
+        tx = ax[:, None] + _NEAR_DX[None, :]
+        ty = ay[:, None] + _NEAR_DY[None, :]
+        row, col = np.nonzero((tx >= 0) & (tx < g) & (ty >= 0) & (ty < g))
+        c, hit = _lookup(keys, tx[row, col] * g + ty[row, col])
+        row = row[hit]
+        c = c[hit]
+        near = np.bincount(row, weights=counts[c], minlength=len(active))
+        done = (near <= near_limit) | (level == depth)
+        pick = done[row]
+        who = active[row[pick]]
+        c = c[pick]
+        reps = counts[c]
+        src = np.repeat(who, reps)
+        offsets = np.arange(int(reps.sum())) - np.repeat(np.cumsum(reps) - reps, reps)
+        other = order[np.repeat(starts[c], reps) + offsets]
+        keep = other != src
+        src = src[keep]
+        other = other[keep]
+        _accumulate(force, src, pos[src, 0] - pos[other, 0], pos[src, 1] - pos[other, 1], np.ones(len(src)), k)
+
+        active = active[~done]
+        if not len(active):
+            break
+    return force
+
+
+class ForceLayout:
+    """Incremental force-directed simulation over a snapshot of the graph.
+
+    Call :meth:`step` repeatedly (e.g. from a timer) and :meth:`apply` to
+    write positions back to the nodes. Pinned nodes never move.
+    """
+
+    def __init__(self, graph: Graph, pinned: Iterable[str] = (), config: Optional[ForceLayoutConfig] = None) -> None:
+        self.config = config or ForceLayoutConfig()
+        self._graph = graph
+        self.node_ids: list[str] = list(graph.nodes.keys())
+        self._index = {nid: i for i, nid in enumerate(self.node_ids)}
+        self.positions = np.array(
+            [(graph.nodes[nid].x, graph.nodes[nid].y) for nid in self.node_ids], dtype=np.float64
+        ).reshape(-1, 2)
+        pinned_set = set(pinned)
+        self.pinned = np.array(
+            [nid in pinned_set or graph.nodes[nid].pinned for nid in self.node_ids], dtype=bool
+        )
+
+        src: list[int] = []
+        dst: list[int] = []
+        for edge in graph.iter_edges():
+            s = self._index.get(edge.source.value)
+            t = self._index.get(edge.target.value)
+            if s is None or t is None or s == t:
+                continue
+            src.append(s)
+            dst.append(t)
+        self._src = np.asarray(src, dtype=np.int64)
+        self._dst = np.asarray(dst, dtype=np.int64)
+
+        # Separate coincident nodes (e.g. freshly imported at the origin).
+        if len(self.positions):
+            rng = np.random.default_rng(0)
+            _, first, inverse = np.unique(self.positions, axis=0, return_index=True, return_inverse=True)
+            dup = np.arange(len(self.positions)) != first[inverse.reshape(-1)]
+            dup &= ~self.pinned
+            self.positions[dup] += rng.normal(scale=self.config.spring_length * 0.5, size=(int(dup.sum()), 2))
+        self.temperature = self.config.initial_temperature
+
+    @property
+    def converged(self) -> bool:
+        return self.temperature <= self.config.min_temperature
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        return self._index.get(node_id)
+
+    def step(self, held: Optional[np.ndarray] = None) -> float:
+        """Advance one iteration and return the largest displacement.
+
+        ``held`` is an optional extra boolean mask of nodes to keep in place
+        for this step only (e.g. nodes the user is dragging).
+        """
+        cfg = self.config
+        pos = self.positions
+        n = len(pos)
+        if n == 0:
+            return 0.0
+
+        force = barnes_hut_repulsion(pos, cfg.repulsion, cfg.leaf_size, cfg.max_depth)
+
+        if len(self._src):
+            d = pos[self._dst] - pos[self._src]
+            dist = np.sqrt((d * d).sum(axis=1)) + _EPS
+            pull = (cfg.spring_strength * (dist - cfg.spring_length) / dist)[:, None] * d
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(self._src, weights=pull[:, axis], minlength=n)
+                force[:, axis] -= np.bincount(self._dst, weights=pull[:, axis], minlength=n)
+
+        force -= cfg.gravity * (pos - pos.mean(axis=0))
+
+        length = np.sqrt((force * force).sum(axis=1)) + _EPS
+        disp = force * (np.minimum(length, self.temperature) / length)[:, None]
+        frozen = self.pinned if held is None else (self.pinned | held)
+        disp[frozen] = 0.0
+        pos += disp
+        self.temperature = max(cfg.min_temperature, self.temperature * cfg.cooling)
+        return float(np.sqrt((disp * disp).sum(axis=1)).max())
+
+    def set_position(self, node_id: str, x: float, y: float) -> None:
+        i = self._index.get(node_id)
+        if i is not None:
+            self.positions[i] = (x, y)
+
+    def set_pinned(self, node_id: str, pinned: bool) -> None:
+        i = self._index.get(node_id)
+        if i is not None:
+            self.pinned[i] = pinned
+
+    def apply(self) -> None:
+        for i, nid in enumerate(self.node_ids):
+            node = self._graph.nodes.get(nid)
+            if node is None or self.pinned[i]:
+                continue
+            node.x = float(self.positions[i, 0])
+            node.y = float(self.positions[i, 1])
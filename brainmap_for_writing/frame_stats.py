@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class FrameSummary:
+    """Averages over the samples still inside the rolling window."""
+
+    fps: float = 0.0
+    paint_ms: float = 0.0
+    paint_max_ms: float = 0.0
+    items: float = 0.0
+    # Milliseconds spent per second of wall time, by timing name.
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class FrameStats:
+    """Rolling frame-time and per-stage timing samples for the canvas HUD.
+
+    Frames and named timings (e.g. ``"visibility"``, ``"edges"``) are
+    stamped with ``clock()`` and dropped once older than ``window``
+    seconds, so the summary always describes the last moments of use.
+    """
+
+    def __init__(self, window: float = 2.0, clock: Callable[[], float] = time.perf_counter) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._clock = clock
+        self._started = clock()
+        self._frames: deque[tuple[float, float, int]] = deque()
+        self._timings: deque[tuple[float, str, float]] = deque()
+        # Items drawn so far in the frame being painted; item paint methods
+        # bump it and the view reads it into add_frame. Items blitted from
+        # the item cache are not repainted and so not counted.
+        self.painted = 0
+
+    def add_frame(self, paint_seconds: float, items: int) -> None:
+        self._frames.append((self._clock(), paint_seconds, items))
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        self._timings.append((self._clock(), name, seconds))
+
+    def clear(self) -> None:
+        self._started = self._clock()
+        self._frames.clear()
+        self._timings.clear()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._frames and self._frames[0][0] < cutoff:
+            self._frames.popleft()
+        while self._timings and self._timings[0][0] < cutoff:
+            self._timings.popleft()
+
+    def summary(self) -> FrameSummary:
+        now = self._clock()
+        self._expire(now)
+        # Shortly after a clear the window is only partly filled.
+        span = min(self.window, now - self._started)
+        if span <= 0:
+            return FrameSummary()
+        timings: dict[str, float] = {}
+        for _, name, seconds in self._timings:
+            timings[name] = timings.get(name, 0.0) + seconds
+        timings = {name: total * 1000.0 / span for name, total in timings.items()}
+        frames = self._frames
+        if not frames:
+            return FrameSummary(timings=timings)
+        count = len(frames)
+        return FrameSummary(
+            fps=count / span,
+            paint_ms=sum(f[1] for f in frames) * 1000.0 / count,
+            paint_max_ms=max(f[1] for f in frames) * 1000.0,
+            items=sum(f[2] for f in frames) / count,
+            timings=timings,
+        )
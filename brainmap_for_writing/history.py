@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Hashable, Iterable, Optional, Union
+
+from .core import Edge, Graph, Node
+from .edit_ops import DeleteSnapshot
+
+# Rough per-entry overhead (object headers, tuple slots, dict entries) added
+# to the size of the stored values when estimating memory use.
+_ENTRY_OVERHEAD = 64
+
+_NODE_FIELDS = tuple(f.name for f in fields(Node) if f.name != "id")
+_EDGE_FIELDS = ("collapsed",)
+
+
+def _value_nbytes(value: Any) -> int:
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    return 32
+
+
+def _node_nbytes(node: Node) -> int:
+    return _ENTRY_OVERHEAD * 4 + sum(
+        _value_nbytes(v) for v in (node.text, node.note, node.memory_block, node.story_txt_path)
+    )
+
+
+@dataclass(frozen=True)
+class NodeFieldsChange:
+    """Old and new values of the node fields an edit touched."""
+
+    node_id: str
+    before: dict[str, Any]
+    after: dict[str, Any]
+
+    def undo(self, graph: Graph) -> None:
+        self._write(graph, self.before)
+
+    def redo(self, graph: Graph) -> None:
+        self._write(graph, self.after)
+
+    def _write(self, graph: Graph, values: dict[str, Any]) -> None:
+        node = graph.nodes.get(self.node_id)
+        if node is not None:
+            for name, value in values.items():
+                setattr(node, name, value)
+
+    def nbytes(self) -> int:
+        return _ENTRY_OVERHEAD + sum(
+            _ENTRY_OVERHEAD + _value_nbytes(v) for v in (*self.before.values(), *self.after.values())
+        )
+
+
+@dataclass(frozen=True)
+class EdgeFieldsChange:
+    edge_id: str
+    before: dict[str, Any]
+    after: dict[str, Any]
+
+    def undo(self, graph: Graph) -> None:
+        self._write(graph, self.before)
+
+    def redo(self, graph: Graph) -> None:
+        self._write(graph, self.after)
+
+    def _write(self, graph: Graph, values: dict[str, Any]) -> None:
+        edge = graph.edges.get(self.edge_id)
+        if edge is not None:
+            for name, value in values.items():
+                setattr(edge, name, value)
+
+    def nbytes(self) -> int:
+        return _ENTRY_OVERHEAD * (1 + len(self.before) + len(self.after))
+
+
+@dataclass(frozen=True)
+class MoveNodes:
+    """Positions of many nodes before and after a drag or layout, stored compactly."""
+
+    node_ids: tuple[str, ...]
+    before: tuple[tuple[float, float], ...]
+    after: tuple[tuple[float, float], ...]
+
+    def undo(self, graph: Graph) -> None:
+        self._write(graph, self.before)
+
+    def redo(self, graph: Graph) -> None:
+        self._write(graph, self.after)
+
+    def _write(self, graph: Graph, positions: tuple[tuple[float, float], ...]) -> None:
+        for nid, (x, y) in zip(self.node_ids, positions):
+            node = graph.nodes.get(nid)
+            if node is not None:
+                node.x = x
+                node.y = y
+                graph.include_position(x, y)
+
+    def nbytes(self) -> int:
+        return _ENTRY_OVERHEAD + len(self.node_ids) * (_ENTRY_OVERHEAD * 3)
+
+
+@dataclass(frozen=True)
+class AddItems:
+    """Nodes and edges created together (an import, a new node, auto link)."""
+
+    nodes: tuple[Node, ...] = ()
+    edges: tuple[Edge, ...] = ()
+
+    def undo(self, graph: Graph) -> None:
+        _remove(graph, self.nodes, self.edges)
+
+    def redo(self, graph: Graph) -> None:
+        _insert(graph, self.nodes, self.edges)
+
+    def nbytes(self) -> int:
+        return _ENTRY_OVERHEAD + sum(_node_nbytes(n) for n in self.nodes) + len(self.edges) * _ENTRY_OVERHEAD * 3
+
+
+@dataclass(frozen=True)
+class RemoveItems:
+    nodes: tuple[Node, ...] = ()
+    edges: tuple[Edge, ...] = ()
+
+    @staticmethod
+    def from_snapshot(snapshot: DeleteSnapshot) -> RemoveItems:
+        return RemoveItems(nodes=snapshot.nodes, edges=snapshot.edges)
+
+    def undo(self, graph: Graph) -> None:
+        _insert(graph, self.nodes, self.edges)
+
+    def redo(self, graph: Graph) -> None:
+        _remove(graph, self.nodes, self.edges)
+
+    def nbytes(self) -> int:
+        return _ENTRY_OVERHEAD + sum(_node_nbytes(n) for n in self.nodes) + len(self.edges) * _ENTRY_OVERHEAD * 3
+
+
+Change = Union[NodeFieldsChange, EdgeFieldsChange, MoveNodes, AddItems, RemoveItems]
+
+
+def _insert(graph: Graph, nodes: Iterable[Node], edges: Iterable[Edge]) -> None:
+    for node in nodes:
+        graph.nodes[node.id.value] = node
+    for edge in edges:
+        if edge.source.value in graph.nodes and edge.target.value in graph.nodes:
+            graph.edges[edge.id.value] = edge
+
+
+def _remove(graph: Graph, nodes: Iterable[Node], edges: Iterable[Edge]) -> None:
+    # Later history entries are undone first, so only the recorded edges can
+    # still touch the recorded nodes: O(k), no scan over the whole graph.
+    for edge in edges:
+        graph.edges.pop(edge.id.value, None)
+    for node in nodes:
+        graph.nodes.pop(node.id.value, None)
+
+
+def set_node_fields(graph: Graph, node_id: str, **values: Any) -> Optional[NodeFieldsChange]:
+    """Assign ``values`` to a node and return the diff, or None if nothing changed."""
+    node = graph.nodes[node_id]
+    before: dict[str, Any] = {}
+    after: dict[str, Any] = {}
+    for name, value in values.items():
+        if name not in _NODE_FIELDS:
+            raise AttributeError(f"Node has no editable field {name!r}")
+        old = getattr(node, name)
+        if old != value:
+            before[name] = old
+            after[name] = value
+            setattr(node, name, value)
+    if not after:
+        return None
+    return NodeFieldsChange(node_id=node_id, before=before, after=after)
+
+
+def set_edge_fields(graph: Graph, edge_id: str, **values: Any) -> Optional[EdgeFieldsChange]:
+    edge = graph.edges[edge_id]
+    before: dict[str, Any] = {}
+    after: dict[str, Any] = {}
+    for name, value in values.items():
+        if name not in _EDGE_FIELDS:
+            raise AttributeError(f"Edge has no editable field {name!r}")
+        old = getattr(edge, name)
+        if old != value:
+            before[name] = old
+            after[name] = value
+            setattr(edge, name, value)
+    if not after:
+        return None
+    return EdgeFieldsChange(edge_id=edge_id, before=before, after=after)
+
+
+def position_diff(graph: Graph, positions: Iterable[tuple[str, float, float]]) -> Optional[MoveNodes]:
+    """Diff from current node positions to ``positions``, without moving anything."""
+    node_ids: list[str] = []
+    before: list[tuple[float, float]] = []
+    after: list[tuple[float, float]] = []
+    for nid, x, y in positions:
+        node = graph.nodes.get(nid)
+        if node is None or (node.x, node.y) == (x, y):
+            continue
+        node_ids.append(nid)
+        before.append((node.x, node.y))
+        after.append((x, y))
+    if not node_ids:
+        return None
+    return MoveNodes(node_ids=tuple(node_ids), before=tuple(before), after=tuple(after))
+
+
+def move_nodes(graph: Graph, positions: Iterable[tuple[str, float, float]]) -> Optional[MoveNodes]:
+    """Move nodes to ``positions`` and return the diff of the ones that moved."""
+    change = position_diff(graph, positions)
+    if change is not None:
+        change.redo(graph)
+    return change
+
+
+def _merge_changes(older: tuple[Change, ...], newer: tuple[Change, ...]) -> tuple[Change, ...]:
+    if len(older) == 1 and len(newer) == 1:
+        a, b = older[0], newer[0]
+        if isinstance(a, MoveNodes) and isinstance(b, MoveNodes) and a.node_ids == b.node_ids:
+            return (MoveNodes(node_ids=a.node_ids, before=a.before, after=b.after),)
+        if isinstance(a, NodeFieldsChange) and isinstance(b, NodeFieldsChange) and a.node_id == b.node_id:
+            return (
+                NodeFieldsChange(
+                    node_id=a.node_id,
+                    before={**b.before, **a.before},
+                    after={**a.after, **b.after},
+                ),
+            )
+    return older + newer
+
+
+@dataclass
+class Command:
+    """One undoable user action made of one or more changes.
+
+    Commands pushed with the same ``merge_key`` within the history's merge
+    window are folded into one entry (e.g. repeated drags of one selection).
+    """
+
+    label: str
+    changes: tuple[Change, ...]
+    merge_key: Optional[Hashable] = None
+    timestamp: float = 0.0
+    _nbytes: int = field(default=-1, repr=False, compare=False)
+
+    def undo(self, graph: Graph) -> None:
+        for change in reversed(self.changes):
+            change.undo(graph)
+
+    def redo(self, graph: Graph) -> None:
+        for change in self.changes:
+            change.redo(graph)
+
+    def nbytes(self) -> int:
+        if self._nbytes < 0:
+            self._nbytes = _ENTRY_OVERHEAD + sum(c.nbytes() for c in self.changes)
+        return self._nbytes
+
+
+class UndoHistory:
+    """Linear undo/redo history bounded by an estimated memory budget.
+
+    Pushing a command clears the redo stack. When the estimated size of all
+    stored commands exceeds ``byte_budget`` the oldest undo entries are
+    dropped; the most recent command is always kept.
+    """
+
+    def __init__(
+        self,
+        byte_budget: int = 64 * 1024 * 1024,
+        merge_window: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.byte_budget = byte_budget
+        self.merge_window = merge_window
+        self._clock = clock
+        self._undo: deque[Command] = deque()
+        self._redo: list[Command] = []
+        self._nbytes = 0
+        # Set by undo/redo so the next push never merges into an older entry.
+        self._sealed = False
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._nbytes = 0
+        self._sealed = False
+
+    def push(self, command: Command) -> None:
+        if not command.changes:
+            return
+        now = self._clock()
+        for dropped in self._redo:
+            self._nbytes -= dropped.nbytes()
+        self._redo.clear()
+
+        top = self._undo[-1] if self._undo else None
+        if (
+            top is not None
+            and not self._sealed
+            and command.merge_key is not None
+            and top.merge_key == command.merge_key
+            and now - top.timestamp <= self.merge_window
+        ):
+            self._nbytes -= top.nbytes()
+            top.changes = _merge_changes(top.changes, command.changes)
+            top.timestamp = now
+            top._nbytes = -1
+            self._nbytes += top.nbytes()
+        else:
+            command.timestamp = now
+            self._undo.append(command)
+            self._nbytes += command.nbytes()
+        self._sealed = False
+        self._evict()
+
+    def undo(self, graph: Graph) -> Optional[Command]:
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        command.undo(graph)
+        self._redo.append(command)
+        self._sealed = True
+        return command
+
+    def redo(self, graph: Graph) -> Optional[Command]:
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.redo(graph)
+        self._undo.append(command)
+        self._sealed = True
+        return command
+
+    def _evict(self) -> None:
+        while self._nbytes > self.byte_budget and len(self._undo) > 1:
+            self._nbytes -= self._undo.popleft().nbytes()
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from datetime import date, datetime, time
-from typing import Iterable, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Iterable, Optional, Sequence
 
 from .core import Graph, Node, NodeId
+from .linking import chronological_edges
 
 
 @dataclass(frozen=True)
 class ImportErrorDetail(Exception):
     message: str
     line_number: Optional[int] = None
+    span: Optional[tuple[int, int]] = None
 
     def __str__(self) -> str:
         if self.line_number is None:
@@ -19,35 +22,204 @@ class ImportErrorDetail(Exception):
         return f"Line {self.line_number}: {self.message}"
 
 
-_DATE_MARKER_RE = re.compile(
-    r"^\s*【\s*(?P<y>\d{4})\s*[\.\/\-．:：]\s*(?P<m>\d{1,2})\s*[\.\/\-．:：]\s*(?P<d>\d{1,2})"
-    r"(?:\s*[\.\/\-．:：]\s*(?P<H>\d{1,2})\s*[\.\/\-．:：]\s*(?P<M>\d{1,2})(?:\s*[\.\/\-．:：]\s*(?P<S>\d{1,2}))?)?\s*】\s*$"
-)
+_SEP = r"\s*[\.\/\-．:：]\s*"
 
 
-def _parse_date_marker(line: str, line_number: int) -> Optional[datetime]:
-    match = _DATE_MARKER_RE.match(line)
-    if not match:
-        return None
-    y = int(match.group("y"))
-    m = int(match.group("m"))
-    d = int(match.group("d"))
-    
-    H_str = match.group("H")
-    M_str = match.group("M")
-    S_str = match.group("S")
-    
-    H = int(H_str) if H_str else 0
-    M = int(M_str) if M_str else 0
-    S = int(S_str) if S_str else 0
-    
-    try:
-        return datetime(y, m, d, H, M, S)
-    except ValueError as exc:
-        raise ImportErrorDetail("Invalid date marker", line_number=line_number) from exc
+@dataclass(frozen=True)
+class DateMarkerFormat:
+    name: str
+    pattern: str
+    convert: Optional[Callable[[dict[str, Optional[str]]], datetime]] = None
+    # Writes a marker that ``pattern`` and ``convert`` read back exactly.
+    render: Optional[Callable[[datetime], str]] = None
+
+
+def _convert_ymd(fields: dict[str, Optional[str]]) -> datetime:
+    return datetime(
+        int(fields["y"] or 0),
+        int(fields["m"] or 0),
+        int(fields["d"] or 0),
+        int(fields.get("H") or 0),
+        int(fields.get("M") or 0),
+        int(fields.get("S") or 0),
+    )
+
+
+def _convert_stardate(fields: dict[str, Optional[str]]) -> datetime:
+    year = int(fields["y"] or 0)
+    frac_digits = fields.get("f") or "0"
+    fraction = int(frac_digits) / (10 ** len(frac_digits))
+    start = datetime(year, 1, 1)
+    year_length = datetime(year + 1, 1, 1) - start
+    return start + timedelta(seconds=int(year_length.total_seconds() * fraction))
+
+
+def _has_time(dt: datetime) -> bool:
+    return (dt.hour, dt.minute, dt.second) != (0, 0, 0)
+
+
+def _render_bracket(dt: datetime) -> str:
+    if not _has_time(dt):
+        return f"【{dt.year:04d}.{dt.month:02d}.{dt.day:02d}】"
+    return f"【{dt.year:04d}.{dt.month:02d}.{dt.day:02d}.{dt.hour:02d}.{dt.minute:02d}.{dt.second:02d}】"
+
+
+def _render_square(dt: datetime) -> str:
+    if not _has_time(dt):
+        return f"[{dt:%Y-%m-%d}]"
+    return f"[{dt:%Y-%m-%d %H:%M:%S}]"
+
+
+def _render_cjk(dt: datetime) -> str:
+    if not _has_time(dt):
+        return f"{dt.year:04d}年{dt.month:02d}月{dt.day:02d}日"
+    return f"{dt.year:04d}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
+
+
+def _render_iso(dt: datetime) -> str:
+    if not _has_time(dt):
+        return f"{dt:%Y-%m-%d}"
+    return f"{dt:%Y-%m-%d %H:%M:%S}"
+
+
+def _render_stardate(dt: datetime) -> str:
+    start = datetime(dt.year, 1, 1)
+    year_seconds = (datetime(dt.year + 1, 1, 1) - start).total_seconds()
+    seconds = int((dt - start).total_seconds())
+    # Aim mid-second so truncation on import lands on the same second.
+    return f"Stardate {dt.year:04d}.{int((seconds + 0.5) / year_seconds * 10**12):012d}"
+
+
+BUILTIN_MARKER_FORMATS: dict[str, DateMarkerFormat] = {
+    f.name: f
+    for f in (
+        DateMarkerFormat(
+            "bracket",
+            r"【\s*(?P<y>\d{4})" + _SEP + r"(?P<m>\d{1,2})" + _SEP + r"(?P<d>\d{1,2})"
+            r"(?:" + _SEP + r"(?P<H>\d{1,2})" + _SEP + r"(?P<M>\d{1,2})(?:" + _SEP + r"(?P<S>\d{1,2}))?)?\s*】",
+            render=_render_bracket,
+        ),
+        DateMarkerFormat(
+            "square",
+            r"\[\s*(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})"
+            r"(?:[\sT]+(?P<H>\d{1,2}):(?P<M>\d{1,2})(?::(?P<S>\d{1,2}))?)?\s*\]",
+            render=_render_square,
+        ),
+        DateMarkerFormat(
+            "cjk",
+            r"(?P<y>\d{4})\s*年\s*(?P<m>\d{1,2})\s*月\s*(?P<d>\d{1,2})\s*[日号]"
+            r"(?:\s*(?P<H>\d{1,2})\s*[时點点:：]\s*(?P<M>\d{1,2})\s*分?(?:\s*(?P<S>\d{1,2})\s*秒)?)?",
+            render=_render_cjk,
+        ),
+        DateMarkerFormat(
+            "iso",
+            r"(?P<y>\d{4})-(?P<m>\d{2})-(?P<d>\d{2})(?:[ T](?P<H>\d{2}):(?P<M>\d{2})(?::(?P<S>\d{2}))?)?",
+            render=_render_iso,
+        ),
+        DateMarkerFormat(
+            "stardate",
+            r"(?:[Ss]tardate|星历)\s*(?P<y>\d{4})(?:\.(?P<f>\d+))?",
+            _convert_stardate,
+            _render_stardate,
+        ),
+    )
+}
+
+DEFAULT_MARKER_FORMATS: tuple[str, ...] = ("bracket",)
+
+_GROUP_RE = re.compile(r"\(\?P<(\w+)>")
+
+
+class DateMarkerGrammar:
+    """All enabled marker formats compiled into a single anchored alternation."""
+
+    def __init__(self, formats: Sequence[DateMarkerFormat]) -> None:
+        if not formats:
+            raise ValueError("At least one date marker format is required")
+        self.formats = tuple(formats)
+        self._fields: list[tuple[str, ...]] = []
+        alternatives: list[str] = []
+        for idx, fmt in enumerate(self.formats):
+            fields = tuple(_GROUP_RE.findall(fmt.pattern))
+            self._fields.append(fields)
+            body = _GROUP_RE.sub(lambda m, i=idx: f"(?P<f{i}_{m.group(1)}>", fmt.pattern)
+            alternatives.append(f"(?P<f{idx}>{body})")
+        self._regex = re.compile(r"^\s*(?:" + "|".join(alternatives) + r")\s*$")
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(f.name for f in self.formats)
+
+    def render(self, dt: datetime) -> str:
+        """A marker for ``dt`` in the first format that can write one."""
+        for fmt in self.formats:
+            if fmt.render is not None:
+                return fmt.render(dt)
+        raise ValueError(f"No date marker format can be written: {', '.join(self.names)}")
+
+    def matches(self, line: str) -> bool:
+        """Whether ``line`` is read as a marker, even one with an invalid date."""
+        return self._regex.match(line) is not None
+
+    def parse(self, line: str, line_number: int) -> Optional[datetime]:
+        match = self._regex.match(line)
+        if not match:
+            return None
+        key = match.lastgroup
+        assert key is not None
+        idx = int(key[1:])
+        fmt = self.formats[idx]
+        fields = {name: match.group(f"f{idx}_{name}") for name in self._fields[idx]}
+        try:
+            return (fmt.convert or _convert_ymd)(fields)
+        except (ValueError, OverflowError) as exc:
+            raise ImportErrorDetail("Invalid date marker", line_number=line_number, span=match.span(key)) from exc
+
 
+@lru_cache(maxsize=16)
+def _grammar_for_names(names: tuple[str, ...]) -> DateMarkerGrammar:
+    formats: list[DateMarkerFormat] = []
+    for name in names:
+        fmt = BUILTIN_MARKER_FORMATS.get(name)
+        if fmt is None:
+            raise ImportErrorDetail(f"Unknown date marker format: {name}")
+        formats.append(fmt)
+    return DateMarkerGrammar(formats)
 
-def _finalize_text_blocks(lines: list[str]) -> list[str]:
+
+def get_marker_grammar(names: Optional[Iterable[str]] = None) -> DateMarkerGrammar:
+    key = tuple(names) if names is not None else DEFAULT_MARKER_FORMATS
+    return _grammar_for_names(key or DEFAULT_MARKER_FORMATS)
+
+
+# A text line that would otherwise read as a marker or (in undated text) as a
+# block separator is written with this prefix; one is removed on import.
+TEXT_ESCAPE = "\\"
+
+
+def _is_reserved(line: str, grammar: DateMarkerGrammar) -> bool:
+    # Escaped lines are reserved too, so a literal leading escape survives.
+    rest = line.lstrip(TEXT_ESCAPE)
+    return not rest.strip() or grammar.matches(rest)
+
+
+def escape_text_line(line: str, grammar: DateMarkerGrammar, escape_blank: bool = False) -> str:
+    """Escape ``line`` of a node's text so ``grammar`` reads it back verbatim.
+
+    Blank lines only need escaping in undated text, where they separate nodes.
+    """
+    if (escape_blank or line.strip()) and _is_reserved(line, grammar):
+        return TEXT_ESCAPE + line
+    return line
+
+
+def _unescape_text_line(line: str, grammar: DateMarkerGrammar) -> str:
+    if line.startswith(TEXT_ESCAPE) and _is_reserved(line[1:], grammar):
+        return line[1:]
+    return line
+
+
+def _finalize_text_blocks(lines: list[str], grammar: DateMarkerGrammar) -> list[str]:
     text = "\n".join(lines).strip("\n")
     if not text.strip():
         return []
@@ -60,14 +232,52 @@ def _finalize_text_blocks(lines: list[str]) -> list[str]:
                 blocks.append("\n".join(current).strip("\n"))
                 current = []
             continue
-        current.append(raw_line)
+        current.append(_unescape_text_line(raw_line, grammar))
     if current:
         blocks.append("\n".join(current).strip("\n"))
     return [b for b in blocks if b.strip()]
 
 
-def import_txt_lines(lines: Iterable[str], existing_graph: Optional[Graph] = None) -> Graph:
+@dataclass
+class ImportReport:
+    graph: Graph
+    errors: list[ImportErrorDetail] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def import_txt_lines(
+    lines: Iterable[str],
+    existing_graph: Optional[Graph] = None,
+    auto_link: bool = False,
+    grammar: Optional[DateMarkerGrammar] = None,
+) -> Graph:
+    return _import_lines(lines, existing_graph, auto_link, grammar, errors=None)
+
+
+def import_txt_lines_lenient(
+    lines: Iterable[str],
+    existing_graph: Optional[Graph] = None,
+    auto_link: bool = False,
+    grammar: Optional[DateMarkerGrammar] = None,
+) -> ImportReport:
+    errors: list[ImportErrorDetail] = []
+    graph = _import_lines(lines, existing_graph, auto_link, grammar, errors=errors)
+    return ImportReport(graph=graph, errors=errors)
+
+
+def _import_lines(
+    lines: Iterable[str],
+    existing_graph: Optional[Graph],
+    auto_link: bool,
+    grammar: Optional[DateMarkerGrammar],
+    errors: Optional[list[ImportErrorDetail]],
+) -> Graph:
     graph = Graph()
+    if grammar is None:
+        grammar = get_marker_grammar(existing_graph.marker_formats if existing_graph else None)
     
     # Pre-calculate existing timestamps for conflict detection
     existing_timestamps: set[datetime] = set()
@@ -79,6 +289,8 @@ def import_txt_lines(lines: Iterable[str], existing_graph: Optional[Graph] = Non
     current_date: Optional[datetime] = None
     current_lines: list[str] = []
     pending_undated_lines: list[str] = []
+    # Set after an invalid marker in lenient mode: its body is dropped up to the next valid marker.
+    skipping = False
 
     def flush_dated_block() -> None:
         nonlocal current_date, current_lines
@@ -95,7 +307,7 @@ def import_txt_lines(lines: Iterable[str], existing_graph: Optional[Graph] = Non
              current_lines = []
              return
 
-        text = "\n".join(current_lines).strip("\n")
+        text = "\n".join(_unescape_text_line(line, grammar) for line in current_lines).strip("\n")
         node = Node(id=NodeId.new(), text=text.strip(), event_date=current_date)
         graph.add_node(node)
         current_date = None
@@ -103,19 +315,31 @@ def import_txt_lines(lines: Iterable[str], existing_graph: Optional[Graph] = Non
 
     def flush_undated_blocks() -> None:
         nonlocal pending_undated_lines
-        for block in _finalize_text_blocks(pending_undated_lines):
+        for block in _finalize_text_blocks(pending_undated_lines, grammar):
             graph.add_node(Node(id=NodeId.new(), text=block, event_date=None))
         pending_undated_lines = []
 
     for idx, raw in enumerate(lines, start=1):
         line = raw.rstrip("\n").rstrip("\r")
-        marker_date = _parse_date_marker(line, idx)
+        try:
+            marker_date = grammar.parse(line, idx)
+        except ImportErrorDetail as exc:
+            if errors is None:
+                raise
+            errors.append(exc)
+            flush_dated_block()
+            flush_undated_blocks()
+            skipping = True
+            continue
         if marker_date is not None:
             flush_dated_block()
             flush_undated_blocks()
             current_date = marker_date
+            skipping = False
             continue
 
+        if skipping:
+            continue
         if current_date is None:
             pending_undated_lines.append(line)
         else:
@@ -125,17 +349,43 @@ def import_txt_lines(lines: Iterable[str], existing_graph: Optional[Graph] = Non
     flush_undated_blocks()
 
     if not graph.nodes:
-        raise ImportErrorDetail("No nodes could be imported")
+        if errors is None:
+            raise ImportErrorDetail("No nodes could be imported")
+        errors.append(ImportErrorDetail("No nodes could be imported"))
+    if auto_link:
+        graph.add_edges(chronological_edges(graph.iter_nodes()))
     return graph
 
 
-def import_txt_file(path: str, existing_graph: Optional[Graph] = None) -> Graph:
+def import_txt_file(
+    path: str,
+    existing_graph: Optional[Graph] = None,
+    auto_link: bool = False,
+    grammar: Optional[DateMarkerGrammar] = None,
+) -> Graph:
+    try:
+        try:
+            with open(path, "r", encoding="utf-8-sig") as f:
+                return import_txt_lines(f, existing_graph, auto_link, grammar)
+        except UnicodeDecodeError:
+            with open(path, "r", encoding="gb18030") as f:
+                return import_txt_lines(f, existing_graph, auto_link, grammar)
+    except OSError as exc:
+        raise ImportErrorDetail(f"Failed to read file: {path}") from exc
+
+
+def import_txt_file_lenient(
+    path: str,
+    existing_graph: Optional[Graph] = None,
+    auto_link: bool = False,
+    grammar: Optional[DateMarkerGrammar] = None,
+) -> ImportReport:
     try:
         try:
             with open(path, "r", encoding="utf-8-sig") as f:
-                return import_txt_lines(f, existing_graph)
+                return import_txt_lines_lenient(f, existing_graph, auto_link, grammar)
         except UnicodeDecodeError:
             with open(path, "r", encoding="gb18030") as f:
-                return import_txt_lines(f, existing_graph)
+                return import_txt_lines_lenient(f, existing_graph, auto_link, grammar)
     except OSError as exc:
         raise ImportErrorDetail(f"Failed to read file: {path}") from exc
@@ -1,10 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import heapq
+from collections import deque
+from dataclasses import dataclass, replace
 from datetime import date
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional
 
-from .core import Graph, Node
+import numpy as np
+
+from .core import Bounds, Graph, Node
+
+
+ProgressCallback = Callable[[float], None]
+
+
+class LayoutCancelled(Exception):
+    """Raised from a progress callback to abandon a layout in progress."""
+
+
+def _report(progress: Optional[ProgressCallback], fraction: float) -> None:
+    if progress is not None:
+        progress(min(1.0, max(0.0, fraction)))
+
+
+def layout_snapshot(graph: Graph) -> Graph:
+    """Copy of ``graph`` whose nodes can be laid out without touching the original."""
+    bounds = replace(graph.bounds) if graph.bounds is not None else None
+    snapshot = Graph(edges=dict(graph.edges), bounds=bounds)
+    for node in graph.iter_nodes():
+        snapshot.add_node(replace(node))
+    return snapshot
 
 
 @dataclass(frozen=True)
@@ -13,10 +38,32 @@ class LayoutConfig:
     row_height: float = 40.0
     left_margin: float = 80.0
     top_margin: float = 80.0
+    # Placement of newly added nodes: columns per band before wrapping, and
+    # nodes stacked per column before spilling into the next column.
+    band_columns: int = 40
+    band_rows: int = 10
+    # Layered layout: sweeps of barycenter ordering and of coordinate
+    # smoothing, and the longest edge (in layers) routed through dummies.
+    crossing_iterations: int = 16
+    coordinate_iterations: int = 8
+    max_dummy_span: int = 8
+    # Timeline layout: horizontal scale and the width a node (with its date
+    # label) occupies when packing rows.
+    pixels_per_day: float = 2.0
+    timeline_node_width: float = 90.0
+    # Overlap removal: clearance left between separated footprints and the
+    # most passes made before giving up on any overlaps that remain.
+    overlap_gap: float = 4.0
+    overlap_iterations: int = 32
 
 
-def assign_default_layout(graph: Graph, config: Optional[LayoutConfig] = None) -> None:
+def assign_default_layout(
+    graph: Graph,
+    config: Optional[LayoutConfig] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> None:
     cfg = config or LayoutConfig()
+    _report(progress, 0.0)
 
     dated: list[Node] = []
     undated: list[Node] = []
@@ -54,6 +101,23 @@ def assign_default_layout(graph: Graph, config: Optional[LayoutConfig] = None) -
         node.x = cfg.left_margin + (col + 1) * cfg.column_width
         node.y = cfg.top_margin + count * cfg.row_height
 
+    recompute_bounds(graph)
+    _report(progress, 1.0)
+
+
+def recompute_bounds(graph: Graph, exclude: Iterable[str] = ()) -> Optional[Bounds]:
+    skip = set(exclude)
+    bounds: Optional[Bounds] = None
+    for node in graph.iter_nodes():
+        if node.id.value in skip:
+            continue
+        if bounds is None:
+            bounds = Bounds(node.x, node.y, node.x, node.y)
+        else:
+            bounds.include(node.x, node.y)
+    graph.bounds = bounds
+    return bounds
+
 
 def assign_default_layout_for_new_nodes(
     graph: Graph,
@@ -80,14 +144,449 @@ def assign_default_layout_for_new_nodes(
     if not new_nodes:
         return
 
-    existing = [n for n in graph.iter_nodes() if n.id.value not in new_ids]
-    if existing:
-        anchor_x = max(n.x for n in existing) + cfg.column_width
-        anchor_y = min(n.y for n in existing)
+    bounds = graph.bounds
+    if bounds is None:
+        bounds = recompute_bounds(graph, exclude=new_ids)
+    if bounds is not None:
+        anchor_x = bounds.max_x + cfg.column_width
+        anchor_y = bounds.min_y
     else:
         anchor_x = cfg.left_margin
         anchor_y = cfg.top_margin
 
-    for i, node in enumerate(new_nodes):
-        node.x = anchor_x + i * cfg.column_width
-        node.y = anchor_y
+    # Date-aware band: one column per date, stacks spill into the next column,
+    # and the band wraps below itself so large imports stay compact.
+    new_nodes.sort(key=lambda n: (n.event_date is None, n.event_date or date.min, n.id.value))
+    columns = max(1, cfg.band_columns)
+    rows = max(1, cfg.band_rows)
+    band_height = (rows + 1) * cfg.row_height
+
+    col = -1
+    row = rows
+    prev_key: object = object()
+    for node in new_nodes:
+        key = node.event_date
+        if key != prev_key or row >= rows:
+            col += 1
+            row = 0
+            prev_key = key
+        band, band_col = divmod(col, columns)
+        node.x = anchor_x + band_col * cfg.column_width
+        node.y = anchor_y + band * band_height + row * cfg.row_height
+        row += 1
+        if graph.bounds is None:
+            graph.bounds = Bounds(node.x, node.y, node.x, node.y)
+        else:
+            graph.bounds.include(node.x, node.y)
+
+
+def _chrono_key(node: Node) -> tuple[bool, date, str]:
+    return (node.event_date is None, node.event_date or date.min, node.id.value)
+
+
+def _assign_layers(nodes: list[Node], edges: list[tuple[int, int]]) -> list[int]:
+    """Longest-path layering where every distinct date also starts a new layer.
+
+    ``nodes`` must be in chronological order. Each date group hangs off a
+    barrier vertex that waits for the whole previous group, so later dates are
+    always at least one layer right of earlier ones. Cycles are broken by
+    forcing the earliest unprocessed node.
+    """
+    n = len(nodes)
+    groups: list[list[int]] = []
+    prev: object = object()
+    for i, node in enumerate(nodes):
+        if node.event_date is None:
+            continue
+        if node.event_date != prev:
+            groups.append([])
+            prev = node.event_date
+        groups[-1].append(i)
+
+    total = n + len(groups)
+    succ: list[list[tuple[int, int]]] = [[] for _ in range(total)]
+    indeg = [0] * total
+    for s, t in edges:
+        succ[s].append((t, 1))
+        indeg[t] += 1
+    for k in range(1, len(groups)):
+        barrier = n + k
+        for i in groups[k - 1]:
+            succ[i].append((barrier, 0))
+            indeg[barrier] += 1
+        for i in groups[k]:
+            succ[barrier].append((i, 1))
+            indeg[i] += 1
+
+    layer = [0] * total
+    done = [False] * total
+    ready = deque(v for v in range(total) if indeg[v] == 0)
+    cursor = 0
+    while True:
+        if not ready:
+            while cursor < n and done[cursor]:
+                cursor += 1
+            if cursor >= n:
+                break
+            ready.append(cursor)
+        v = ready.popleft()
+        if done[v]:
+            continue
+        done[v] = True
+        for w, weight in succ[v]:
+            if done[w]:
+                continue
+            if layer[v] + weight > layer[w]:
+                layer[w] = layer[v] + weight
+            indeg[w] -= 1
+            if indeg[w] == 0:
+                ready.append(w)
+    return layer[:n]
+
+
+def _ranks_within_layers(vlayer: np.ndarray, order: np.ndarray) -> np.ndarray:
+    layer_sorted = vlayer[order]
+    starts = np.flatnonzero(np.r_[True, layer_sorted[1:] != layer_sorted[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    rank_sorted = np.arange(len(order)) - np.repeat(starts, counts)
+    pos = np.empty(len(order), dtype=np.float64)
+    pos[order] = rank_sorted
+    return pos
+
+
+def assign_layered_layout(
+    graph: Graph,
+    config: Optional[LayoutConfig] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> None:
+    cfg = config or LayoutConfig()
+    _report(progress, 0.0)
+    nodes = sorted(graph.iter_nodes(), key=_chrono_key)
+    n = len(nodes)
+    if n == 0:
+        graph.bounds = None
+        return
+    index = {node.id.value: i for i, node in enumerate(nodes)}
+
+    pairs: set[tuple[int, int]] = set()
+    for edge in graph.iter_edges():
+        s = index.get(edge.source.value)
+        t = index.get(edge.target.value)
+        if s is None or t is None or s == t:
+            continue
+        # Edges pointing back in time are reversed so dates never run leftwards.
+        sd = nodes[s].event_date
+        td = nodes[t].event_date
+        if sd is not None and td is not None and sd > td:
+            s, t = t, s
+        pairs.add((s, t))
+    edges = sorted(pairs)
+    layers = _assign_layers(nodes, edges)
+    _report(progress, 0.2)
+
+    # Split edges into unit-span segments through dummy vertices.
+    vlayer_list = list(layers)
+    vkey_list = list(range(n))
+    seg_a: list[int] = []
+    seg_b: list[int] = []
+    for s, t in edges:
+        ls, lt = layers[s], layers[t]
+        if ls > lt:
+            s, t, ls, lt = t, s, lt, ls
+        span = lt - ls
+        if span == 0 or span > cfg.max_dummy_span:
+            continue
+        prev_v = s
+        for step in range(1, span):
+            v = len(vlayer_list)
+            vlayer_list.append(ls + step)
+            vkey_list.append(s)
+            seg_a.append(prev_v)
+            seg_b.append(v)
+            prev_v = v
+        seg_a.append(prev_v)
+        seg_b.append(t)
+
+    vlayer = np.asarray(vlayer_list, dtype=np.int64)
+    vkey = np.asarray(vkey_list, dtype=np.float64)
+    a = np.asarray(seg_a, dtype=np.int64)
+    b = np.asarray(seg_b, dtype=np.int64)
+    count_v = len(vlayer)
+
+    pos = _ranks_within_layers(vlayer, np.lexsort((vkey, vlayer)))
+    if len(a):
+        for it in range(cfg.crossing_iterations):
+            src, dst = (a, b) if it % 2 == 0 else (b, a)
+            sums = np.bincount(dst, weights=pos[src], minlength=count_v)
+            cnt = np.bincount(dst, minlength=count_v)
+            bary = np.where(cnt > 0, sums / np.maximum(cnt, 1), pos)
+            pos = _ranks_within_layers(vlayer, np.lexsort((pos, bary, vlayer)))
+            _report(progress, 0.25 + 0.45 * (it + 1) / cfg.crossing_iterations)
+
+    # Coordinate assignment: pull each vertex towards its neighbours' mean,
+    # then restore order and spacing per layer with a forward (prefix max)
+    # and backward (suffix min) pass, averaged.
+    h = cfg.row_height
+    order = np.lexsort((pos, vlayer))
+    layer_sorted = vlayer[order].astype(np.float64)
+    rank_sorted = pos[order]
+    y = pos * h
+    if len(a):
+        deg = np.bincount(a, minlength=count_v) + np.bincount(b, minlength=count_v)
+        for it in range(cfg.coordinate_iterations):
+            sums = np.bincount(b, weights=y[a], minlength=count_v) + np.bincount(a, weights=y[b], minlength=count_v)
+            target = np.where(deg > 0, sums / np.maximum(deg, 1), y)
+            z = target[order] - h * rank_sorted
+            offset = layer_sorted * (float(z.max() - z.min()) + 1.0)
+            down = np.maximum.accumulate(z + offset)
+            up = np.minimum.accumulate((z + offset)[::-1])[::-1]
+            y_sorted = (down + up) / 2 - offset + h * rank_sorted
+            y = np.empty(count_v, dtype=np.float64)
+            y[order] = y_sorted
+            _report(progress, 0.7 + 0.25 * (it + 1) / cfg.coordinate_iterations)
+
+    y_real = y[:n]
+    y_real = y_real - float(y_real.min()) + cfg.top_margin
+    for i, node in enumerate(nodes):
+        node.x = cfg.left_margin + layers[i] * cfg.column_width
+        node.y = float(y_real[i])
+    recompute_bounds(graph)
+    _report(progress, 1.0)
+
+
+def assign_timeline_layout(
+    graph: Graph,
+    config: Optional[LayoutConfig] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> None:
+    """Place dated nodes at x proportional to real time and pack them into rows.
+
+    Each node occupies ``timeline_node_width`` around its x; a sweep over
+    the nodes in time order reuses the lowest row that is free again, so the
+    number of rows equals the maximum overlap.
+    """
+    cfg = config or LayoutConfig()
+    _report(progress, 0.0)
+
+    dated: list[Node] = []
+    undated: list[Node] = []
+    for node in graph.iter_nodes():
+        if node.event_date is None:
+            undated.append(node)
+        else:
+            dated.append(node)
+    undated.sort(key=lambda n: n.id.value)
+    dated.sort(key=_chrono_key)
+    _report(progress, 0.3)
+
+    for idx, node in enumerate(undated):
+        node.x = cfg.left_margin
+        node.y = cfg.top_margin + idx * cfg.row_height
+
+    if dated:
+        origin = dated[0].event_date
+        assert origin is not None
+        x0 = cfg.left_margin + cfg.column_width
+        half = cfg.timeline_node_width / 2
+        busy: list[tuple[float, int]] = []
+        free: list[int] = []
+        rows = 0
+        for i, node in enumerate(dated):
+            if i % 4096 == 0:
+                _report(progress, 0.3 + 0.7 * i / len(dated))
+            assert node.event_date is not None
+            x = x0 + (node.event_date - origin).total_seconds() / 86400.0 * cfg.pixels_per_day
+            while busy and busy[0][0] <= x - half:
+                heapq.heappush(free, heapq.heappop(busy)[1])
+            if free:
+                row = heapq.heappop(free)
+            else:
+                row = rows
+                rows += 1
+            heapq.heappush(busy, (x + half, row))
+            node.x = x
+            node.y = cfg.top_margin + row * cfg.row_height
+
+    recompute_bounds(graph)
+    _report(progress, 1.0)
+
+
+
+# Steps one node may take within a pass before it is left to the next pass.
+_OVERLAP_NUDGES = 8
+
+
+def remove_overlaps(
+    graph: Graph,
+    width: float,
+    height: float,
+    node_ids: Optional[Iterable[str]] = None,
+    config: Optional[LayoutConfig] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> set[str]:
+    """Push apart nodes whose ``width`` x ``height`` footprints overlap.
+
+    Only ``node_ids`` (default: every node) may move; other and pinned nodes
+    act as fixed obstacles. Movable nodes sharing exactly one position are
+    first spread into a compact grid around it, since they give no direction
+    to push in. Passes then sweep the movable nodes top to bottom, stepping
+    each just clear of the earlier ones along whichever axis moves it least,
+    so a crowded column stretches in a single pass. Neighbours are found
+    through a uniform hash grid with footprint-sized cells that is updated as
+    nodes move, and later passes only re-examine nodes that moved, so the
+    cost stays near-linear.
+
+    Passes repeat until one moves nothing, at most ``overlap_iterations``
+    times; only then can overlaps remain, which in practice needs movable
+    nodes boxed in by fixed ones. Returns the ids that moved.
+    """
+    cfg = config or LayoutConfig()
+    _report(progress, 0.0)
+    nodes = list(graph.iter_nodes())
+    index = {node.id.value: i for i, node in enumerate(nodes)}
+    wanted = index.keys() if node_ids is None else node_ids
+    movable = sorted({index[nid] for nid in wanted if nid in index and not nodes[index[nid]].pinned})
+    if not movable:
+        _report(progress, 1.0)
+        return set()
+
+    w = width
+    h = height
+    gap = cfg.overlap_gap
+    cell = max(w, h, 1.0)
+    xs = [node.x for node in nodes]
+    ys = [node.y for node in nodes]
+    _spread_coincident(xs, ys, movable, w + gap, h + gap)
+
+    def cell_of(x: float, y: float) -> tuple[int, int]:
+        return int(x // cell), int(y // cell)
+
+    def around(cells: dict[tuple[int, int], list[int]], key: tuple[int, int]) -> list[int]:
+        gx, gy = key
+        return [j for cx in (gx - 1, gx, gx + 1) for cy in (gy - 1, gy, gy + 1) for j in cells.get((cx, cy), ())]
+
+    grid: dict[tuple[int, int], list[int]] = {}
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        grid.setdefault(cell_of(x, y), []).append(i)
+
+    def overlapping(i: int, x: float, y: float, limit: int) -> list[int]:
+        # Nodes overlapping ``i`` placed at (x, y), among those it must clear:
+        # fixed and settled nodes and active ones earlier in the sweep.
+        return [
+            j
+            for j in around(grid, cell_of(x, y))
+            if j != i and rank.get(j, -1) < limit and abs(x - xs[j]) < w and abs(y - ys[j]) < h
+        ]
+
+    def rebucket(i: int, key: tuple[int, int]) -> tuple[int, int]:
+        new_key = cell_of(xs[i], ys[i])
+        if new_key != key:
+            grid[key].remove(i)
+            grid.setdefault(new_key, []).append(i)
+        return new_key
+
+    active = set(movable)
+    for it in range(cfg.overlap_iterations):
+        sweep = sorted(active, key=lambda i: (ys[i], xs[i], i))
+        # A pair of active nodes is resolved by the later of the two, which
+        # moves out of the earlier one; fixed and settled nodes never move.
+        rank = {i: k for k, i in enumerate(sweep)}
+        start = {i: (xs[i], ys[i]) for i in sweep}
+        start_grid: dict[tuple[int, int], list[int]] = {}
+        for i in sweep:
+            start_grid.setdefault(cell_of(*start[i]), []).append(i)
+
+        touched: set[int] = set()
+        for i in sweep:
+            key = cell_of(xs[i], ys[i])
+            # First follow the earlier node this one was stacked against
+            # that moved furthest towards it, so a crowded column stretches
+            # in one pass rather than its moved top overtaking the rest.
+            x0, y0 = start[i]
+            follow = (0.0, 0.0)
+            furthest = 0.0
+            for j in around(start_grid, key):
+                if rank[j] >= rank[i]:
+                    continue
+                sx, sy = start[j]
+                mx, my = xs[j] - sx, ys[j] - sy
+                if abs(x0 - sx) < w and abs(y0 - sy) < h and mx * (x0 - sx) + my * (y0 - sy) > 0:
+                    d = mx * mx + my * my
+                    if d > furthest:
+                        furthest, follow = d, (mx, my)
+            xs[i] += follow[0]
+            ys[i] += follow[1]
+            key = rebucket(i, key)
+
+            for _ in range(_OVERLAP_NUDGES):
+                x, y = xs[i], ys[i]
+                blockers = overlapping(i, x, y, rank[i])
+                if not blockers:
+                    break
+                # Step just clear of one blocker along either axis, taking
+                # the shortest step that clears all of them. A node boxed in
+                # on every side steps below them all and keeps looking, so
+                # it always makes progress towards free space.
+                steps = sorted(
+                    ((sx - x) ** 2 + (sy - y) ** 2, sx, sy)
+                    for j in blockers
+                    for sx, sy in (
+                        (xs[j] - w - gap, y),
+                        (xs[j] + w + gap, y),
+                        (x, ys[j] - h - gap),
+                        (x, ys[j] + h + gap),
+                    )
+                )
+                free = next((s for s in steps if not overlapping(i, s[1], s[2], rank[i])), None)
+                if free is None:
+                    ys[i] = max(ys[j] for j in blockers) + h + gap
+                else:
+                    _, xs[i], ys[i] = free
+                key = rebucket(i, key)
+            else:
+                # Still boxed in; try again next pass.
+                touched.add(i)
+            if (xs[i], ys[i]) != (x0, y0):
+                touched.add(i)
+        _report(progress, (it + 1) / cfg.overlap_iterations)
+        if not touched:
+            break
+        # Nodes a mover landed on are re-examined from its side next pass.
+        active = touched
+
+    moved: set[str] = set()
+    for i in movable:
+        node = nodes[i]
+        if (node.x, node.y) != (xs[i], ys[i]):
+            node.x = xs[i]
+            node.y = ys[i]
+            graph.include_position(node.x, node.y)
+            moved.add(node.id.value)
+    _report(progress, 1.0)
+    return moved
+
+
+def _spread_coincident(xs: list[float], ys: list[float], movable: list[int], dx: float, dy: float) -> None:
+    # Lay movable nodes stacked on one point out in a near-square grid of
+    # footprint-sized slots centred on it, nearest slots first. When a
+    # fixed node sits there too, the central slot is left to it.
+    stacks: dict[tuple[float, float], list[int]] = {}
+    for i in movable:
+        stacks.setdefault((xs[i], ys[i]), []).append(i)
+    movable_set = set(movable)
+    fixed_at = {(xs[i], ys[i]) for i in range(len(xs)) if i not in movable_set}
+    for (x, y), members in stacks.items():
+        taken = 1 if (x, y) in fixed_at else 0
+        count = len(members) + taken
+        if count < 2:
+            continue
+        cols = int(np.ceil(np.sqrt(count)))
+        rows = -(-count // cols)
+        slots = sorted(
+            (((c - (cols - 1) / 2) * dx, (r - (rows - 1) / 2) * dy) for r in range(rows) for c in range(cols)),
+            key=lambda slot: (slot[0] * slot[0] + slot[1] * slot[1], slot[1], slot[0]),
+        )
+        for i, (ox, oy) in zip(members, slots[taken:]):
+            xs[i] = x + ox
+            ys[i] = y + oy
+
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from .core import Edge, EdgeId, Graph, Node
+
+
+def chronological_edges(
+    nodes: Iterable[Node],
+    per_color: bool = False,
+    existing_pairs: Optional[set[tuple[str, str]]] = None,
+) -> list[Edge]:
+    dated = [n for n in nodes if n.event_date is not None]
+    dated.sort(key=lambda n: (n.event_date, n.id.value))
+
+    chains: dict[Optional[str], list[Node]] = {}
+    for node in dated:
+        key = node.color if per_color else None
+        chains.setdefault(key, []).append(node)
+
+    skip = existing_pairs or set()
+    edges: list[Edge] = []
+    for chain in chains.values():
+        for prev, cur in zip(chain, chain[1:]):
+            if (prev.id.value, cur.id.value) in skip:
+                continue
+            edges.append(Edge(id=EdgeId.new(), source=prev.id, target=cur.id))
+    return edges
+
+
+def link_chronologically(
+    graph: Graph,
+    node_ids: Optional[Iterable[str]] = None,
+    per_color: bool = False,
+) -> list[Edge]:
+    if node_ids is None:
+        nodes: list[Node] = list(graph.iter_nodes())
+    else:
+        nodes = [graph.nodes[nid] for nid in set(node_ids) if nid in graph.nodes]
+
+    existing_pairs = {(e.source.value, e.target.value) for e in graph.iter_edges()}
+    edges = chronological_edges(nodes, per_color=per_color, existing_pairs=existing_pairs)
+    return graph.add_edges(edges)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .spatial_index import SpatialGrid
+
+BACKGROUND = 0xFFF4F4F4
+DOT = 0xFF3C3C3C
+
+
+class MinimapRaster:
+    """Low-resolution ARGB32 raster of node positions, redrawn tile by tile.
+
+    ``bounds`` ``(x0, y0, x1, y1)`` in scene coordinates is scaled
+    uniformly into a ``width`` x ``height`` pixel buffer and centred. Each
+    node is a 2x2 pixel dot. Changes only mark the tiles under the old and
+    new dot, and :meth:`redraw` re-rasterises just those tiles from a
+    :class:`SpatialGrid` of the node positions, so moving a few nodes costs
+    a few small queries however large the graph is.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        bounds: tuple[float, float, float, float],
+        tile_size: int = 32,
+    ) -> None:
+        if width <= 0 or height <= 0 or tile_size <= 0:
+            raise ValueError("raster and tile sizes must be positive")
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        x0, y0, x1, y1 = bounds
+        span_x = max(x1 - x0, 1e-9)
+        span_y = max(y1 - y0, 1e-9)
+        self.scale = min(width / span_x, height / span_y)
+        # Centre the bounds in the raster.
+        self.origin_x = x0 - (width / self.scale - span_x) * 0.5
+        self.origin_y = y0 - (height / self.scale - span_y) * 0.5
+        self.pixels = np.full((height, width), BACKGROUND, dtype=np.uint32)
+        self._tiles_x = -(-width // tile_size)
+        self._tiles_y = -(-height // tile_size)
+        self._dirty: set[tuple[int, int]] = set()
+        self.mark_all()
+
+    def to_pixels(self, x: float, y: float) -> tuple[float, float]:
+        return (x - self.origin_x) * self.scale, (y - self.origin_y) * self.scale
+
+    def to_scene(self, px: float, py: float) -> tuple[float, float]:
+        return px / self.scale + self.origin_x, py / self.scale + self.origin_y
+
+    def contains(self, x: float, y: float) -> bool:
+        px, py = self.to_pixels(x, y)
+        return 0 <= px < self.width - 1 and 0 <= py < self.height - 1
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def mark_all(self) -> None:
+        self._dirty = {(tx, ty) for tx in range(self._tiles_x) for ty in range(self._tiles_y)}
+
+    def mark(self, positions: Iterable[tuple[float, float]]) -> None:
+        """Mark the tiles under the dots at ``positions`` (old or new) as dirty."""
+        size = self.tile_size
+        for x, y in positions:
+            px, py = self.to_pixels(x, y)
+            ix, iy = int(np.floor(px)), int(np.floor(py))
+            # A dot spans two pixels and may straddle a tile border.
+            for cx in {ix // size, (ix + 1) // size}:
+                for cy in {iy // size, (iy + 1) // size}:
+                    if 0 <= cx < self._tiles_x and 0 <= cy < self._tiles_y:
+                        self._dirty.add((cx, cy))
+
+    def redraw(self, grid: SpatialGrid) -> list[tuple[int, int, int, int]]:
+        """Re-rasterise the dirty tiles; return their pixel rects ``(x, y, w, h)``."""
+        if not self._dirty:
+            return []
+        if len(self._dirty) * 4 >= self._tiles_x * self._tiles_y:
+            self._dirty.clear()
+            self._draw_full(grid)
+            return [(0, 0, self.width, self.height)]
+        rects: list[tuple[int, int, int, int]] = []
+        size = self.tile_size
+        pad = 2.0 / self.scale
+        for tx, ty in sorted(self._dirty):
+            x0, y0 = tx * size, ty * size
+            x1, y1 = min(x0 + size, self.width), min(y0 + size, self.height)
+            self.pixels[y0:y1, x0:x1] = BACKGROUND
+            sx0, sy0 = self.to_scene(x0, y0)
+            sx1, sy1 = self.to_scene(x1, y1)
+            ids = grid.query(sx0 - pad, sy0 - pad, sx1 + pad, sy1 + pad)
+            self._draw_points(_positions(grid, ids), (x0, y0, x1, y1))
+            rects.append((x0, y0, x1 - x0, y1 - y0))
+        self._dirty.clear()
+        return rects
+
+    def _draw_full(self, grid: SpatialGrid) -> None:
+        self.pixels[:] = BACKGROUND
+        self._draw_points(_positions(grid, None), (0, 0, self.width, self.height))
+
+    def _draw_points(self, points: np.ndarray, clip: tuple[int, int, int, int]) -> None:
+        if not len(points):
+            return
+        x0, y0, x1, y1 = clip
+        px = np.floor((points[:, 0] - self.origin_x) * self.scale).astype(np.int64)
+        py = np.floor((points[:, 1] - self.origin_y) * self.scale).astype(np.int64)
+        for dx in (0, 1):
+            for dy in (0, 1):
+                cx, cy = px + dx, py + dy
+                inside = (cx >= x0) & (cx < x1) & (cy >= y0) & (cy < y1)
+                self.pixels[cy[inside], cx[inside]] = DOT
+
+
+def _positions(grid: SpatialGrid, ids: Optional[list[str]]) -> np.ndarray:
+    if ids is None:
+        values = list(grid.positions().values())
+    else:
+        values = [grid.position(item_id) for item_id in ids]
+    return np.array(values, dtype=np.float64).reshape(-1, 2)
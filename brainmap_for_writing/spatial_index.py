@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from math import floor
+from typing import Iterable, Optional
+
+from .core import Graph
+
+
+class SpatialGrid:
+    """Uniform grid over point positions answering rectangle queries.
+
+    Inserting, moving and removing a point cost O(1); a query visits only
+    the cells overlapping the rectangle (or only occupied cells when that
+    is cheaper), so it scales with the result rather than the whole graph.
+    """
+
+    def __init__(self, cell_size: float = 512.0) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._points: dict[str, tuple[float, float]] = {}
+
+    @classmethod
+    def from_graph(cls, graph: Graph, cell_size: float = 512.0) -> SpatialGrid:
+        grid = cls(cell_size)
+        cells = grid._cells
+        points = grid._points
+        size = grid.cell_size
+        for node_id, node in graph.nodes.items():
+            x, y = node.x, node.y
+            points[node_id] = (x, y)
+            key = (floor(x / size), floor(y / size))
+            members = cells.get(key)
+            if members is None:
+                cells[key] = {node_id}
+            else:
+                members.add(node_id)
+        return grid
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._points
+
+    def position(self, item_id: str) -> tuple[float, float]:
+        return self._points[item_id]
+
+    def positions(self) -> dict[str, tuple[float, float]]:
+        """Read-only view of every indexed position, by id."""
+        return self._points
+
+    def bounds(self) -> Optional[tuple[float, float, float, float]]:
+        """``(x0, y0, x1, y1)`` of the occupied cells, or None when empty."""
+        if not self._cells:
+            return None
+        xs = [cx for cx, _ in self._cells]
+        ys = [cy for _, cy in self._cells]
+        size = self.cell_size
+        return min(xs) * size, min(ys) * size, (max(xs) + 1) * size, (max(ys) + 1) * size
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def insert(self, item_id: str, x: float, y: float) -> None:
+        """Add ``item_id`` at ``(x, y)``, moving it if already present."""
+        old = self._points.get(item_id)
+        cell = self._cell(x, y)
+        if old is not None:
+            old_cell = self._cell(*old)
+            if old_cell != cell:
+                self._discard(item_id, old_cell)
+                self._cells.setdefault(cell, set()).add(item_id)
+        else:
+            self._cells.setdefault(cell, set()).add(item_id)
+        self._points[item_id] = (x, y)
+
+    move = insert
+
+    def remove(self, item_id: str) -> None:
+        old = self._points.pop(item_id, None)
+        if old is not None:
+            self._discard(item_id, self._cell(*old))
+
+    def _discard(self, item_id: str, cell: tuple[int, int]) -> None:
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(item_id)
+            if not members:
+                del self._cells[cell]
+
+    def update(self, points: Iterable[tuple[str, float, float]]) -> None:
+        for item_id, x, y in points:
+            self.insert(item_id, x, y)
+
+    def query(self, x0: float, y0: float, x1: float, y1: float, limit: Optional[int] = None) -> Optional[list[str]]:
+        """Ids of the points inside the rectangle.
+
+        Returns None as soon as more than ``limit`` points are found, so
+        callers can fall back to a coarser representation cheaply.
+        """
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        span = (cx1 - cx0 + 1) * (cy1 - cy0 + 1)
+        if span <= len(self._cells):
+            cells = (
+                self._cells[(cx, cy)]
+                for cx in range(cx0, cx1 + 1)
+                for cy in range(cy0, cy1 + 1)
+                if (cx, cy) in self._cells
+            )
+        else:
+            cells = (
+                members for (cx, cy), members in self._cells.items() if cx0 <= cx <= cx1 and cy0 <= cy <= cy1
+            )
+
+        points = self._points
+        found: list[str] = []
+        for members in cells:
+            for item_id in members:
+                x, y = points[item_id]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.append(item_id)
+            if limit is not None and len(found) > limit:
+                return None
+        return found
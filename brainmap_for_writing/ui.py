@@ -1,25 +1,50 @@
 from __future__ import annotations
 
 import html
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import date, datetime
-from math import atan2, cos, sin
-from typing import Callable, Optional
+from functools import lru_cache, wraps
+from typing import Callable, Iterable, Iterator, Optional, Sequence
 
 from pathlib import Path
 
-from PySide6.QtCore import QLineF, QPointF, QRectF, Qt, Signal, QUrl
+import numpy as np
+from PySide6.QtCore import (
+    QEasingCurve,
+    QLineF,
+    QPointF,
+    QRectF,
+    QSettings,
+    QThread,
+    QTimeLine,
+    QTimer,
+    Qt,
+    Signal,
+    QUrl,
+)
 from PySide6.QtGui import (
     QAction,
     QBrush,
     QColor,
     QDesktopServices,
     QFont,
+    QFontMetricsF,
+    QImage,
     QKeySequence,
+    QOpenGLContext,
     QPainter,
     QPainterPath,
     QPen,
     QPolygonF,
+    QStaticText,
+    QSurfaceFormat,
+    QTextCursor,
+    QTransform,
 )
 from PySide6.QtWidgets import (
     QApplication,
@@ -34,16 +59,21 @@ from PySide6.QtWidgets import (
     QGraphicsItem,
     QGraphicsPathItem,
     QGraphicsScene,
-    QGraphicsTextItem,
     QGraphicsView,
+    QGroupBox,
     QHBoxLayout,
     QInputDialog,
     QLabel,
     QLineEdit,
+    QListWidget,
+    QListWidgetItem,
     QMainWindow,
     QMenu,
     QMessageBox,
+    QProgressBar,
+    QProgressDialog,
     QPushButton,
+    QSpinBox,
     QHeaderView,
     QTableWidget,
     QTableWidgetItem,
@@ -55,13 +85,53 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+try:
+    from PySide6.QtOpenGLWidgets import QOpenGLWidget
+except ImportError:  # PySide6 built without OpenGL support
+    QOpenGLWidget = None
+
 from .core import Edge, EdgeId, Graph, Node, NodeId, build_ai_friendly_prompt
-from .edit_ops import DeleteSnapshot, delete_nodes_and_edges, undo_delete
-from .edge_geometry import compute_parallel_edge_indices, curve_step
-from .importer import ImportErrorDetail, import_txt_file
-from .layout import assign_default_layout, assign_default_layout_for_new_nodes
+from .edit_ops import delete_nodes_and_edges
+from .edge_bundling import bundle_edges, spatial_chunks
+from .edge_geometry import ParallelEdgeIndex, compute_edge_geometry
+from .exporter import export_txt_file
+from .force_layout import ForceLayout
+from .frame_stats import FrameStats
+from .history import (
+    AddItems,
+    Command,
+    EdgeFieldsChange,
+    MoveNodes,
+    NodeFieldsChange,
+    RemoveItems,
+    UndoHistory,
+    position_diff,
+    set_edge_fields,
+    set_node_fields,
+)
+from .importer import (
+    BUILTIN_MARKER_FORMATS,
+    DEFAULT_MARKER_FORMATS,
+    ImportErrorDetail,
+    ImportReport,
+    import_txt_file_lenient,
+)
+from .layout import (
+    LayoutCancelled,
+    LayoutConfig,
+    ProgressCallback,
+    assign_default_layout,
+    assign_default_layout_for_new_nodes,
+    assign_layered_layout,
+    assign_timeline_layout,
+    layout_snapshot,
+    remove_overlaps,
+)
+from .linking import link_chronologically
+from .minimap import MinimapRaster
 from .persistence import load_project, save_project
-from .visibility import compute_visible_nodes
+from .spatial_index import SpatialGrid
+from .visibility import VisibilityDelta, VisibilityIndex
 
 
 @dataclass
@@ -70,6 +140,98 @@ class UiConfig:
     # Date display format: "date" or "datetime"
     date_display_format: str = "date"
     edge_width: float = 2.0
+    timeline_pixels_per_day: float = 2.0
+    animate_layout: bool = True
+    # Larger layouts are applied in one step instead of animated.
+    animate_layout_max_nodes: int = 2000
+    # Level-of-detail thresholds, in view scale (1.0 = 100% zoom). Below
+    # lod_labels node labels are hidden, below lod_details edge arrows,
+    # toggles and antialiasing are dropped, below lod_dots nodes are dots.
+    lod_labels: float = 0.5
+    lod_details: float = 0.35
+    lod_dots: float = 0.15
+    # Graphs with at least this many nodes only get items near the viewport
+    # (0 disables). With more than virtual_max_items nodes in view, a
+    # density overview is drawn instead of items.
+    virtualize_min_nodes: int = 100_000
+    virtual_max_items: int = 20_000
+    # Opening a project with at least this many nodes creates the items in
+    # view first and the rest in time slices from the event loop.
+    progressive_load_min_nodes: int = 5_000
+    # Rendering strategy, tuned per machine and kept in QSettings (see
+    # RENDERING_SETTINGS). viewport_update is a VIEWPORT_UPDATE_MODES key;
+    # antialiasing is "always", "detail" (only above lod_details) or
+    # "never"; scene_index is "bsp" or "none", with bsp_depth 0 letting Qt
+    # choose; opengl is "off", "hardware" or "software" (Mesa llvmpipe,
+    # applied at startup).
+    viewport_update: str = "minimal"
+    item_cache: bool = False
+    antialiasing: str = "detail"
+    scene_index: str = "bsp"
+    bsp_depth: int = 0
+    opengl: str = "off"
+
+    def antialias(self, lod: float) -> bool:
+        if self.antialiasing == "detail":
+            return lod >= self.lod_details
+        return self.antialiasing == "always"
+
+
+VIEWPORT_UPDATE_MODES = {
+    "minimal": QGraphicsView.MinimalViewportUpdate,
+    "smart": QGraphicsView.SmartViewportUpdate,
+    "bounding": QGraphicsView.BoundingRectViewportUpdate,
+    "full": QGraphicsView.FullViewportUpdate,
+}
+_RENDERING_CHOICES = {
+    "viewport_update": tuple(VIEWPORT_UPDATE_MODES),
+    "antialiasing": ("always", "detail", "never"),
+    "scene_index": ("bsp", "none"),
+    "opengl": ("off", "hardware", "software"),
+}
+RENDERING_SETTINGS = ("viewport_update", "item_cache", "antialiasing", "scene_index", "bsp_depth", "opengl")
+
+
+def app_settings() -> QSettings:
+    return QSettings("brainmap_for_writing", "brainmap_for_writing")
+
+
+def load_rendering_settings(cfg: UiConfig, settings: QSettings) -> None:
+    """Read the persisted rendering settings into ``cfg``; unknown values keep the defaults."""
+    settings.beginGroup("rendering")
+    try:
+        for name in RENDERING_SETTINGS:
+            if not settings.contains(name):
+                continue
+            default = getattr(cfg, name)
+            try:
+                value = settings.value(name, default, type=type(default))
+            except (TypeError, ValueError):
+                continue
+            if value in _RENDERING_CHOICES.get(name, (value,)):
+                setattr(cfg, name, value)
+    finally:
+        settings.endGroup()
+
+
+def save_rendering_settings(cfg: UiConfig, settings: QSettings) -> None:
+    settings.beginGroup("rendering")
+    try:
+        for name in RENDERING_SETTINGS:
+            settings.setValue(name, getattr(cfg, name))
+    finally:
+        settings.endGroup()
+    settings.sync()
+
+
+def _item_cache_mode(cfg: UiConfig) -> QGraphicsItem.CacheMode:
+    return QGraphicsItem.DeviceCoordinateCache if cfg.item_cache else QGraphicsItem.NoCache
+
+
+def opengl_available() -> bool:
+    if QOpenGLWidget is None:
+        return False
+    return QOpenGLContext().create()
 
 
 class NodeEditDialog(QDialog):
@@ -140,10 +302,59 @@ class DisplaySettingsDialog(QDialog):
         self._edge_width.setDecimals(1)
         self._edge_width.setValue(float(cfg.edge_width))
 
+        self._timeline_scale = QDoubleSpinBox(self)
+        self._timeline_scale.setRange(0.01, 500.0)
+        self._timeline_scale.setDecimals(2)
+        self._timeline_scale.setSuffix(" px/day")
+        self._timeline_scale.setValue(float(cfg.timeline_pixels_per_day))
+
         form = QFormLayout()
         form.addRow("Date Display", self._date_format)
         form.addRow("Node Size", self._node_radius)
         form.addRow("Edge Thickness", self._edge_width)
+        form.addRow("Timeline Scale", self._timeline_scale)
+
+        self._viewport_update = self._choice_box(
+            [
+                ("Minimal", "minimal"),
+                ("Smart", "smart"),
+                ("Bounding rect", "bounding"),
+                ("Full viewport", "full"),
+            ],
+            cfg.viewport_update,
+        )
+        self._viewport_update.setToolTip("How much of the view is repainted when items change.")
+        self._item_cache = self._choice_box([("Off", False), ("Device coordinate cache", True)], cfg.item_cache)
+        self._item_cache.setToolTip(
+            "Cache every node and edge as a pixmap. Faster repaints while panning, more memory."
+        )
+        self._antialiasing = self._choice_box(
+            [("Always", "always"), ("Above detail zoom", "detail"), ("Never", "never")], cfg.antialiasing
+        )
+        self._scene_index = self._choice_box([("BSP tree", "bsp"), ("No index", "none")], cfg.scene_index)
+        self._scene_index.setToolTip("No index is faster when most items move at once, slower for hit tests.")
+        self._bsp_depth = QSpinBox(self)
+        self._bsp_depth.setRange(0, 32)
+        self._bsp_depth.setSpecialValueText("Automatic")
+        self._bsp_depth.setValue(int(cfg.bsp_depth))
+        self._bsp_depth.setEnabled(cfg.scene_index == "bsp")
+        self._scene_index.currentIndexChanged.connect(
+            lambda: self._bsp_depth.setEnabled(self._scene_index.currentData() == "bsp")
+        )
+        self._opengl = self._choice_box(
+            [("Off", "off"), ("Hardware", "hardware"), ("Software (Mesa)", "software")], cfg.opengl
+        )
+        self._opengl.setToolTip("Draw the view with OpenGL. Switching to or from software rendering needs a restart.")
+
+        rendering_form = QFormLayout()
+        rendering_form.addRow("Viewport Updates", self._viewport_update)
+        rendering_form.addRow("Item Cache", self._item_cache)
+        rendering_form.addRow("Antialiasing", self._antialiasing)
+        rendering_form.addRow("Scene Index", self._scene_index)
+        rendering_form.addRow("BSP Depth", self._bsp_depth)
+        rendering_form.addRow("OpenGL Viewport", self._opengl)
+        rendering = QGroupBox("Rendering", self)
+        rendering.setLayout(rendering_form)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
@@ -151,18 +362,175 @@ class DisplaySettingsDialog(QDialog):
 
         layout = QVBoxLayout()
         layout.addLayout(form)
+        layout.addWidget(rendering)
         layout.addWidget(buttons)
         self.setLayout(layout)
 
-    def get_values(self) -> tuple[str, float, float]:
+    def _choice_box(self, choices: list[tuple[str, object]], current: object) -> QComboBox:
+        box = QComboBox(self)
+        for label, value in choices:
+            box.addItem(label, value)
+            if value == current:
+                box.setCurrentIndex(box.count() - 1)
+        return box
+
+    def get_values(self) -> tuple[str, float, float, float]:
         return (
             self._date_format.currentText(),
             float(self._node_radius.value()),
             float(self._edge_width.value()),
+            float(self._timeline_scale.value()),
         )
 
+    def get_rendering(self) -> dict[str, object]:
+        return {
+            "viewport_update": self._viewport_update.currentData(),
+            "item_cache": bool(self._item_cache.currentData()),
+            "antialiasing": self._antialiasing.currentData(),
+            "scene_index": self._scene_index.currentData(),
+            "bsp_depth": int(self._bsp_depth.value()),
+            "opengl": self._opengl.currentData(),
+        }
+
+
+class MarkerFormatsDialog(QDialog):
+    def __init__(self, parent: QWidget, enabled: list[str]) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Date Marker Formats")
+
+        active = set(enabled or DEFAULT_MARKER_FORMATS)
+        self._list = QListWidget(self)
+        for name, fmt in BUILTIN_MARKER_FORMATS.items():
+            item = QListWidgetItem(name, self._list)
+            item.setToolTip(fmt.pattern)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if name in active else Qt.Unchecked)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Lines matching any checked format start a dated block:", self))
+        layout.addWidget(self._list)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def get_values(self) -> list[str]:
+        names: list[str] = []
+        for row in range(self._list.count()):
+            item = self._list.item(row)
+            if item.checkState() == Qt.Checked:
+                names.append(item.text())
+        return names
+
+
+class ImportReportDialog(QDialog):
+    def __init__(self, parent: QWidget, report: ImportReport, source_text: str) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Import Problems")
+        self.resize(760, 520)
+        self._errors = list(report.errors)
+
+        self._list = QListWidget(self)
+        for err in self._errors:
+            self._list.addItem(str(err))
+        self._list.currentRowChanged.connect(self._show_error)
+
+        self._source = QTextEdit(self)
+        self._source.setReadOnly(True)
+        self._source.setLineWrapMode(QTextEdit.NoWrap)
+        self._source.setPlainText(source_text)
+
+        node_count = len(report.graph.nodes)
+        if node_count:
+            summary = f"{len(self._errors)} problem(s) found. {node_count} valid node(s) can still be imported."
+            buttons = QDialogButtonBox(QDialogButtonBox.Cancel)
+            buttons.addButton("Import Valid Blocks", QDialogButtonBox.AcceptRole)
+        else:
+            summary = f"{len(self._errors)} problem(s) found. Nothing can be imported."
+            buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(summary, self))
+        layout.addWidget(self._list, 1)
+        layout.addWidget(self._source, 2)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        if self._errors:
+            self._list.setCurrentRow(0)
+
+    def _show_error(self, row: int) -> None:
+        if row < 0 or row >= len(self._errors):
+            return
+        err = self._errors[row]
+        if err.line_number is None:
+            return
+        block = self._source.document().findBlockByNumber(err.line_number - 1)
+        if not block.isValid():
+            return
+        cursor = QTextCursor(block)
+        if err.span is not None:
+            start, end = err.span
+            cursor.setPosition(block.position() + start)
+            cursor.setPosition(block.position() + end, QTextCursor.KeepAnchor)
+        else:
+            cursor.select(QTextCursor.LineUnderCursor)
+        self._source.setTextCursor(cursor)
+        self._source.ensureCursorVisible()
+
+
+_LABEL_COLOR = QColor(20, 20, 20)
+
+
+@lru_cache(maxsize=256)
+def node_tooltip_html(text: str, memory: str, story_path: str) -> str:
+    parts: list[str] = []
+    if text:
+        parts.append(f"<b>Text</b><br/>{html.escape(text)}")
+    else:
+        parts.append("<b>Text</b><br/>(empty)")
+    if memory:
+        parts.append(f"<b>Memory</b><br/>{html.escape(memory)}")
+    if story_path:
+        parts.append(f"<b>Story TXT</b><br/>{html.escape(story_path)}")
+
+    inner = "<br/><br/>".join(parts)
+    return f'<div style="width: 360px; white-space: pre-wrap;">{inner}</div>'
+
+
+@lru_cache(maxsize=1)
+def _label_font() -> QFont:
+    font = QFont()
+    font.setPointSize(8)
+    return font
+
+
+@lru_cache(maxsize=16384)
+def _static_label(text: str) -> QStaticText:
+    """Laid-out label, shared by every node showing the same string (e.g. a date)."""
+    label = QStaticText(text)
+    label.setTextFormat(Qt.PlainText)
+    label.setPerformanceHint(QStaticText.AggressiveCaching)
+    label.prepare(QTransform(), _label_font())
+    return label
+
 
 class NodeItem(QGraphicsItem):
+    PADDING = 2.0
+    LABEL_HEIGHT = 38.0
+
+    @classmethod
+    def footprint(cls, cfg: UiConfig) -> tuple[float, float]:
+        """Width and height a node occupies including its date and note labels."""
+        sample = "0000-00-00 00:00:00" if cfg.date_display_format == "datetime" else "0000-00-00"
+        label_w = QFontMetricsF(_label_font()).horizontalAdvance(sample)
+        circle = (cfg.node_radius + cls.PADDING) * 2
+        return max(circle, label_w), circle + cls.LABEL_HEIGHT
+
     def __init__(self, node: Node, cfg: UiConfig) -> None:
         super().__init__()
         self._cfg = cfg
@@ -175,31 +543,44 @@ class NodeItem(QGraphicsItem):
             | QGraphicsItem.ItemSendsGeometryChanges
         )
         self.setAcceptHoverEvents(True)
+        self.setCacheMode(_item_cache_mode(cfg))
 
         self.node_id = node.id
-        self._date_text = QGraphicsTextItem(self)
-        self._note_text = QGraphicsTextItem(self)
-        self._date_text.setDefaultTextColor(QColor(20, 20, 20))
-        self._note_text.setDefaultTextColor(QColor(20, 20, 20))
-        font = QFont()
-        font.setPointSize(8)
-        self._date_text.setFont(font)
-        self._note_text.setFont(font)
+        self._pinned = node.pinned
+        self._label_key: Optional[tuple[str, str, float]] = None
+        self._labels: list[tuple[QPointF, QStaticText]] = []
+        self._label_half_width = 0.0
 
         self.update_from_node(node)
 
     def boundingRect(self) -> QRectF:
         r = self._cfg.node_radius
-        padding = 2.0
-        label_h = 38.0
-        return QRectF(-r - padding, -r - padding, (r + padding) * 2, (r + padding) * 2 + label_h)
+        padding = self.PADDING
+        half_width = max(r + padding, self._label_half_width)
+        return QRectF(-half_width, -r - padding, half_width * 2, (r + padding) * 2 + self.LABEL_HEIGHT)
 
     def paint(self, painter: QPainter, option, widget=None) -> None:
-        painter.setRenderHint(QPainter.Antialiasing, True)
+        if _frame_stats is not None:
+            _frame_stats.painted += 1
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
         r = self._cfg.node_radius
+        if lod < self._cfg.lod_dots:
+            color = self._selected_pen.color() if self.isSelected() else self._dot_color
+            painter.fillRect(QRectF(-r, -r, r * 2, r * 2), color)
+            return
+        painter.setRenderHint(QPainter.Antialiasing, self._cfg.antialias(lod))
         painter.setBrush(self._brush)
         painter.setPen(self._selected_pen if self.isSelected() else self._pen)
         painter.drawEllipse(QPointF(0, 0), r, r)
+        if self._pinned:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(QColor(60, 60, 60)))
+            painter.drawEllipse(QPointF(0, 0), 2.5, 2.5)
+        if self._labels and lod >= self._cfg.lod_labels:
+            painter.setFont(_label_font())
+            painter.setPen(_LABEL_COLOR)
+            for pos, label in self._labels:
+                painter.drawStaticText(pos, label)
 
     def shape(self) -> QPainterPath:
         path = QPainterPath()
@@ -211,7 +592,7 @@ class NodeItem(QGraphicsItem):
         return self._cfg.node_radius
 
     def update_from_node(self, node: Node) -> None:
-        self.prepareGeometryChange()
+        self._pinned = node.pinned
         if node.event_date:
             if self._cfg.date_display_format == "datetime":
                 label = node.event_date.isoformat(sep=" ")
@@ -220,14 +601,10 @@ class NodeItem(QGraphicsItem):
         else:
             label = "----"
 
-        self._date_text.setPlainText(label)
-        self._date_text.setPos(-self._date_text.boundingRect().width() / 2, self._cfg.node_radius + 2)
-
         note = (node.note or "").strip()
         if len(note) > 10:
             note = note[:10] + "…"
-        self._note_text.setPlainText(note)
-        self._note_text.setPos(-self._note_text.boundingRect().width() / 2, self._cfg.node_radius + 18)
+        self._set_labels(label, note)
 
         if node.color:
             color = QColor(node.color)
@@ -237,24 +614,43 @@ class NodeItem(QGraphicsItem):
                 self._brush = QBrush(QColor(250, 250, 250))
         else:
             self._brush = QBrush(QColor(250, 250, 250))
+        # Uncoloured nodes would vanish as white dots, so use the outline colour.
+        self._dot_color = self._brush.color() if node.color and self._brush.color().isValid() else self._pen.color()
+        self.update()
 
-        text = node.text.strip()
-        memory = (node.memory_block or "").strip()
-        story_path = (node.story_txt_path or "").strip()
+    def bind(self, node: Node) -> None:
+        """Reuse this (detached) item for ``node``."""
+        self.node_id = node.id
+        self.setSelected(False)
+        self.setVisible(True)
+        self.setToolTip("")
+        self.setPos(node.x, node.y)
+        self.update_from_node(node)
 
-        parts: list[str] = []
-        if text:
-            parts.append(f"<b>Text</b><br/>{html.escape(text)}")
-        else:
-            parts.append("<b>Text</b><br/>(empty)")
-        if memory:
-            parts.append(f"<b>Memory</b><br/>{html.escape(memory)}")
-        if story_path:
-            parts.append(f"<b>Story TXT</b><br/>{html.escape(story_path)}")
-
-        inner = "<br/><br/>".join(parts)
-        self.setToolTip(f'<div style="width: 360px; white-space: pre-wrap;">{inner}</div>')
-        self.update()
+    def hoverEnterEvent(self, event) -> None:
+        # Tooltips are built only for nodes that are actually hovered.
+        scene = self.scene()
+        if scene is not None and hasattr(scene, "_node_tooltip"):
+            self.setToolTip(scene._node_tooltip(self.node_id))
+        super().hoverEnterEvent(event)
+
+    def _set_labels(self, date_label: str, note_label: str) -> None:
+        # Re-layout only when the text or the radius (a display setting) changed.
+        r = self._cfg.node_radius
+        key = (date_label, note_label, r)
+        if key == self._label_key:
+            return
+        self.prepareGeometryChange()
+        self._label_key = key
+        self._labels = []
+        self._label_half_width = 0.0
+        for text, y in ((date_label, r + 6), (note_label, r + 22)):
+            if not text:
+                continue
+            label = _static_label(text)
+            width = label.size().width()
+            self._labels.append((QPointF(-width / 2, y), label))
+            self._label_half_width = max(self._label_half_width, width / 2)
 
     def contextMenuEvent(self, event) -> None:
         scene = self.scene()
@@ -288,84 +684,88 @@ class EdgeItem(QGraphicsPathItem):
         self._toggle_radius = 11.0
         self._collapsed_label = ""
         self._curve_index = 0
+        # Drawn by a shared EdgeBundleItem; only the toggle is painted here.
+        self._bundled = False
+        # boundingRect is queried many times per frame while dragging.
+        self._bounds: Optional[QRectF] = None
         self.setFlags(QGraphicsItem.ItemIsSelectable)
-        self.update_path()
-
-    def sync_from_edge(self, edge: Edge, collapsed_label: str, curve_index: int) -> None:
+        self.setCacheMode(_item_cache_mode(cfg))
+
+    def sync_from_edge(
+        self,
+        edge: Edge,
+        collapsed_label: str,
+        curve_index: Optional[int] = None,
+        update_path: bool = True,
+    ) -> None:
+        if edge.collapsed != self._collapsed or collapsed_label != self._collapsed_label:
+            self.prepareGeometryChange()
         self._collapsed = edge.collapsed
         self._collapsed_label = collapsed_label
-        self._curve_index = curve_index
+        if curve_index is not None:
+            self._curve_index = curve_index
         self.setPen(QPen(QColor(30, 30, 30), float(self._cfg.edge_width)))
-        self.update_path()
+        self._bounds = None
+        if update_path:
+            self.update_path()
 
     def update_path(self) -> None:
-        a = self._source_item.mapToScene(QPointF(0, 0))
-        b = self._target_item.mapToScene(QPointF(0, 0))
-        base_line = QLineF(a, b)
-        if base_line.length() < 1.0:
-            self.setPath(QPainterPath())
-            self._arrow_poly = QPolygonF()
-            return
-
-        u = QPointF(base_line.dx() / base_line.length(), base_line.dy() / base_line.length())
-        n = QPointF(-u.y(), u.x())
-        start_pad = self._source_item.radius() + 6.0
-        end_pad = self._target_item.radius() + 8.0
-        p1 = QPointF(a.x() + u.x() * start_pad, a.y() + u.y() * start_pad)
-        p2 = QPointF(b.x() - u.x() * end_pad, b.y() - u.y() * end_pad)
-
-        mid = QPointF((p1.x() + p2.x()) / 2, (p1.y() + p2.y()) / 2)
-        offset = float(self._curve_index) * curve_step(float(self._source_item.radius()), float(self._cfg.edge_width))
-        control = QPointF(mid.x() + n.x() * offset, mid.y() + n.y() * offset)
-
-        toggle_t = 0.55
-        p01 = QPointF(p1.x() + (control.x() - p1.x()) * toggle_t, p1.y() + (control.y() - p1.y()) * toggle_t)
-        p12 = QPointF(control.x() + (p2.x() - control.x()) * toggle_t, control.y() + (p2.y() - control.y()) * toggle_t)
-        self._toggle_center = QPointF(p01.x() + (p12.x() - p01.x()) * toggle_t, p01.y() + (p12.y() - p01.y()) * toggle_t)
+        update_edge_paths((self,))
 
+    def set_geometry(self, row: Sequence[float]) -> None:
+        """Install one row of :meth:`EdgeGeometry.packed` output."""
+        sx, sy, cx, cy, ex, ey, lx, ly, tx, ty = row[:10]
+        self._toggle_center = QPointF(tx, ty)
+        path = QPainterPath()
+        path.moveTo(sx, sy)
         if self._collapsed:
             self._arrow_poly = QPolygonF()
-            path = QPainterPath()
-            path.moveTo(p1)
-            path.quadTo(p01, self._toggle_center)
-            self.setPath(path)
-            return
+            path.quadTo(lx, ly, tx, ty)
+        else:
+            self._arrow_poly = QPolygonF([QPointF(row[i], row[i + 1]) for i in (10, 12, 14)])
+            path.quadTo(cx, cy, ex, ey)
+        self.setPath(path)
+        self._bounds = None
 
-        tangent = QPointF(p2.x() - control.x(), p2.y() - control.y())
-        angle = atan2(-tangent.y(), tangent.x())
+    def clear_geometry(self) -> None:
+        self._arrow_poly = QPolygonF()
+        self.setPath(QPainterPath())
+        self._bounds = None
 
-        arrow_size = max(12.0, float(self._source_item.radius()) * 1.1)
-        arrow_half_width = arrow_size * 0.5
-        tip = p2
-        back = QPointF(
-            tip.x() - arrow_size * cos(angle),
-            tip.y() + arrow_size * sin(angle),
-        )
-        left = QPointF(
-            back.x() - arrow_half_width * cos(angle + 1.5708),
-            back.y() + arrow_half_width * sin(angle + 1.5708),
-        )
-        right = QPointF(
-            back.x() - arrow_half_width * cos(angle - 1.5708),
-            back.y() + arrow_half_width * sin(angle - 1.5708),
-        )
-        self._arrow_poly = QPolygonF([tip, left, right])
+    def bind(self, edge: Edge, source_item: NodeItem, target_item: NodeItem) -> None:
+        """Reuse this (detached) item for ``edge``; the caller syncs its state."""
+        self.edge_id = edge.id
+        self.source_id = edge.source
+        self.target_id = edge.target
+        self._source_item = source_item
+        self._target_item = target_item
+        self._bundled = False
+        self.setSelected(False)
+        self.setVisible(True)
 
-        path = QPainterPath()
-        path.moveTo(p1)
-        path.quadTo(control, p2)
-        self.setPath(path)
+    def set_bundled(self, bundled: bool) -> None:
+        if self._bundled != bundled:
+            self._bundled = bundled
+            self.update()
 
     def paint(self, painter: QPainter, option, widget=None) -> None:
+        if _frame_stats is not None:
+            _frame_stats.painted += 1
         if self.isSelected():
             painter.setPen(QPen(QColor(30, 120, 220), 2.8))
             painter.setBrush(QBrush(QColor(30, 120, 220)))
         else:
             painter.setPen(self.pen())
             painter.setBrush(self._arrow_brush)
-        painter.drawPath(self.path())
-        if not self._arrow_poly.isEmpty():
-            painter.drawPolygon(self._arrow_poly)
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        detailed = lod >= self._cfg.lod_details
+        painter.setRenderHint(QPainter.Antialiasing, self._cfg.antialias(lod))
+        if not self._bundled or self.isSelected():
+            painter.drawPath(self.path())
+            if detailed and not self._arrow_poly.isEmpty():
+                painter.drawPolygon(self._arrow_poly)
+        if not detailed:
+            return
 
         painter.setPen(QPen(QColor(60, 60, 60), 1.2))
         painter.setBrush(QBrush(QColor(255, 255, 255)))
@@ -402,6 +802,15 @@ class EdgeItem(QGraphicsPathItem):
             painter.drawText(rect, Qt.AlignCenter, self._collapsed_label)
 
     def boundingRect(self) -> QRectF:
+        if self._bounds is None:
+            self._bounds = self._compute_bounds()
+        return self._bounds
+
+    def _compute_bounds(self) -> QRectF:
+        if self.path().isEmpty():
+            # Not routed yet (or degenerate): nothing to draw, and no stray
+            # repaints around the scene origin when a batch is added.
+            return QRectF()
         rect = super().boundingRect()
         
         # Include the toggle button
@@ -442,8 +851,290 @@ class EdgeItem(QGraphicsPathItem):
         scene._open_edge_menu(self.edge_id, event)
 
 
+# Set while the view's performance HUD is shown; None costs one check per call.
+_frame_stats: Optional[FrameStats] = None
+
+
+def _set_frame_stats(stats: Optional[FrameStats]) -> None:
+    global _frame_stats
+    _frame_stats = stats
+
+
+def _timed(name: str) -> Callable:
+    """Record the duration of each call under ``name`` while the HUD is shown."""
+
+    def decorate(func: Callable) -> Callable:
+        @wraps(func)
+        def timed(*args, **kwargs):
+            stats = _frame_stats
+            if stats is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.add_timing(name, time.perf_counter() - start)
+
+        return timed
+
+    return decorate
+
+
+@_timed("edges")
+def update_edge_paths(items: Sequence[EdgeItem]) -> None:
+    """Recompute the paths of ``items`` in one vectorised pass."""
+    if not items:
+        return
+    ends = np.array(
+        [
+            (it._source_item.x(), it._source_item.y(), it._target_item.x(), it._target_item.y())
+            for it in items
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    geometry = compute_edge_geometry(
+        ends[:, :2],
+        ends[:, 2:],
+        [it._source_item.radius() for it in items],
+        [it._target_item.radius() for it in items],
+        [it._curve_index for it in items],
+        float(items[0]._cfg.edge_width),
+    )
+    for item, valid, row in zip(items, geometry.valid.tolist(), geometry.packed().tolist()):
+        if valid:
+            item.set_geometry(row)
+        else:
+            item.clear_geometry()
+
+
+def _polyline_path(polylines: np.ndarray) -> QPainterPath:
+    path = QPainterPath()
+    for line in polylines.tolist():
+        path.moveTo(*line[0])
+        for x, y in line[1:]:
+            path.lineTo(x, y)
+    return path
+
+
+class EdgeBundleItem(QGraphicsItem):
+    """One shared item drawing the bundled routes of a group of edges.
+
+    A coarser copy of the routes is drawn below ``lod_details``.
+    """
+
+    def __init__(self, polylines: np.ndarray, cfg: UiConfig) -> None:
+        super().__init__()
+        self._cfg = cfg
+        self._path = _polyline_path(polylines)
+        self._coarse_path = _polyline_path(polylines[:, :: max(1, (polylines.shape[1] - 1) // 4)])
+        self._pen = QPen(QColor(30, 30, 30, 110), float(cfg.edge_width))
+        margin = float(cfg.edge_width)
+        self._rect = self._path.boundingRect().adjusted(-margin, -margin, margin, margin)
+        self.setZValue(-11)
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def paint(self, painter: QPainter, option, widget=None) -> None:
+        if _frame_stats is not None:
+            _frame_stats.painted += 1
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        painter.setPen(self._pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self._coarse_path if lod < self._cfg.lod_details else self._path)
+
+
+class OverviewItem(QGraphicsItem):
+    """Node density image shown instead of items when too many are in view."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._image = QImage()
+        self._rect = QRectF()
+        self.setZValue(-20)
+
+    def set_image(self, image: QImage, rect: QRectF) -> None:
+        self.prepareGeometryChange()
+        self._image = image
+        self._rect = QRectF(rect)
+        self.update()
+
+    def image_rect(self) -> QRectF:
+        return QRectF(self._rect)
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def paint(self, painter: QPainter, option, widget=None) -> None:
+        if _frame_stats is not None:
+            _frame_stats.painted += 1
+        if not self._image.isNull():
+            painter.drawImage(self._rect, self._image)
+
+
+class ForceLayoutWorker(QThread):
+    """Runs a :class:`ForceLayout` off the GUI thread.
+
+    The GUI and the worker share no lock. Held (dragged) positions and pin
+    changes are queued on deques, which append and pop atomically, and the
+    worker applies them between steps. Snapshots are published as a single
+    "latest" array: ``positionsReady`` fires only once the GUI has taken the
+    previous snapshot, so a slow GUI sees fewer, fresher frames instead of a
+    backlog of stale ones.
+    """
+
+    positionsReady = Signal()
+
+    def __init__(self, sim: ForceLayout, parent=None) -> None:
+        super().__init__(parent)
+        self._sim = sim
+        self._stop_requested = False
+        self._held_updates: deque[dict[str, tuple[float, float]]] = deque(maxlen=1)
+        self._pin_updates: deque[tuple[str, bool, float, float]] = deque()
+        self._holding = False
+        self._latest: Optional[np.ndarray] = None
+        self._notified = threading.Event()
+        self._frame_interval = 1.0 / 30.0
+
+    @property
+    def node_ids(self) -> list[str]:
+        return self._sim.node_ids
+
+    def request_stop(self) -> None:
+        self._stop_requested = True
+
+    def hold(self, positions: dict[str, tuple[float, float]]) -> None:
+        """Keep ``positions`` fixed from the next step on (GUI thread)."""
+        if not positions and not self._holding:
+            return
+        self._holding = bool(positions)
+        self._held_updates.append(dict(positions))
+
+    def set_pinned(self, node_id: str, pinned: bool, x: float, y: float) -> None:
+        """Pin or unpin a node of the running simulation (GUI thread)."""
+        self._pin_updates.append((node_id, pinned, x, y))
+
+    def take_positions(self) -> Optional[np.ndarray]:
+        """Latest snapshot; re-arms ``positionsReady`` (GUI thread)."""
+        self._notified.clear()
+        return self._latest
+
+    def _drain_updates(self, held: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        sim = self._sim
+        while self._pin_updates:
+            node_id, pinned, x, y = self._pin_updates.popleft()
+            sim.set_pinned(node_id, pinned)
+            if pinned:
+                sim.set_position(node_id, x, y)
+        try:
+            positions = self._held_updates.pop()
+        except IndexError:
+            return held
+        if not positions:
+            return None
+        held = np.zeros(len(sim.node_ids), dtype=bool)
+        for nid, (x, y) in positions.items():
+            idx = sim.index_of(nid)
+            if idx is None:
+                continue
+            sim.set_position(nid, x, y)
+            held[idx] = True
+        return held
+
+    def _publish(self) -> None:
+        self._latest = self._sim.positions.copy()
+        if not self._notified.is_set():
+            self._notified.set()
+            self.positionsReady.emit()
+
+    def run(self) -> None:
+        held: Optional[np.ndarray] = None
+        last_emit = 0.0
+        while not self._stop_requested and not self._sim.converged:
+            held = self._drain_updates(held)
+            self._sim.step(held)
+            now = time.monotonic()
+            if now - last_emit >= self._frame_interval:
+                self._publish()
+                last_emit = now
+        self._publish()
+
+
+LayoutFunction = Callable[[Graph, ProgressCallback], None]
+
+
+class LayoutJob(QThread):
+    progressed = Signal(int)
+    completed = Signal(object)
+
+    def __init__(self, snapshot: Graph, layout_fn: LayoutFunction, parent=None) -> None:
+        super().__init__(parent)
+        self._snapshot = snapshot
+        self._layout_fn = layout_fn
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def _on_progress(self, fraction: float) -> None:
+        if self._cancelled:
+            raise LayoutCancelled()
+        self.progressed.emit(int(fraction * 100))
+
+    def run(self) -> None:
+        try:
+            self._layout_fn(self._snapshot, self._on_progress)
+        except LayoutCancelled:
+            return
+        if not self._cancelled:
+            self.completed.emit(self._snapshot)
+
+
+class BundlingJob(QThread):
+    """Computes bundled edge routes for a snapshot of endpoint positions."""
+
+    completed = Signal(object, object)
+
+    def __init__(self, edge_ids: list[str], sources: np.ndarray, targets: np.ndarray, parent=None) -> None:
+        super().__init__(parent)
+        self._edge_ids = edge_ids
+        self._sources = sources
+        self._targets = targets
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def _on_progress(self, fraction: float) -> None:
+        if self._cancelled:
+            raise LayoutCancelled()
+
+    def run(self) -> None:
+        try:
+            polylines = bundle_edges(self._sources, self._targets, progress=self._on_progress)
+        except LayoutCancelled:
+            return
+        if not self._cancelled:
+            self.completed.emit(self._edge_ids, polylines)
+
+
 class GraphScene(QGraphicsScene):
     legendChanged = Signal()
+    # Node positions or the set of drawn edges changed; bundles are stale.
+    bundlesInvalidated = Signal()
+    # Ids of nodes added, removed or moved; None when the whole graph changed.
+    nodesChanged = Signal(object)
+    # Nodes materialised so far and in total while a progressive load runs.
+    loadProgress = Signal(int, int)
+    # A node was pinned or unpinned (id, pinned).
+    pinChanged = Signal(str, bool)
+
+    BUNDLE_CHUNK = 1000
+    LOAD_CHUNK = 100
+    # Room kept around the graph in the scene rect, in scene units.
+    SCENE_MARGIN = 5000.0
+    LOAD_SLICE_SECONDS = 0.012
+    OVERVIEW_RESOLUTION = 1024
 
     def __init__(self, graph: Graph, cfg: UiConfig) -> None:
         super().__init__()
@@ -451,10 +1142,70 @@ class GraphScene(QGraphicsScene):
         self._cfg = cfg
         self._node_items: dict[str, NodeItem] = {}
         self._edge_items: dict[str, EdgeItem] = {}
-        self._undo_stack: list[DeleteSnapshot] = []
+        self._visibility = VisibilityIndex(graph)
+        self._parallel_edges = ParallelEdgeIndex()
+        self._history = UndoHistory()
+        self._drag_origin: dict[str, tuple[float, float]] = {}
         self._connect_mode = False
         self._connect_source: Optional[NodeId] = None
-        self.setSceneRect(-1000000, -1000000, 2000000, 2000000)
+        self._suspend_move_updates = False
+        # Nodes moved since the last frame; their edges are re-routed once
+        # per frame rather than once per itemChange.
+        self._moved_nodes: set[str] = set()
+        self._move_flush_timer = QTimer(self)
+        self._move_flush_timer.setSingleShot(True)
+        self._move_flush_timer.setInterval(0)
+        self._move_flush_timer.timeout.connect(self._flush_moved_nodes)
+        # Progressive loading: node ids nearest the initial view come first.
+        self._load_queue: list[str] = []
+        self._load_pos = 0
+        self._load_timer = QTimer(self)
+        self._load_timer.setInterval(0)
+        self._load_timer.timeout.connect(self._continue_loading)
+        self._position_animation: Optional[QTimeLine] = None
+        self._bundle_items: list[EdgeBundleItem] = []
+        self._bundled_edges: list[EdgeItem] = []
+        # Virtualised mode: items exist only near the viewport and are
+        # recycled through the pools; the grid indexes every node.
+        self._virtual = False
+        self._spatial = SpatialGrid()
+        self._viewport = QRectF()
+        self._viewport_stale = False
+        self._node_pool: list[NodeItem] = []
+        self._edge_pool: list[EdgeItem] = []
+        self._overview: Optional[OverviewItem] = None
+        self._overview_points: Optional[np.ndarray] = None
+        self.setSceneRect(-self.SCENE_MARGIN, -self.SCENE_MARGIN, 2 * self.SCENE_MARGIN, 2 * self.SCENE_MARGIN)
+        self.apply_rendering()
+
+    def _fit_scene_rect(self, xs: Sequence[float], ys: Sequence[float], reset: bool = False) -> None:
+        # The BSP index subdivides the scene rect, so it hugs the graph
+        # instead of the whole canvas (the view keeps its own huge rect for
+        # panning). Items outside it are never indexed, hence never drawn,
+        # so every way of placing a node passes through here.
+        if not len(xs):
+            return
+        x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+        rect = self.sceneRect()
+        if not reset and rect.left() <= x0 and rect.right() >= x1 and rect.top() <= y0 and rect.bottom() >= y1:
+            return
+        pad = max(self.SCENE_MARGIN, (x1 - x0) * 0.5, (y1 - y0) * 0.5)
+        fitted = QRectF(x0 - pad, y0 - pad, x1 - x0 + 2 * pad, y1 - y0 + 2 * pad)
+        self.setSceneRect(fitted if reset else rect.united(fitted))
+
+    def apply_rendering(self) -> None:
+        """Apply the scene index and item cache settings from the config."""
+        cfg = self._cfg
+        if cfg.scene_index == "none":
+            self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        else:
+            self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+            self.setBspTreeDepth(max(0, int(cfg.bsp_depth)))
+        mode = _item_cache_mode(cfg)
+        for item in (*self._node_items.values(), *self._edge_items.values()):
+            item.setCacheMode(mode)
+        self._node_pool.clear()
+        self._edge_pool.clear()
 
     def set_connect_mode(self, enabled: bool) -> None:
         self._connect_mode = enabled
@@ -464,16 +1215,252 @@ class GraphScene(QGraphicsScene):
         self.clear()
         self._node_items.clear()
         self._edge_items.clear()
+        self._bundle_items.clear()
+        self._bundled_edges.clear()
+        self.bundlesInvalidated.emit()
+        self._parallel_edges = ParallelEdgeIndex()
         self._connect_source = None
-
-    def load_graph(self, graph: Graph) -> None:
+        self._moved_nodes.clear()
+        self._virtual = False
+        self._spatial = SpatialGrid()
+        self._node_pool.clear()
+        self._edge_pool.clear()
+        self._overview = None
+        self._overview_points = None
+        self._stop_loading()
+
+    def load_graph(self, graph: Graph, focus: Optional[QRectF] = None) -> None:
+        """Show ``graph``, replacing the current one.
+
+        With a ``focus`` rect and a large enough graph, only the items in
+        that area are created before returning; the rest follow in time
+        slices while the scene stays usable.
+        """
         self._graph = graph
+        self._visibility = VisibilityIndex(graph)
+        self._history.clear()
         self.clear_all()
-        for node in self._graph.iter_nodes():
-            self._add_node_item(node)
-        for edge in self._graph.iter_edges():
-            self._add_edge_item(edge)
-        self.refresh_visibility()
+        self._parallel_edges = ParallelEdgeIndex(graph.iter_edges())
+        nodes = graph.nodes.values()
+        self._fit_scene_rect([n.x for n in nodes] or [0.0], [n.y for n in nodes] or [0.0], reset=True)
+        threshold = self._cfg.virtualize_min_nodes
+        if 0 < threshold <= len(graph.nodes):
+            self._virtual = True
+            self._spatial = SpatialGrid.from_graph(graph)
+            self._sync_viewport()
+        elif focus is not None and 0 < self._cfg.progressive_load_min_nodes <= len(graph.nodes):
+            self._start_loading(focus)
+        else:
+            for node in self._graph.iter_nodes():
+                self._add_node_item(node)
+            for edge in self._graph.iter_edges():
+                self._add_edge_item(edge)
+            update_edge_paths(list(self._edge_items.values()))
+            self.refresh_visibility()
+        self.nodesChanged.emit(None)
+
+    @property
+    def graph(self) -> Graph:
+        return self._graph
+
+    def is_loading(self) -> bool:
+        return bool(self._load_queue)
+
+    def _start_loading(self, focus: QRectF) -> None:
+        ids = list(self._graph.nodes)
+        xy = np.array([(n.x, n.y) for n in self._graph.nodes.values()], dtype=np.float64).reshape(-1, 2)
+        center = focus.center()
+        dist = (xy[:, 0] - center.x()) ** 2 + (xy[:, 1] - center.y()) ** 2
+        in_view = (
+            (xy[:, 0] >= focus.left())
+            & (xy[:, 0] <= focus.right())
+            & (xy[:, 1] >= focus.top())
+            & (xy[:, 1] <= focus.bottom())
+        )
+        # Nodes in view come first (a wide view's corners are further from
+        # the centre than nearby nodes outside it), then the rest outwards.
+        order = np.lexsort((dist, ~in_view))
+        self._load_queue = [ids[i] for i in order.tolist()]
+        self._load_pos = 0
+        # Everything in view appears before the first repaint.
+        for _ in range(0, int(np.count_nonzero(in_view)), self.LOAD_CHUNK):
+            self._load_chunk()
+        self._load_timer.start()
+        self.loadProgress.emit(self._load_pos, len(self._load_queue))
+
+    def _stop_loading(self) -> None:
+        self._load_timer.stop()
+        self._load_queue = []
+        self._load_pos = 0
+
+    def _continue_loading(self) -> None:
+        deadline = time.perf_counter() + self.LOAD_SLICE_SECONDS
+        while self._load_pos < len(self._load_queue) and time.perf_counter() < deadline:
+            self._load_chunk()
+        total = len(self._load_queue)
+        done = self._load_pos
+        if done >= total:
+            self._stop_loading()
+        self.loadProgress.emit(done, total)
+
+    def _load_chunk(self) -> None:
+        # Nodes deleted meanwhile are skipped; ones re-added by undo or
+        # created by an edit already have items.
+        end = min(self._load_pos + self.LOAD_CHUNK, len(self._load_queue))
+        chunk = self._load_queue[self._load_pos : end]
+        self._load_pos = end
+        graph_nodes = self._graph.nodes
+        graph_edges = self._graph.edges
+        visible = self._visibility.visible
+        new_ids = [nid for nid in chunk if nid in graph_nodes and nid not in self._node_items]
+        if not new_ids:
+            return
+        for node_id in new_ids:
+            self._add_node_item(graph_nodes[node_id]).setVisible(node_id in visible)
+        shown: list[EdgeItem] = []
+        for edge_id in self._visibility.incident_edges(new_ids):
+            edge = graph_edges.get(edge_id)
+            if edge is None or edge_id in self._edge_items:
+                continue
+            item = self._add_edge_item(edge)
+            if item is None:
+                continue
+            is_visible = edge.source.value in visible and (edge.target.value in visible or edge.collapsed)
+            item.setVisible(is_visible)
+            if is_visible:
+                shown.append(item)
+        update_edge_paths(shown)
+        self._invalidate_bundles()
+
+    @property
+    def virtualized(self) -> bool:
+        return self._virtual
+
+    def has_hidden_nodes(self) -> bool:
+        return len(self._visibility.visible) < len(self._graph.nodes)
+
+    def set_viewport(self, rect: QRectF) -> None:
+        """Record the visible scene area; in virtualised mode, materialise items for it."""
+        self._viewport = QRectF(rect)
+        self._sync_viewport()
+
+    def _sync_viewport(self) -> None:
+        if not self._virtual or self._viewport.isEmpty():
+            return
+        if self.mouseGrabberItem() is not None:
+            # Never recycle items in the middle of a drag.
+            self._viewport_stale = True
+            return
+        self._viewport_stale = False
+        view = self._viewport
+        margin = max(view.width(), view.height()) * 0.5
+        area = view.adjusted(-margin, -margin, margin, margin)
+        ids = self._spatial.query(
+            area.left(), area.top(), area.right(), area.bottom(), limit=self._cfg.virtual_max_items
+        )
+        if ids is None:
+            self._release_items(list(self._node_items), list(self._edge_items))
+            self._show_overview(view, area)
+            return
+        if self._overview is not None:
+            self.removeItem(self._overview)
+            self._overview = None
+
+        visible = self._visibility.visible
+        graph_edges = self._graph.edges
+        node_ids = {nid for nid in ids if nid in visible}
+        edge_ids: set[str] = set()
+        for edge_id in self._visibility.incident_edges(node_ids):
+            edge = graph_edges.get(edge_id)
+            if edge is not None and edge.source.value in visible and (edge.target.value in visible or edge.collapsed):
+                edge_ids.add(edge_id)
+        # Edges leaving the area need both endpoint items (a collapsed
+        # edge's hidden target included).
+        for edge_id in edge_ids:
+            edge = graph_edges[edge_id]
+            node_ids.add(edge.source.value)
+            node_ids.add(edge.target.value)
+
+        self._release_items(
+            [nid for nid in self._node_items if nid not in node_ids],
+            [eid for eid in self._edge_items if eid not in edge_ids],
+        )
+        new_nodes = [self._graph.nodes[nid] for nid in node_ids if nid not in self._node_items]
+        new_edges = [graph_edges[eid] for eid in edge_ids if eid not in self._edge_items]
+        if not new_nodes and not new_edges:
+            return
+        with self._bulk_item_changes(len(new_nodes) + len(new_edges)):
+            for node in new_nodes:
+                self._add_node_item(node).setVisible(node.id.value in visible)
+            edge_items = [self._add_edge_item(edge) for edge in new_edges]
+        update_edge_paths([item for item in edge_items if item is not None])
+        self._invalidate_bundles()
+
+    def _release_items(self, node_ids: list[str], edge_ids: list[str]) -> None:
+        # Detach items and keep a bounded number for reuse.
+        if not node_ids and not edge_ids:
+            return
+        limit = self._cfg.virtual_max_items
+        with self._bulk_item_changes(len(node_ids) + len(edge_ids)):
+            for edge_id in edge_ids:
+                item = self._edge_items.pop(edge_id)
+                self.removeItem(item)
+                if len(self._edge_pool) < limit:
+                    self._edge_pool.append(item)
+            for node_id in node_ids:
+                item = self._node_items.pop(node_id)
+                self.removeItem(item)
+                if len(self._node_pool) < limit:
+                    self._node_pool.append(item)
+        self._invalidate_bundles()
+
+    def _show_overview(self, view: QRectF, area: QRectF) -> None:
+        overview = self._overview
+        if overview is not None and self._overview_points is not None:
+            shown = overview.image_rect()
+            # Still covering the view at a similar zoom: keep the image.
+            if shown.contains(view) and shown.width() <= view.width() * 3:
+                return
+        if self._overview_points is None:
+            visible = self._visibility.visible
+            self._overview_points = np.array(
+                [(n.x, n.y) for nid, n in self._graph.nodes.items() if nid in visible], dtype=np.float64
+            ).reshape(-1, 2)
+        points = self._overview_points
+        side = self.OVERVIEW_RESOLUTION
+        if area.width() >= area.height():
+            width, height = side, max(1, int(side * area.height() / area.width()))
+        else:
+            width, height = max(1, int(side * area.width() / area.height())), side
+        counts, _, _ = np.histogram2d(
+            points[:, 1],
+            points[:, 0],
+            bins=(height, width),
+            range=((area.top(), area.bottom()), (area.left(), area.right())),
+        )
+        density = np.log1p(counts)
+        peak = float(density.max())
+        alpha = (density * (255.0 / peak) if peak > 0 else density).astype(np.uint32)
+        pixels = np.ascontiguousarray((alpha << 24) | 0x3C3C3C, dtype=np.uint32)
+        image = QImage(pixels.tobytes(), width, height, width * 4, QImage.Format_ARGB32).copy()
+        if overview is None:
+            overview = OverviewItem()
+            self.addItem(overview)
+            self._overview = overview
+        self._fit_scene_rect((area.left(), area.right()), (area.top(), area.bottom()))
+        overview.set_image(image, area)
+
+    def _invalidate_overview(self) -> None:
+        self._overview_points = None
+
+    def _node_tooltip(self, node_id: NodeId) -> str:
+        node = self._graph.nodes.get(node_id.value)
+        if node is None:
+            return ""
+        # Cached by content, so edited nodes get a fresh tooltip on next hover.
+        return node_tooltip_html(
+            node.text.strip(), (node.memory_block or "").strip(), (node.story_txt_path or "").strip()
+        )
 
     def _open_node_menu(self, node_id: NodeId, event) -> None:
         node = self._graph.get_node(node_id)
@@ -486,6 +1473,7 @@ class GraphScene(QGraphicsScene):
         clear_color_action = menu.addAction("Clear Color")
         note_action = menu.addAction("Set Note")
         clear_note_action = menu.addAction("Clear Note")
+        pin_action = menu.addAction("Unpin Position" if node.pinned else "Pin Position")
         menu.addSeparator()
         memory_action = menu.addAction("Set Memory Block")
         clear_memory_action = menu.addAction("Clear Memory Block")
@@ -518,11 +1506,7 @@ class GraphScene(QGraphicsScene):
             except ValueError:
                 QMessageBox.warning(view or parent, "Invalid Date", "Date must be YYYY-MM-DD")
                 return
-            node.event_date = new_date
-            node.text = new_text
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
+            self._edit_node(node_id.value, "Edit Node", event_date=new_date, text=new_text)
             return
 
         if chosen == color_action:
@@ -530,66 +1514,47 @@ class GraphScene(QGraphicsScene):
             color = QColorDialog.getColor(initial, parent, "Select Node Color")
             if not color.isValid():
                 return
-            node.color = color.name()
+            self._edit_node(node_id.value, "Set Color", color=color.name())
             if node.color not in self._graph.legend:
                 self._graph.legend[node.color] = ""
                 self.legendChanged.emit()
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
             return
 
         if chosen == clear_color_action:
-            node.color = None
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
+            self._edit_node(node_id.value, "Clear Color", color=None)
             return
 
         if chosen == note_action:
             text, ok = QInputDialog.getText(parent, "Node Note", "Note", text=node.note)
             if not ok:
                 return
-            node.note = text.strip()
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
-            self.refresh_visibility()
+            self._edit_node(node_id.value, "Set Note", note=text.strip())
             return
 
         if chosen == clear_note_action:
-            node.note = ""
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
-            self.refresh_visibility()
+            self._edit_node(node_id.value, "Clear Note", note="")
+            return
+
+        if chosen == pin_action:
+            self._edit_node(node_id.value, "Pin Position", pinned=not node.pinned)
             return
 
         if chosen == memory_action:
             text, ok = QInputDialog.getMultiLineText(parent, "Node Memory Block", "Memory", text=node.memory_block)
             if not ok:
                 return
-            node.memory_block = text.rstrip()
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
+            self._edit_node(node_id.value, "Set Memory Block", memory_block=text.rstrip())
             return
 
         if chosen == clear_memory_action:
-            node.memory_block = ""
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
+            self._edit_node(node_id.value, "Clear Memory Block", memory_block="")
             return
 
         if chosen == link_story_action:
             path, _ = QFileDialog.getOpenFileName(parent, "Link Story TXT", "", "Text Files (*.txt);;All Files (*)")
             if not path:
                 return
-            node.story_txt_path = path
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
+            self._edit_node(node_id.value, "Link Story TXT", story_txt_path=path)
             return
 
         if chosen == open_story_action:
@@ -606,10 +1571,7 @@ class GraphScene(QGraphicsScene):
             return
 
         if chosen == clear_story_action:
-            node.story_txt_path = None
-            item = self._node_items.get(node_id.value)
-            if item is not None:
-                item.update_from_node(node)
+            self._edit_node(node_id.value, "Clear Story TXT", story_txt_path=None)
             return
 
         if chosen == export_action:
@@ -651,62 +1613,198 @@ class GraphScene(QGraphicsScene):
         self._delete_by_ids(node_ids, edge_ids)
 
     def _delete_by_ids(self, node_ids: set[str], edge_ids: set[str]) -> None:
-        snapshot = delete_nodes_and_edges(self._graph, node_ids, edge_ids)
+        snapshot = delete_nodes_and_edges(self._graph, node_ids, edge_ids, self._visibility.incident_edges)
         if not snapshot.nodes and not snapshot.edges:
             return
-
-        for edge in snapshot.edges:
-            edge_item = self._edge_items.pop(edge.id.value, None)
-            if edge_item is not None:
-                self.removeItem(edge_item)
-
-        for node in snapshot.nodes:
-            node_item = self._node_items.pop(node.id.value, None)
-            if node_item is not None:
-                self.removeItem(node_item)
-            if self._connect_source is not None and self._connect_source.value == node.id.value:
-                self._connect_source = None
-
-        self._undo_stack.append(snapshot)
-        self.refresh_visibility()
+        if self._connect_source is not None and self._connect_source.value not in self._graph.nodes:
+            self._connect_source = None
+        self.remove_items(snapshot.nodes, snapshot.edges)
+        self._history.push(Command("Delete", (RemoveItems.from_snapshot(snapshot),)))
         self.update()
 
-    def _undo_delete(self) -> None:
-        if not self._undo_stack:
+    @contextmanager
+    def _bulk_item_changes(self, count: int) -> Iterator[None]:
+        # Large batches skip per-item BSP updates and rebuild the index once.
+        reindex = count > 1000 and self.itemIndexMethod() == QGraphicsScene.BspTreeIndex
+        if reindex:
+            self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        try:
+            yield
+        finally:
+            if reindex:
+                self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+
+    def add_items(self, nodes: Iterable[Node], edges: Iterable[Edge]) -> None:
+        """Create items for nodes and edges already inserted into the graph."""
+        nodes = [n for n in nodes if n.id.value in self._graph.nodes and n.id.value not in self._visibility]
+        edges = [e for e in edges if e.id.value in self._graph.edges and e.id.value not in self._parallel_edges]
+        if not nodes and not edges:
             return
-        snapshot = self._undo_stack.pop()
-        undo_delete(self._graph, snapshot)
-
-        for node in snapshot.nodes:
-            if node.id.value not in self._node_items:
-                self._add_node_item(node)
+        rerouted: dict[str, int] = {}
+        for edge in edges:
+            rerouted.update(self._parallel_edges.add(edge))
+        delta = self._visibility.add_items(nodes, edges)
+        edge_ids = {e.id.value for e in edges}
+        self._fit_scene_rect([n.x for n in nodes], [n.y for n in nodes])
+        if self._virtual:
+            self._spatial.update((n.id.value, n.x, n.y) for n in nodes)
+        else:
+            with self._bulk_item_changes(len(nodes) + len(edges)):
+                for node in nodes:
+                    self._add_node_item(node)
+                edge_items = [self._add_edge_item(edge) for edge in edges]
+            update_edge_paths([item for item in edge_items if item is not None])
+        self._reroute_parallel_edges({eid: index for eid, index in rerouted.items() if eid not in edge_ids})
+        self._apply_visibility_delta(delta, edge_ids)
+        if nodes:
+            self.nodesChanged.emit([n.id.value for n in nodes])
+
+    def remove_items(self, nodes: Iterable[Node], edges: Iterable[Edge]) -> None:
+        """Drop items for nodes and edges already removed from the graph.
+
+        Only parallel siblings of the removed edges are re-routed and only the
+        neighbourhood whose visibility changed is updated.
+        """
+        nodes = [n for n in nodes if n.id.value in self._visibility]
+        edges = [e for e in edges if e.id.value in self._parallel_edges]
+        if not nodes and not edges:
+            return
+        rerouted: dict[str, int] = {}
+        with self._bulk_item_changes(len(nodes) + len(edges)):
+            for edge in edges:
+                rerouted.update(self._parallel_edges.remove(edge.id.value))
+                edge_item = self._edge_items.pop(edge.id.value, None)
+                if edge_item is not None:
+                    self.removeItem(edge_item)
+            for node in nodes:
+                node_item = self._node_items.pop(node.id.value, None)
+                if node_item is not None:
+                    self.removeItem(node_item)
+                self._spatial.remove(node.id.value)
+        self._reroute_parallel_edges(rerouted)
+        self._apply_visibility_delta(self._visibility.remove_items(nodes, edges), set())
+        if nodes:
+            self.nodesChanged.emit([n.id.value for n in nodes])
+
+    def push_command(self, command: Command) -> None:
+        self._history.push(command)
+
+    def undo(self) -> None:
+        self.stop_position_animation()
+        command = self._history.undo(self._graph)
+        if command is not None:
+            self._sync_after_history(command)
+
+    def redo(self) -> None:
+        self.stop_position_animation()
+        command = self._history.redo(self._graph)
+        if command is not None:
+            self._sync_after_history(command)
+
+    def _sync_after_history(self, command: Command) -> None:
+        moved: set[str] = set()
+        for change in command.changes:
+            if isinstance(change, (AddItems, RemoveItems)):
+                self._sync_items(change.nodes, change.edges)
+            elif isinstance(change, MoveNodes):
+                moved.update(change.node_ids)
+            elif isinstance(change, NodeFieldsChange):
+                self._sync_node_change(change)
+                if "x" in change.after or "y" in change.after:
+                    moved.add(change.node_id)
+            elif isinstance(change, EdgeFieldsChange):
+                self._sync_edge_change(change)
+        if moved:
+            nodes = self._graph.nodes
+            self.apply_positions([(nid, nodes[nid].x, nodes[nid].y) for nid in moved if nid in nodes])
+        self.update()
 
-        for edge in snapshot.edges:
-            if edge.id.value not in self._edge_items:
-                self._add_edge_item(edge)
+    def _sync_items(self, nodes: tuple[Node, ...], edges: tuple[Edge, ...]) -> None:
+        # Bring items for exactly these nodes and edges in line with the graph.
+        graph = self._graph
+        self.remove_items(
+            [n for n in nodes if n.id.value not in graph.nodes],
+            [e for e in edges if e.id.value not in graph.edges],
+        )
+        self.add_items(
+            [n for n in nodes if n.id.value in graph.nodes],
+            [e for e in edges if e.id.value in graph.edges],
+        )
 
-        for edge_item in self._edge_items.values():
-            edge_item.update_path()
-        self.refresh_visibility()
-        self.update()
+    def _edit_node(self, node_id: str, label: str, **values) -> None:
+        change = set_node_fields(self._graph, node_id, **values)
+        if change is None:
+            return
+        self._history.push(Command(label, (change,)))
+        self._sync_node_change(change)
+
+    def _sync_node_change(self, change: NodeFieldsChange) -> None:
+        node = self._graph.nodes.get(change.node_id)
+        if node is not None and "pinned" in change.after:
+            self.pinChanged.emit(change.node_id, node.pinned)
+        item = self._node_items.get(change.node_id)
+        if node is None or item is None:
+            return
+        item.update_from_node(node)
+        if "note" in change.after:
+            # Collapsed edges show their target's note.
+            for edge_id in self._visibility.incident_edges([change.node_id]):
+                edge = self._graph.edges.get(edge_id)
+                edge_item = self._edge_items.get(edge_id)
+                if edge is not None and edge_item is not None and edge.target.value == change.node_id:
+                    edge_item.sync_from_edge(edge, self._edge_collapsed_label(edge))
+
+    def _sync_edge_change(self, change: EdgeFieldsChange) -> None:
+        edge = self._graph.edges.get(change.edge_id)
+        if edge is None:
+            return
+        item = self._edge_items.get(change.edge_id)
+        if item is not None:
+            item.sync_from_edge(edge, self._edge_collapsed_label(edge))
+        self._apply_visibility_delta(self._visibility.sync_edge(change.edge_id), {change.edge_id})
 
-    def _add_node_item(self, node: Node) -> None:
-        item = NodeItem(node=node, cfg=self._cfg)
-        item.setPos(node.x, node.y)
+    def _add_node_item(self, node: Node) -> NodeItem:
+        if self._node_pool:
+            item = self._node_pool.pop()
+            item.bind(node)
+        else:
+            item = NodeItem(node=node, cfg=self._cfg)
+            item.setPos(node.x, node.y)
         self.addItem(item)
         self._node_items[node.id.value] = item
+        return item
 
-    def _add_edge_item(self, edge: Edge) -> None:
+    def add_edges(self, edges: list[Edge]) -> None:
+        self.add_items((), edges)
+
+    def _add_edge_item(self, edge: Edge) -> Optional[EdgeItem]:
+        # The new item's path is left to the caller so batches share one
+        # update_edge_paths() pass.
         source_item = self._node_items.get(edge.source.value)
         target_item = self._node_items.get(edge.target.value)
         if source_item is None or target_item is None:
-            return
-        curve_map = compute_parallel_edge_indices(self._graph.iter_edges())
-        curve_index = curve_map.get(edge.id.value, 0)
-        item = EdgeItem(edge=edge, source_item=source_item, target_item=target_item, cfg=self._cfg)
-        item.sync_from_edge(edge, self._edge_collapsed_label(edge), curve_index)
+            return None
+        if self._edge_pool:
+            item = self._edge_pool.pop()
+            item.bind(edge, source_item, target_item)
+        else:
+            item = EdgeItem(edge=edge, source_item=source_item, target_item=target_item, cfg=self._cfg)
+        item.sync_from_edge(
+            edge, self._edge_collapsed_label(edge), self._parallel_edges.curve_index(edge.id.value), update_path=False
+        )
         self.addItem(item)
         self._edge_items[edge.id.value] = item
+        return item
+
+    def _reroute_parallel_edges(self, curve_indices: dict[str, int]) -> None:
+        items: list[EdgeItem] = []
+        for edge_id, curve_index in curve_indices.items():
+            item = self._edge_items.get(edge_id)
+            edge = self._graph.edges.get(edge_id)
+            if item is not None and edge is not None:
+                item.sync_from_edge(edge, self._edge_collapsed_label(edge), curve_index, update_path=False)
+                items.append(item)
+        update_edge_paths(items)
 
     def _edge_collapsed_label(self, edge: Edge) -> str:
         target = self._graph.nodes.get(edge.target.value)
@@ -723,11 +1821,11 @@ class GraphScene(QGraphicsScene):
         edge = self._graph.edges.get(edge_id.value)
         if edge is None:
             return
-        edge.collapsed = not edge.collapsed
-        item = self._edge_items.get(edge_id.value)
-        if item is not None:
-            item.sync_from_edge(edge, self._edge_collapsed_label(edge))
-        self.refresh_visibility()
+        change = set_edge_fields(self._graph, edge_id.value, collapsed=not edge.collapsed)
+        if change is None:
+            return
+        self._history.push(Command("Collapse Edge" if edge.collapsed else "Expand Edge", (change,)))
+        self._sync_edge_change(change)
 
     def contextMenuEvent(self, event) -> None:
         super().contextMenuEvent(event)
@@ -748,18 +1846,91 @@ class GraphScene(QGraphicsScene):
                 y=pos.y()
             )
             self._graph.add_node(node)
-            self._add_node_item(node)
-            self.refresh_visibility()
+            self._graph.include_position(node.x, node.y)
+            self.add_items((node,), ())
+            self._history.push(Command("New Node", (AddItems(nodes=(node,)),)))
+
+    def apply_positions(self, positions: list[tuple[str, float, float]]) -> None:
+        if not positions:
+            return
+        self._invalidate_bundles()
+        self._fit_scene_rect([p[1] for p in positions], [p[2] for p in positions])
+        self._suspend_move_updates = True
+        try:
+            with self._bulk_item_changes(len(positions)):
+                for nid, x, y in positions:
+                    node = self._graph.nodes.get(nid)
+                    if node is None:
+                        continue
+                    node.x = x
+                    node.y = y
+                    item = self._node_items.get(nid)
+                    if item is not None:
+                        item.setPos(x, y)
+        finally:
+            self._suspend_move_updates = False
+        if len(positions) * 4 < len(self._node_items):
+            edge_ids = self._visibility.incident_edges(p[0] for p in positions)
+            update_edge_paths([self._edge_items[eid] for eid in edge_ids if eid in self._edge_items])
+        else:
+            update_edge_paths(list(self._edge_items.values()))
+        if self._virtual:
+            self._spatial.update((nid, x, y) for nid, x, y in positions if nid in self._graph.nodes)
+            self._invalidate_overview()
+            self._sync_viewport()
+        whole = len(positions) * 2 >= len(self._graph.nodes)
+        self.nodesChanged.emit(None if whole else [p[0] for p in positions])
+
+    def animate_positions(self, positions: list[tuple[str, float, float]], duration_ms: int = 300) -> None:
+        self.stop_position_animation()
+        starts: list[tuple[str, float, float, float, float]] = []
+        for nid, x, y in positions:
+            node = self._graph.nodes.get(nid)
+            if node is not None:
+                starts.append((nid, node.x, node.y, x, y))
+        if not starts:
+            return
+
+        def step(t: float) -> None:
+            self.apply_positions([(nid, x0 + (x1 - x0) * t, y0 + (y1 - y0) * t) for nid, x0, y0, x1, y1 in starts])
+
+        animation = QTimeLine(duration_ms, self)
+        animation.setEasingCurve(QEasingCurve.InOutCubic)
+        animation.valueChanged.connect(step)
+        animation.finished.connect(lambda: self.apply_positions(positions))
+        self._position_animation = animation
+        animation.start()
+
+    def stop_position_animation(self) -> None:
+        animation = self._position_animation
+        self._position_animation = None
+        if animation is not None:
+            animation.stop()
+            animation.deleteLater()
 
     def _on_node_moved(self, node_id: NodeId, pos: QPointF) -> None:
+        if self._suspend_move_updates:
+            return
         node = self._graph.get_node(node_id)
         node.x = float(pos.x())
         node.y = float(pos.y())
-        for edge in self._graph.iter_edges():
-            if edge.source == node_id or edge.target == node_id:
-                item = self._edge_items.get(edge.id.value)
-                if item is not None:
-                    item.update_path()
+        self._graph.include_position(node.x, node.y)
+        self._fit_scene_rect((node.x,), (node.y,))
+        if self._virtual:
+            self._spatial.move(node_id.value, node.x, node.y)
+        self._moved_nodes.add(node_id.value)
+        if not self._move_flush_timer.isActive():
+            self._move_flush_timer.start()
+
+    def _flush_moved_nodes(self) -> None:
+        self._move_flush_timer.stop()
+        if not self._moved_nodes:
+            return
+        moved, self._moved_nodes = self._moved_nodes, set()
+        self._invalidate_bundles()
+        edge_ids = self._visibility.incident_edges(moved)
+        update_edge_paths([self._edge_items[eid] for eid in edge_ids if eid in self._edge_items])
+        self.nodesChanged.emit(moved)
 
     def mousePressEvent(self, event) -> None:
         item = self.itemAt(event.scenePos(), self.views()[0].transform()) if self.views() else None
@@ -770,18 +1941,124 @@ class GraphScene(QGraphicsScene):
                 if self._connect_source != item.node_id:
                     edge = Edge(id=EdgeId.new(), source=self._connect_source, target=item.node_id)
                     self._graph.add_edge(edge)
-                    self._add_edge_item(edge)
-                    self.refresh_visibility()
+                    self.add_items((), (edge,))
+                    self._history.push(Command("Connect", (AddItems(edges=(edge,)),)))
                 self._connect_source = None
             event.accept()
             return
         super().mousePressEvent(event)
+        if isinstance(self.mouseGrabberItem(), NodeItem):
+            self._drag_origin = {
+                item.node_id.value: (item.pos().x(), item.pos().y())
+                for item in self.selectedItems()
+                if isinstance(item, NodeItem)
+            }
+
+    def mouseReleaseEvent(self, event) -> None:
+        super().mouseReleaseEvent(event)
+        self._flush_moved_nodes()
+        if self._viewport_stale:
+            self._sync_viewport()
+        origin, self._drag_origin = self._drag_origin, {}
+        if not origin:
+            return
+        nodes = self._graph.nodes
+        moved = [nid for nid, start in origin.items() if nid in nodes and (nodes[nid].x, nodes[nid].y) != start]
+        if not moved:
+            return
+        change = MoveNodes(
+            node_ids=tuple(moved),
+            before=tuple(origin[nid] for nid in moved),
+            after=tuple((nodes[nid].x, nodes[nid].y) for nid in moved),
+        )
+        # Quick successive drags of the same nodes become one undo step.
+        self._history.push(Command("Move", (change,), merge_key=("move", change.node_ids)))
+
+    def bundle_inputs(self) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """Ids and endpoint positions of the drawn edges that bundling reroutes.
+
+        Collapsed edges and self-loops keep their own curves.
+        """
+        edge_ids: list[str] = []
+        ends: list[tuple[float, float, float, float]] = []
+        for edge_id, item in self._edge_items.items():
+            if not item.isVisible() or item._collapsed or item._source_item is item._target_item:
+                continue
+            edge_ids.append(edge_id)
+            ends.append((item._source_item.x(), item._source_item.y(), item._target_item.x(), item._target_item.y()))
+        coords = np.array(ends, dtype=np.float64).reshape(-1, 4)
+        return edge_ids, coords[:, :2], coords[:, 2:]
+
+    def set_edge_bundles(self, edge_ids: list[str], polylines: np.ndarray) -> None:
+        """Draw ``edge_ids`` along ``polylines`` through a few shared items."""
+        self.clear_edge_bundles()
+        for chunk in spatial_chunks(polylines, self.BUNDLE_CHUNK):
+            item = EdgeBundleItem(polylines[chunk], self._cfg)
+            self.addItem(item)
+            self._bundle_items.append(item)
+        for edge_id in edge_ids:
+            edge_item = self._edge_items.get(edge_id)
+            if edge_item is not None:
+                edge_item.set_bundled(True)
+                self._bundled_edges.append(edge_item)
+
+    def clear_edge_bundles(self) -> None:
+        for item in self._bundle_items:
+            self.removeItem(item)
+        self._bundle_items.clear()
+        for edge_item in self._bundled_edges:
+            edge_item.set_bundled(False)
+        self._bundled_edges.clear()
+
+    def has_edge_bundles(self) -> bool:
+        return bool(self._bundle_items)
+
+    def _invalidate_bundles(self) -> None:
+        if self._bundle_items:
+            self.clear_edge_bundles()
+        self.bundlesInvalidated.emit()
+
+    @_timed("visibility")
+    def _apply_visibility_delta(self, delta: VisibilityDelta, edge_ids: set[str]) -> None:
+        self._invalidate_bundles()
+        for node_id in delta.shown:
+            item = self._node_items.get(node_id)
+            if item is not None:
+                item.setVisible(True)
+        for node_id in delta.hidden:
+            item = self._node_items.get(node_id)
+            if item is not None:
+                item.setVisible(False)
 
+        visible_nodes = self._visibility.visible
+        shown: list[EdgeItem] = []
+        for edge_id in edge_ids | self._visibility.incident_edges(delta.shown | delta.hidden):
+            item = self._edge_items.get(edge_id)
+            edge = self._graph.edges.get(edge_id)
+            if item is None or edge is None:
+                continue
+            is_visible = item.source_id.value in visible_nodes and (
+                item.target_id.value in visible_nodes or edge.collapsed
+            )
+            item.setVisible(is_visible)
+            if is_visible:
+                item.sync_from_edge(edge, self._edge_collapsed_label(edge), update_path=False)
+                shown.append(item)
+        update_edge_paths(shown)
+        if self._virtual:
+            self._invalidate_overview()
+            self._sync_viewport()
+
+    @_timed("visibility")
     def refresh_visibility(self) -> None:
-        curve_map = compute_parallel_edge_indices(self._graph.iter_edges())
-        visible_nodes = compute_visible_nodes(self._graph)
+        self._invalidate_bundles()
+        self._visibility.rebuild()
+        visible_nodes = self._visibility.visible
         for node_id, item in self._node_items.items():
-            item.setVisible(node_id in visible_nodes)
+            is_visible = node_id in visible_nodes
+            if item.isVisible() != is_visible:
+                item.setVisible(is_visible)
+        shown: list[EdgeItem] = []
         for edge_id, item in self._edge_items.items():
             edge = self._graph.edges.get(edge_id)
             if edge is None:
@@ -790,24 +2067,156 @@ class GraphScene(QGraphicsScene):
             source_visible = item.source_id.value in visible_nodes
             target_visible = item.target_id.value in visible_nodes
             is_visible = source_visible and (target_visible or edge.collapsed)
-            item.setVisible(is_visible)
-            if is_visible:
-                item.sync_from_edge(edge, self._edge_collapsed_label(edge), curve_map.get(edge_id, 0))
+            if item.isVisible() != is_visible:
+                item.setVisible(is_visible)
+                if is_visible:
+                    item.sync_from_edge(edge, self._edge_collapsed_label(edge), update_path=False)
+                    shown.append(item)
+        update_edge_paths(shown)
+        if self._virtual:
+            self._invalidate_overview()
+            self._sync_viewport()
 
     def refresh(self) -> None:
         for item in self._node_items.values():
             node = self._graph.get_node(item.node_id)
             item.update_from_node(node)
+        synced: list[EdgeItem] = []
+        for edge_id, item in self._edge_items.items():
+            edge = self._graph.edges.get(edge_id)
+            if edge is not None:
+                item.sync_from_edge(edge, self._edge_collapsed_label(edge), update_path=False)
+                synced.append(item)
+        update_edge_paths(synced)
         self.refresh_visibility()
 
 
 
 
 class GraphView(QGraphicsView):
+    visibleRectChanged = Signal(QRectF)
+
     def __init__(self, scene: GraphScene) -> None:
         super().__init__(scene)
         self.setRenderHint(QPainter.Antialiasing, True)
         self.setDragMode(QGraphicsView.RubberBandDrag)
+        # Pan freely; the scene's own rect only bounds its index.
+        self.setSceneRect(-1000000, -1000000, 2000000, 2000000)
+        self._opengl = False
+        self._stats: Optional[FrameStats] = None
+        self._hud_text = ""
+        self._hud_timer = QTimer(self)
+        self._hud_timer.setInterval(500)
+        self._hud_timer.timeout.connect(self._refresh_hud)
+        self._reported_rect = QRectF()
+        self._viewport_timer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(0)
+        self._viewport_timer.timeout.connect(self._report_viewport)
+
+    def apply_rendering(self, cfg: UiConfig) -> bool:
+        """Apply the view-level rendering settings.
+
+        Returns False when an OpenGL viewport was requested but no OpenGL
+        context can be created; the view then keeps drawing with the raster
+        engine.
+        """
+        self.setViewportUpdateMode(VIEWPORT_UPDATE_MODES.get(cfg.viewport_update, QGraphicsView.MinimalViewportUpdate))
+        self.setRenderHint(QPainter.Antialiasing, cfg.antialiasing != "never")
+        self.setRenderHint(QPainter.TextAntialiasing, cfg.antialiasing != "never")
+        want_opengl = cfg.opengl != "off"
+        usable = not want_opengl or opengl_available()
+        if want_opengl and usable:
+            viewport = QOpenGLWidget()
+            surface = QSurfaceFormat.defaultFormat()
+            surface.setSamples(4 if cfg.antialiasing != "never" else 0)
+            viewport.setFormat(surface)
+            self.setViewport(viewport)
+            self._opengl = True
+        elif self._opengl:
+            self.setViewport(QWidget())
+            self._opengl = False
+        return usable
+
+    def visible_scene_rect(self) -> QRectF:
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    def paintEvent(self, event) -> None:
+        # Pans, zooms and resizes all repaint; report the new visible area
+        # to the scene after this frame.
+        if self.visible_scene_rect() != self._reported_rect and not self._viewport_timer.isActive():
+            self._viewport_timer.start()
+        stats = self._stats
+        if stats is None:
+            super().paintEvent(event)
+            return
+        stats.painted = 0
+        start = time.perf_counter()
+        super().paintEvent(event)
+        elapsed = time.perf_counter() - start
+        # Repaints of the HUD alone are not frames of the canvas.
+        if not self._hud_rect().toAlignedRect().contains(event.rect()):
+            stats.add_frame(elapsed, stats.painted)
+        self._draw_hud()
+
+    def hud_enabled(self) -> bool:
+        return self._stats is not None
+
+    def set_hud_enabled(self, enabled: bool) -> None:
+        """Show or hide the frame-time overlay; hidden, it records nothing."""
+        if enabled == self.hud_enabled():
+            return
+        if enabled:
+            self._stats = FrameStats()
+            self._hud_timer.start()
+            self._refresh_hud()
+        else:
+            self._hud_timer.stop()
+            self._stats = None
+            self._hud_text = ""
+        _set_frame_stats(self._stats)
+        self.viewport().update()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        super().scrollContentsBy(dx, dy)
+        if self._stats is not None:
+            # Scrolling moves the pixels of the overlay along with the scene.
+            rect = self._hud_rect().toAlignedRect()
+            self.viewport().update(rect)
+            self.viewport().update(rect.translated(dx, dy))
+
+    def _hud_rect(self) -> QRectF:
+        return QRectF(8, 8, 250, 96)
+
+    def _refresh_hud(self) -> None:
+        if self._stats is None:
+            return
+        summary = self._stats.summary()
+        self._hud_text = "\n".join(
+            (
+                f"{summary.fps:.1f} fps",
+                f"paint {summary.paint_ms:.1f} ms (max {summary.paint_max_ms:.1f})",
+                f"items painted {summary.items:.0f}",
+                f"visibility {summary.timings.get('visibility', 0.0):.1f} ms/s",
+                f"edge updates {summary.timings.get('edges', 0.0):.1f} ms/s",
+            )
+        )
+        self.viewport().update(self._hud_rect().toAlignedRect())
+
+    def _draw_hud(self) -> None:
+        painter = QPainter(self.viewport())
+        rect = self._hud_rect()
+        painter.fillRect(rect, QColor(0, 0, 0, 160))
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(rect.adjusted(8, 6, -8, -6), Qt.AlignLeft | Qt.AlignTop, self._hud_text)
+        painter.end()
+
+    def _report_viewport(self) -> None:
+        self._reported_rect = self.visible_scene_rect()
+        scene = self.scene()
+        if isinstance(scene, GraphScene):
+            scene.set_viewport(self._reported_rect)
+        self.visibleRectChanged.emit(self._reported_rect)
 
     def wheelEvent(self, event) -> None:
         if event.modifiers() & Qt.ControlModifier:
@@ -853,7 +2262,14 @@ class GraphView(QGraphicsView):
         if event.matches(QKeySequence.Undo):
             scene = self.scene()
             if isinstance(scene, GraphScene):
-                scene._undo_delete()
+                scene.undo()
+            event.accept()
+            return
+
+        if event.matches(QKeySequence.Redo):
+            scene = self.scene()
+            if isinstance(scene, GraphScene):
+                scene.redo()
             event.accept()
             return
         super().keyPressEvent(event)
@@ -1065,9 +2481,11 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Event Node Graph")
 
         self._cfg = UiConfig()
+        load_rendering_settings(self._cfg, app_settings())
         self._graph = Graph()
         self._scene = GraphScene(self._graph, self._cfg)
         self._view = GraphView(self._scene)
+        self._view.apply_rendering(self._cfg)
         self.setCentralWidget(self._view)
 
         self._import_system_prompt_action = QAction("Import TXT", self)
@@ -1100,8 +2518,33 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.RightDockWidgetArea, self._legend_dock)
         self._scene.legendChanged.connect(self._legend_dock.refresh)
 
+        self._minimap_dock = MinimapDockWidget(self, self._scene, self._view)
+        self.splitDockWidget(self._legend_dock, self._minimap_dock, Qt.Vertical)
+
+        self._load_progress = QProgressBar(self)
+        self._load_progress.setMaximumWidth(240)
+        self._load_progress.setFormat("Loading %v / %m nodes")
+        self._load_progress.hide()
+        self.statusBar().addPermanentWidget(self._load_progress)
+        self._scene.loadProgress.connect(self._on_load_progress)
+
         self._current_project_path: Optional[str] = None
         self._connect_action: Optional[QAction] = None
+        self._link_on_import_action: Optional[QAction] = None
+        self._force_action: Optional[QAction] = None
+        self._force_worker: Optional[ForceLayoutWorker] = None
+        # Positions when the running force layout started, for its undo step.
+        self._force_start: dict[str, tuple[float, float]] = {}
+        self._layout_job: Optional[LayoutJob] = None
+        self._bundle_action: Optional[QAction] = None
+        self._bundle_job: Optional[BundlingJob] = None
+        # Bundles are recomputed once edits and drags have settled.
+        self._bundle_timer = QTimer(self)
+        self._bundle_timer.setSingleShot(True)
+        self._bundle_timer.setInterval(600)
+        self._bundle_timer.timeout.connect(self._start_bundling)
+        self._scene.bundlesInvalidated.connect(self._on_bundles_invalidated)
+        self._scene.pinChanged.connect(self._on_pin_changed)
 
         self._init_toolbar()
 
@@ -1132,9 +2575,40 @@ class MainWindow(QMainWindow):
         import_action.triggered.connect(self._import_txt)
         tb.addAction(import_action)
 
-        layout_action = QAction("Auto Layout", self)
-        layout_action.triggered.connect(self._auto_layout)
-        tb.addAction(layout_action)
+        self._link_on_import_action = QAction("Link on Import", self)
+        self._link_on_import_action.setCheckable(True)
+        tb.addAction(self._link_on_import_action)
+
+        marker_formats_action = QAction("Date Formats", self)
+        marker_formats_action.triggered.connect(self._edit_marker_formats)
+        tb.addAction(marker_formats_action)
+
+        export_txt_action = QAction("Export TXT", self)
+        export_txt_action.triggered.connect(self._export_txt)
+        tb.addAction(export_txt_action)
+
+        link_action = QAction("Auto Link", self)
+        link_action.triggered.connect(self._auto_link)
+        tb.addAction(link_action)
+
+        layout_button = QToolButton(self)
+        layout_button.setText("Auto Layout")
+        layout_button.setPopupMode(QToolButton.InstantPopup)
+        layout_menu = QMenu(layout_button)
+        for label, layout_fn in self._layout_modes():
+            mode_action = layout_menu.addAction(label)
+            mode_action.triggered.connect(lambda _checked=False, fn=layout_fn: self._auto_layout(fn))
+        layout_menu.addSeparator()
+        overlaps_action = layout_menu.addAction("Remove Overlaps")
+        overlaps_action.setToolTip("Separate overlapping nodes (the selection, or all nodes)")
+        overlaps_action.triggered.connect(self._remove_overlaps)
+        layout_button.setMenu(layout_menu)
+        tb.addWidget(layout_button)
+
+        self._force_action = QAction("Force Layout", self)
+        self._force_action.setCheckable(True)
+        self._force_action.toggled.connect(self._toggle_force_layout)
+        tb.addAction(self._force_action)
 
         tb.addSeparator()
 
@@ -1174,6 +2648,19 @@ class MainWindow(QMainWindow):
         goto_start_action.triggered.connect(self._goto_earliest)
         tb.addAction(goto_start_action)
 
+        self._bundle_action = QAction("Bundle Edges", self)
+        self._bundle_action.setCheckable(True)
+        self._bundle_action.setToolTip("Draw edges as shared bundles (computed in the background)")
+        self._bundle_action.toggled.connect(self._toggle_edge_bundling)
+        tb.addAction(self._bundle_action)
+
+        hud_action = QAction("Performance HUD", self)
+        hud_action.setCheckable(True)
+        hud_action.setShortcut(QKeySequence(Qt.Key_F12))
+        hud_action.setToolTip("Show frame rate, paint time and update costs over the canvas (F12)")
+        hud_action.toggled.connect(self._view.set_hud_enabled)
+        tb.addAction(hud_action)
+
         tb.addSeparator()
         
         settings_action = QAction("Display Settings", self)
@@ -1182,6 +2669,8 @@ class MainWindow(QMainWindow):
 
         if hasattr(self, "_legend_dock"):
             tb.addAction(self._legend_dock.toggleViewAction())
+        if hasattr(self, "_minimap_dock"):
+            tb.addAction(self._minimap_dock.toggleViewAction())
             
     def _goto_earliest(self) -> None:
         if not self._graph.nodes:
@@ -1204,9 +2693,7 @@ class MainWindow(QMainWindow):
             earliest_node = next(iter(self._graph.iter_nodes()), None)
             
         if earliest_node:
-            item = self._scene._node_items.get(earliest_node.id.value)
-            if item:
-                self._view.centerOn(item)
+            self._view.centerOn(earliest_node.x, earliest_node.y)
     
     def _toggle_date_format(self) -> None:
         if self._cfg.date_display_format == "date":
@@ -1219,10 +2706,19 @@ class MainWindow(QMainWindow):
         dialog = DisplaySettingsDialog(self, self._cfg)
         if dialog.exec() != QDialog.Accepted:
             return
-        date_fmt, node_radius, edge_width = dialog.get_values()
+        date_fmt, node_radius, edge_width, timeline_scale = dialog.get_values()
         self._cfg.date_display_format = date_fmt
         self._cfg.node_radius = node_radius
         self._cfg.edge_width = edge_width
+        self._cfg.timeline_pixels_per_day = timeline_scale
+        for name, value in dialog.get_rendering().items():
+            setattr(self._cfg, name, value)
+        save_rendering_settings(self._cfg, app_settings())
+        self._scene.apply_rendering()
+        if not self._view.apply_rendering(self._cfg):
+            QMessageBox.warning(
+                self, "OpenGL Unavailable", "No OpenGL context could be created; the view keeps software rendering."
+            )
         self._scene.refresh()
 
     def _reset_zoom(self) -> None:
@@ -1235,8 +2731,9 @@ class MainWindow(QMainWindow):
     def _new_node(self) -> None:
         node = Node(id=NodeId.new(), text="", event_date=None, x=100.0, y=100.0)
         self._graph.add_node(node)
-        self._scene._add_node_item(node)
-        self._scene.refresh_visibility()
+        self._graph.include_position(node.x, node.y)
+        self._scene.add_items((node,), ())
+        self._scene.push_command(Command("New Node", (AddItems(nodes=(node,)),)))
 
     def _selected_node_item(self) -> Optional[NodeItem]:
         for item in self._scene.selectedItems():
@@ -1262,9 +2759,7 @@ class MainWindow(QMainWindow):
         except ValueError:
             QMessageBox.warning(self, "Invalid Date", "Date must be YYYY-MM-DD")
             return
-        node.event_date = new_date
-        node.text = new_text
-        item.update_from_node(node)
+        self._scene._edit_node(item.node_id.value, "Edit Node", event_date=new_date, text=new_text)
 
     def _on_selection_changed(self) -> None:
         pass
@@ -1276,26 +2771,25 @@ class MainWindow(QMainWindow):
         if not path:
             return
 
+        auto_link = bool(self._link_on_import_action and self._link_on_import_action.isChecked())
         try:
-            new_graph = import_txt_file(path, self._graph)
+            report = import_txt_file_lenient(path, self._graph, auto_link=auto_link)
+            if report.errors:
+                dialog = ImportReportDialog(self, report, self._read_text_file(path))
+                if dialog.exec() != QDialog.Accepted or not report.graph.nodes:
+                    return
+            new_graph = report.graph
             
             new_node_ids = list(new_graph.nodes.keys())
             
-            for node in new_graph.iter_nodes():
+            new_nodes = tuple(new_graph.iter_nodes())
+            for node in new_nodes:
                 self._graph.add_node(node)
-                self._scene._add_node_item(node)
-            
             assign_default_layout_for_new_nodes(self._graph, new_node_ids)
+            added_edges = tuple(self._graph.add_edges(new_graph.iter_edges()))
 
-            for nid in new_node_ids:
-                node = self._graph.nodes.get(nid)
-                item = self._scene._node_items.get(nid)
-                if node is not None and item is not None:
-                    item.setPos(node.x, node.y)
-            for edge_item in self._scene._edge_items.values():
-                edge_item.update_path()
-            
-            self._scene.refresh_visibility()
+            self._scene.add_items(new_nodes, added_edges)
+            self._scene.push_command(Command("Import TXT", (AddItems(nodes=new_nodes, edges=added_edges),)))
             self._scene.update()
             
             count = len(new_node_ids)
@@ -1309,14 +2803,260 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Import Error", f"Unexpected error: {e}")
 
-    def _auto_layout(self) -> None:
-        assign_default_layout(self._graph)
-        for node in self._graph.iter_nodes():
-            item = self._scene._node_items.get(node.id.value)
-            if item is not None:
-                item.setPos(node.x, node.y)
-        for edge_item in self._scene._edge_items.values():
-            edge_item.update_path()
+    def _edit_marker_formats(self) -> None:
+        dialog = MarkerFormatsDialog(self, self._graph.marker_formats)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        names = dialog.get_values()
+        if list(DEFAULT_MARKER_FORMATS) == names:
+            names = []
+        self._graph.marker_formats = names
+
+    def _export_txt(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(self, "Export TXT", "", "Text Files (*.txt);;All Files (*)")
+        if not path:
+            return
+        visible_only = False
+        if self._scene.has_hidden_nodes():
+            answer = QMessageBox.question(
+                self,
+                "Export TXT",
+                "Export only the nodes that are currently visible?",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+                QMessageBox.No,
+            )
+            if answer == QMessageBox.Cancel:
+                return
+            visible_only = answer == QMessageBox.Yes
+        try:
+            count = export_txt_file(path, self._graph, visible_only=visible_only)
+        except OSError as exc:
+            QMessageBox.critical(self, "Export Failed", str(exc))
+            return
+        QMessageBox.information(self, "Export TXT", f"Exported {count} nodes.")
+
+    def _auto_link(self) -> None:
+        selected = [item.node_id.value for item in self._scene.selectedItems() if isinstance(item, NodeItem)]
+        answer = QMessageBox.question(
+            self,
+            "Auto Link",
+            "Link events separately for each legend color?",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+            QMessageBox.No,
+        )
+        if answer == QMessageBox.Cancel:
+            return
+        node_ids = selected if len(selected) > 1 else None
+        edges = link_chronologically(self._graph, node_ids, per_color=answer == QMessageBox.Yes)
+        self._scene.add_edges(edges)
+        self._scene.push_command(Command("Auto Link", (AddItems(edges=tuple(edges)),)))
+
+    def _layout_modes(self) -> list[tuple[str, LayoutFunction]]:
+        return [
+            ("Date Columns", lambda g, progress: assign_default_layout(g, progress=progress)),
+            ("Layered (by edges)", lambda g, progress: assign_layered_layout(g, progress=progress)),
+            (
+                "Timeline (to scale)",
+                lambda g, progress: assign_timeline_layout(
+                    g, LayoutConfig(pixels_per_day=self._cfg.timeline_pixels_per_day), progress=progress
+                ),
+            ),
+        ]
+
+    def _auto_layout(self, layout_fn: Optional[LayoutFunction] = None) -> None:
+        self._cancel_layout_job()
+        self._stop_force_layout()
+        if layout_fn is None:
+            layout_fn = self._layout_modes()[0][1]
+
+        job = LayoutJob(layout_snapshot(self._graph), layout_fn, self)
+        progress = QProgressDialog("Computing layout...", "Cancel", 0, 100, self)
+        progress.setWindowTitle("Auto Layout")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoReset(False)
+        job.progressed.connect(progress.setValue)
+        progress.canceled.connect(job.cancel)
+        job.completed.connect(self._apply_layout_result)
+        job.finished.connect(progress.deleteLater)
+        job.finished.connect(lambda: self._on_layout_job_finished(job))
+        self._layout_job = job
+        job.start()
+
+    def _remove_overlaps(self) -> None:
+        selected = [item.node_id.value for item in self._scene.selectedItems() if isinstance(item, NodeItem)]
+        node_ids = selected or None
+        width, height = NodeItem.footprint(self._cfg)
+        self._auto_layout(lambda g, progress: remove_overlaps(g, width, height, node_ids, progress=progress))
+
+    def _apply_layout_result(self, snapshot: Graph) -> None:
+        if self.sender() is not self._layout_job:
+            return
+        positions = [(nid, n.x, n.y) for nid, n in snapshot.nodes.items() if nid in self._graph.nodes]
+        change = position_diff(self._graph, positions)
+        if change is not None:
+            self._scene.push_command(Command("Layout", (change,)))
+        if self._cfg.animate_layout and len(positions) <= self._cfg.animate_layout_max_nodes:
+            self._scene.animate_positions(positions)
+        else:
+            self._scene.apply_positions(positions)
+        self._graph.bounds = snapshot.bounds
+
+    def _on_layout_job_finished(self, job: LayoutJob) -> None:
+        if self._layout_job is job:
+            self._layout_job = None
+        job.deleteLater()
+
+    def _cancel_layout_job(self) -> None:
+        job = self._layout_job
+        if job is None:
+            return
+        self._layout_job = None
+        job.cancel()
+        job.wait()
+
+    def _bundling_enabled(self) -> bool:
+        return bool(self._bundle_action and self._bundle_action.isChecked())
+
+    def _toggle_edge_bundling(self, enabled: bool) -> None:
+        if enabled:
+            self._bundle_timer.stop()
+            self._start_bundling()
+        else:
+            self._bundle_timer.stop()
+            self._cancel_bundling_job()
+            self._scene.clear_edge_bundles()
+
+    def _on_bundles_invalidated(self) -> None:
+        if self._bundling_enabled():
+            # Called on every drag step, so don't block on the running job.
+            self._cancel_bundling_job(wait=False)
+            self._bundle_timer.start()
+
+    def _start_bundling(self) -> None:
+        self._cancel_bundling_job(wait=False)
+        edge_ids, sources, targets = self._scene.bundle_inputs()
+        if not edge_ids:
+            return
+        job = BundlingJob(edge_ids, sources, targets, self)
+        job.completed.connect(self._apply_bundles)
+        job.finished.connect(lambda: self._on_bundling_job_finished(job))
+        self._bundle_job = job
+        job.start()
+
+    def _apply_bundles(self, edge_ids: list[str], polylines) -> None:
+        # Results of a job cancelled by a later edit are stale.
+        if self.sender() is not self._bundle_job or not self._bundling_enabled():
+            return
+        self._scene.set_edge_bundles(edge_ids, polylines)
+
+    def _on_bundling_job_finished(self, job: BundlingJob) -> None:
+        if self._bundle_job is job:
+            self._bundle_job = None
+        job.deleteLater()
+
+    def _cancel_bundling_job(self, wait: bool = True) -> None:
+        job = self._bundle_job
+        if job is None:
+            return
+        self._bundle_job = None
+        job.cancel()
+        if wait:
+            job.wait()
+
+    def _toggle_force_layout(self, enabled: bool) -> None:
+        if not enabled:
+            self._stop_force_layout()
+            return
+        if self._force_worker is not None:
+            return
+        if not self._graph.nodes:
+            self._set_force_action_checked(False)
+            return
+        self._cancel_layout_job()
+        self._scene.stop_position_animation()
+        worker = ForceLayoutWorker(ForceLayout(self._graph), self)
+        worker.positionsReady.connect(self._apply_force_positions)
+        worker.finished.connect(self._on_force_layout_finished)
+        self._force_worker = worker
+        self._force_start = {nid: (n.x, n.y) for nid, n in self._graph.nodes.items()}
+        self._graph.bounds = None
+        worker.start()
+
+    def _apply_force_positions(self) -> None:
+        worker = self._force_worker
+        if worker is None or self.sender() is not worker:
+            return
+        positions = worker.take_positions()
+        if positions is None:
+            return
+        held: dict[str, tuple[float, float]] = {}
+        if isinstance(self._scene.mouseGrabberItem(), NodeItem):
+            for item in self._scene.selectedItems():
+                if isinstance(item, NodeItem):
+                    held[item.node_id.value] = (float(item.pos().x()), float(item.pos().y()))
+        worker.hold(held)
+
+        updates: list[tuple[str, float, float]] = []
+        for i, nid in enumerate(worker.node_ids):
+            node = self._graph.nodes.get(nid)
+            if node is None or node.pinned or nid in held:
+                continue
+            updates.append((nid, float(positions[i, 0]), float(positions[i, 1])))
+        self._scene.apply_positions(updates)
+
+    def _on_pin_changed(self, node_id: str, pinned: bool) -> None:
+        worker = self._force_worker
+        node = self._graph.nodes.get(node_id)
+        if worker is None or node is None:
+            return
+        worker.set_pinned(node_id, pinned, node.x, node.y)
+
+    def _stop_force_layout(self) -> None:
+        worker = self._force_worker
+        if worker is None:
+            return
+        worker.request_stop()
+        worker.wait()
+        self._force_worker = None
+        self._push_force_layout_command()
+        self._set_force_action_checked(False)
+
+    def _on_force_layout_finished(self) -> None:
+        if self.sender() is self._force_worker:
+            self._force_worker = None
+            self._push_force_layout_command()
+            self._set_force_action_checked(False)
+
+    def _push_force_layout_command(self) -> None:
+        # The whole run, however long, is one undo step.
+        start, self._force_start = self._force_start, {}
+        nodes = self._graph.nodes
+        moved = [nid for nid, pos in start.items() if nid in nodes and (nodes[nid].x, nodes[nid].y) != pos]
+        if not moved:
+            return
+        change = MoveNodes(
+            node_ids=tuple(moved),
+            before=tuple(start[nid] for nid in moved),
+            after=tuple((nodes[nid].x, nodes[nid].y) for nid in moved),
+        )
+        self._scene.push_command(Command("Force Layout", (change,)))
+
+    def _set_force_action_checked(self, checked: bool) -> None:
+        if self._force_action is None:
+            return
+        self._force_action.blockSignals(True)
+        self._force_action.setChecked(checked)
+        self._force_action.blockSignals(False)
+
+    def closeEvent(self, event) -> None:
+        self._cancel_layout_job()
+        self._stop_force_layout()
+        self._bundle_timer.stop()
+        for job in self.findChildren(BundlingJob):
+            job.cancel()
+            job.wait()
+        super().closeEvent(event)
 
     def _save(self) -> None:
         if self._current_project_path is None:
@@ -1343,13 +3083,24 @@ class MainWindow(QMainWindow):
         except Exception as exc:
             QMessageBox.critical(self, "Open Failed", str(exc))
             return
+        self._cancel_layout_job()
+        self._stop_force_layout()
+        self._scene.stop_position_animation()
         self._current_project_path = path
         self._graph = graph
-        self._scene.load_graph(self._graph)
+        self._scene.load_graph(self._graph, focus=self._view.visible_scene_rect())
         self._legend_dock.set_graph(self._graph)
         self._prompt_dock.set_graph(self._graph)
         self._world_dock.set_graph(self._graph)
 
+    def _on_load_progress(self, done: int, total: int) -> None:
+        if done >= total:
+            self._load_progress.hide()
+            return
+        self._load_progress.setRange(0, total)
+        self._load_progress.setValue(done)
+        self._load_progress.show()
+
     def _read_text_file(self, path: str) -> str:
         try:
             try:
@@ -1384,7 +3135,143 @@ class MainWindow(QMainWindow):
         self._world_dock.refresh()
 
 
+class MinimapWidget(QWidget):
+    """Whole-graph thumbnail with the view's visible area; drag to navigate."""
+
+    MARGIN = 0.1
+
+    def __init__(self, scene: GraphScene, view: GraphView, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._scene = scene
+        self._view = view
+        self._grid = SpatialGrid()
+        self._raster: Optional[MinimapRaster] = None
+        # Changed node ids not yet applied; None means rebuild everything.
+        self._pending: Optional[set[str]] = None
+        self._visible_rect = QRectF()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(50)
+        self._timer.timeout.connect(self._apply_pending)
+        self.setMinimumSize(160, 120)
+        self.setCursor(Qt.CrossCursor)
+        scene.nodesChanged.connect(self._on_nodes_changed)
+        view.visibleRectChanged.connect(self._on_visible_rect_changed)
+
+    def _on_nodes_changed(self, node_ids) -> None:
+        if node_ids is None or self._raster is None:
+            self._pending = None
+        elif self._pending is not None:
+            self._pending.update(node_ids)
+        if self.isVisible() and not self._timer.isActive():
+            self._timer.start()
+
+    def _on_visible_rect_changed(self, rect: QRectF) -> None:
+        self._visible_rect = QRectF(rect)
+        self.update()
+
+    def _apply_pending(self) -> None:
+        # Runs only while shown; showEvent catches up on hidden changes.
+        if not self.isVisible():
+            return
+        pending, self._pending = self._pending, set()
+        nodes = self._scene.graph.nodes
+        if self._raster is None or pending is None or len(pending) * 4 > len(self._grid) + 4:
+            self._rebuild()
+            return
+        raster = self._raster
+        touched: list[tuple[float, float]] = []
+        outside = False
+        for node_id in pending:
+            if node_id in self._grid:
+                touched.append(self._grid.position(node_id))
+            node = nodes.get(node_id)
+            if node is None:
+                self._grid.remove(node_id)
+                continue
+            self._grid.insert(node_id, node.x, node.y)
+            touched.append((node.x, node.y))
+            outside = outside or not raster.contains(node.x, node.y)
+        if outside:
+            self._rebuild(reindex=False)
+            return
+        raster.mark(touched)
+        for x, y, w, h in raster.redraw(self._grid):
+            self.update(x, y, w, h)
+
+    def _rebuild(self, reindex: bool = True) -> None:
+        if reindex:
+            self._grid = SpatialGrid.from_graph(self._scene.graph)
+        self._pending = set()
+        bounds = self._grid.bounds() or (-500.0, -500.0, 500.0, 500.0)
+        x0, y0, x1, y1 = bounds
+        mx, my = (x1 - x0) * self.MARGIN, (y1 - y0) * self.MARGIN
+        self._raster = MinimapRaster(
+            max(1, self.width()), max(1, self.height()), (x0 - mx, y0 - my, x1 + mx, y1 + my)
+        )
+        self._raster.redraw(self._grid)
+        self.update()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._apply_pending()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        if self._raster is not None:
+            self._rebuild(reindex=False)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        raster = self._raster
+        if raster is None:
+            painter.fillRect(self.rect(), QColor(244, 244, 244))
+            return
+        pixels = raster.pixels
+        image = QImage(pixels.data, raster.width, raster.height, raster.width * 4, QImage.Format_RGB32)
+        painter.drawImage(event.rect(), image, event.rect())
+        if not self._visible_rect.isEmpty():
+            left, top = raster.to_pixels(self._visible_rect.left(), self._visible_rect.top())
+            right, bottom = raster.to_pixels(self._visible_rect.right(), self._visible_rect.bottom())
+            painter.setPen(QPen(QColor(30, 120, 220), 1.5))
+            painter.setBrush(QColor(30, 120, 220, 40))
+            painter.drawRect(QRectF(left, top, max(2.0, right - left), max(2.0, bottom - top)))
+        painter.end()
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton:
+            self._center_on(event.position())
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if event.buttons() & Qt.LeftButton:
+            self._center_on(event.position())
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def _center_on(self, pos: QPointF) -> None:
+        if self._raster is not None:
+            self._view.centerOn(*self._raster.to_scene(pos.x(), pos.y()))
+
+
+class MinimapDockWidget(QDockWidget):
+    def __init__(self, parent: QWidget, scene: GraphScene, view: GraphView) -> None:
+        super().__init__("Minimap", parent)
+        self._minimap = MinimapWidget(scene, view, self)
+        self.setWidget(self._minimap)
+
+
 def run_app() -> None:
+    cfg = UiConfig()
+    load_rendering_settings(cfg, app_settings())
+    if cfg.opengl == "software":
+        # Qt ships Mesa llvmpipe as its software OpenGL on Windows; Mesa
+        # elsewhere honours LIBGL_ALWAYS_SOFTWARE.
+        QApplication.setAttribute(Qt.AA_UseSoftwareOpenGL)
+        os.environ.setdefault("LIBGL_ALWAYS_SOFTWARE", "1")
     app = QApplication([])
     tooltip_font = QFont()
     tooltip_font.setPointSize(12)
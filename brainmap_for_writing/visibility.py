@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from .core import Graph
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from .core import Edge, Graph, Node
 
 
 def compute_visible_nodes(graph: Graph) -> set[str]:
@@ -36,3 +39,318 @@ def compute_visible_nodes(graph: Graph) -> set[str]:
                 stack.append(nxt)
 
     return visible
+
+
+@dataclass
+class VisibilityDelta:
+    shown: set[str] = field(default_factory=set)
+    hidden: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.shown or self.hidden)
+
+
+class VisibilityIndex:
+    """Visible node set kept up to date as edges are collapsed and expanded.
+
+    Gives the same answer as :func:`compute_visible_nodes`. Each node keeps a
+    support count: one if it is a root, plus one per non-collapsed incoming
+    edge from a visible node. A toggle only walks the subtree below the edge
+    and returns which ids appeared or disappeared. On acyclic graphs a node is
+    visible exactly while its count is positive; when the graph has cycles,
+    a collapse re-checks reachability inside the affected subtree instead.
+    Added and removed nodes and edges are folded in the same way through
+    :meth:`add_items` and :meth:`remove_items`; :meth:`rebuild` starts over.
+    """
+
+    def __init__(self, graph: Graph) -> None:
+        self._graph = graph
+        self.visible: set[str] = set()
+        self.rebuild()
+
+    def rebuild(self) -> VisibilityDelta:
+        graph = self._graph
+        self._outgoing: dict[str, set[str]] = {nid: set() for nid in graph.nodes}
+        self._incoming: dict[str, set[str]] = {nid: set() for nid in graph.nodes}
+        # Collapse state as last seen by the index; see sync_edge().
+        self._collapsed = {edge.id.value for edge in graph.iter_edges() if edge.collapsed}
+        for edge in graph.iter_edges():
+            s = edge.source.value
+            t = edge.target.value
+            if s in self._outgoing and t in self._incoming:
+                self._outgoing[s].add(edge.id.value)
+                self._incoming[t].add(edge.id.value)
+
+        roots = {nid for nid, incoming in self._incoming.items() if not incoming}
+        # Without any node free of incoming edges every node is a root.
+        self._all_roots = not roots
+        self._roots = roots or set(graph.nodes)
+        self._acyclic = self._check_acyclic()
+
+        previous = self.visible
+        self.visible = set()
+        self._support = {nid: 0 for nid in graph.nodes}
+        for nid in self._roots:
+            self._support[nid] += 1
+            if nid not in self.visible:
+                self.visible.add(nid)
+                self._show_from(nid, set())
+        return VisibilityDelta(shown=self.visible - previous, hidden=previous - self.visible)
+
+    def is_visible(self, node_id: str) -> bool:
+        return node_id in self.visible
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._support
+
+    def incident_edges(self, node_ids: Iterable[str]) -> set[str]:
+        out: set[str] = set()
+        for nid in node_ids:
+            out.update(self._outgoing.get(nid, ()))
+            out.update(self._incoming.get(nid, ()))
+        return out
+
+    def add_items(self, nodes: Iterable[Node], edges: Iterable[Edge]) -> VisibilityDelta:
+        """Fold in nodes and edges that were just inserted into the graph.
+
+        New nodes that end up hidden are reported in ``hidden`` so callers can
+        hide freshly created items.
+        """
+        new_nodes = [n.id.value for n in nodes if n.id.value not in self._support]
+        new_edges = [e for e in edges if e.id.value in self._graph.edges]
+        if self._all_roots and not new_nodes and not new_edges:
+            return VisibilityDelta()
+        if self._all_roots:
+            return self._rebuild_delta(new_nodes)
+
+        for nid in new_nodes:
+            self._outgoing[nid] = set()
+            self._incoming[nid] = set()
+            self._support[nid] = 0
+
+        shown: set[str] = set()
+        demoted: set[str] = set()
+        for edge in new_edges:
+            eid = edge.id.value
+            s = edge.source.value
+            t = edge.target.value
+            if s not in self._outgoing or t not in self._incoming or eid in self._outgoing[s]:
+                continue
+            if t in self._roots:
+                self._roots.discard(t)
+                self._support[t] -= 1
+                demoted.add(t)
+            self._outgoing[s].add(eid)
+            self._incoming[t].add(eid)
+            if edge.collapsed:
+                self._collapsed.add(eid)
+            elif s in self.visible:
+                self._support[t] += 1
+                if t not in self.visible:
+                    self.visible.add(t)
+                    shown.add(t)
+                    self._show_from(t, shown)
+        if new_edges:
+            # Whether a new edge closed a cycle is settled by the next rebuild.
+            self._acyclic = False
+
+        for nid in new_nodes:
+            if not self._incoming[nid]:
+                self._roots.add(nid)
+                self._support[nid] += 1
+                if nid not in self.visible:
+                    self.visible.add(nid)
+                    shown.add(nid)
+                    self._show_from(nid, shown)
+        if not self._roots:
+            self.visible -= shown
+            return self._rebuild_delta(new_nodes)
+
+        hidden = self._recheck_below(demoted) if demoted else set()
+        hidden_new = {nid for nid in new_nodes if nid not in self.visible}
+        return VisibilityDelta(shown=shown - hidden, hidden=(hidden - shown) | hidden_new)
+
+    def remove_items(self, nodes: Iterable[Node], edges: Iterable[Edge]) -> VisibilityDelta:
+        """Fold in nodes and edges that were just removed from the graph.
+
+        ``edges`` must include every edge attached to the removed nodes.
+        Removed nodes are not reported in the delta.
+        """
+        gone_nodes = {n.id.value for n in nodes if n.id.value in self._support}
+        gone_edges = [e for e in edges if e.source.value in self._outgoing and e.id.value in self._outgoing[e.source.value]]
+        if self._all_roots:
+            return self._rebuild_delta(())
+
+        affected: set[str] = set()
+        promoted: set[str] = set()
+        for edge in gone_edges:
+            eid = edge.id.value
+            s = edge.source.value
+            t = edge.target.value
+            self._outgoing[s].discard(eid)
+            self._incoming[t].discard(eid)
+            live = eid not in self._collapsed
+            self._collapsed.discard(eid)
+            if t in gone_nodes:
+                continue
+            if live and s in self.visible:
+                self._support[t] -= 1
+                affected.add(t)
+            if not self._incoming[t]:
+                self._roots.add(t)
+                self._support[t] += 1
+                promoted.add(t)
+
+        for nid in gone_nodes:
+            del self._outgoing[nid]
+            del self._incoming[nid]
+            self._support.pop(nid, None)
+            self._roots.discard(nid)
+            self.visible.discard(nid)
+            affected.discard(nid)
+            promoted.discard(nid)
+
+        if not self._roots:
+            return self._rebuild_delta(())
+
+        shown: set[str] = set()
+        for t in promoted:
+            if t not in self.visible:
+                self.visible.add(t)
+                shown.add(t)
+                self._show_from(t, shown)
+        if self._acyclic:
+            hidden: set[str] = set()
+            for t in affected:
+                if t in self.visible and self._support[t] == 0:
+                    hidden |= self._hide_from(t)
+        else:
+            hidden = self._recheck_below(affected & self.visible)
+        return VisibilityDelta(shown=shown - hidden, hidden=hidden - shown)
+
+    def _rebuild_delta(self, new_nodes: Iterable[str]) -> VisibilityDelta:
+        delta = self.rebuild()
+        delta.hidden = {nid for nid in delta.hidden if nid in self._support}
+        delta.hidden |= {nid for nid in new_nodes if nid not in self.visible}
+        return delta
+
+    def set_collapsed(self, edge_id: str, collapsed: bool) -> VisibilityDelta:
+        edge = self._graph.edges.get(edge_id)
+        if edge is None:
+            return VisibilityDelta()
+        edge.collapsed = collapsed
+        return self.sync_edge(edge_id)
+
+    def sync_edge(self, edge_id: str) -> VisibilityDelta:
+        """Catch up with an edge whose ``collapsed`` flag was changed directly."""
+        edge = self._graph.edges.get(edge_id)
+        if edge is None or edge.collapsed == (edge_id in self._collapsed):
+            return VisibilityDelta()
+        collapsed = edge.collapsed
+        if collapsed:
+            self._collapsed.add(edge_id)
+        else:
+            self._collapsed.discard(edge_id)
+        s = edge.source.value
+        t = edge.target.value
+        if s not in self.visible or t not in self._support:
+            return VisibilityDelta()
+
+        if not collapsed:
+            self._support[t] += 1
+            if t in self.visible:
+                return VisibilityDelta()
+            self.visible.add(t)
+            shown = {t}
+            self._show_from(t, shown)
+            return VisibilityDelta(shown=shown)
+
+        self._support[t] -= 1
+        if self._acyclic:
+            if self._support[t] > 0:
+                return VisibilityDelta()
+            return VisibilityDelta(hidden=self._hide_from(t))
+        return VisibilityDelta(hidden=self._recheck_below({t}))
+
+    def _live_targets(self, nid: str) -> Iterator[str]:
+        edges = self._graph.edges
+        for eid in self._outgoing.get(nid, ()):
+            if eid not in self._collapsed:
+                yield edges[eid].target.value
+
+    def _show_from(self, start: str, shown: set[str]) -> None:
+        stack = [start]
+        while stack:
+            nid = stack.pop()
+            for nxt in self._live_targets(nid):
+                self._support[nxt] += 1
+                if nxt not in self.visible:
+                    self.visible.add(nxt)
+                    shown.add(nxt)
+                    stack.append(nxt)
+
+    def _hide_from(self, start: str) -> set[str]:
+        self.visible.discard(start)
+        hidden = {start}
+        stack = [start]
+        while stack:
+            nid = stack.pop()
+            for nxt in self._live_targets(nid):
+                self._support[nxt] -= 1
+                if self._support[nxt] == 0 and nxt in self.visible:
+                    self.visible.discard(nxt)
+                    hidden.add(nxt)
+                    stack.append(nxt)
+        return hidden
+
+    def _recheck_below(self, starts: set[str]) -> set[str]:
+        # Visible nodes reachable from ``starts``: the only ones that may have
+        # lost their last path from a root.
+        region = set(starts)
+        stack = list(starts)
+        while stack:
+            for nxt in self._live_targets(stack.pop()):
+                if nxt in self.visible and nxt not in region:
+                    region.add(nxt)
+                    stack.append(nxt)
+
+        # Keep whatever is still fed from a root or from outside the region.
+        edges = self._graph.edges
+        keep: set[str] = set()
+        for nid in region:
+            if nid in self._roots:
+                keep.add(nid)
+                continue
+            for eid in self._incoming[nid]:
+                src = edges[eid].source.value
+                if eid not in self._collapsed and src in self.visible and src not in region:
+                    keep.add(nid)
+                    break
+        stack = list(keep)
+        while stack:
+            for nxt in self._live_targets(stack.pop()):
+                if nxt in region and nxt not in keep:
+                    keep.add(nxt)
+                    stack.append(nxt)
+
+        hidden = region - keep
+        self.visible -= hidden
+        for nid in hidden:
+            for nxt in self._live_targets(nid):
+                self._support[nxt] -= 1
+        return hidden
+
+    def _check_acyclic(self) -> bool:
+        edges = self._graph.edges
+        indegree = {nid: len(incoming) for nid, incoming in self._incoming.items()}
+        queue = [nid for nid, d in indegree.items() if d == 0]
+        seen = 0
+        while queue:
+            nid = queue.pop()
+            seen += 1
+            for eid in self._outgoing[nid]:
+                t = edges[eid].target.value
+                indegree[t] -= 1
+                if indegree[t] == 0:
+                    queue.append(t)
+        return seen == len(indegree)
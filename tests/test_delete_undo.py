@@ -1,5 +1,6 @@
 from brainmap_for_writing.core import Edge, EdgeId, Graph, Node, NodeId
 from brainmap_for_writing.edit_ops import delete_nodes_and_edges, undo_delete
+from brainmap_for_writing.visibility import VisibilityIndex
 
 
 def test_delete_node_removes_incident_edges_and_undo_restores() -> None:
@@ -41,3 +42,23 @@ def test_delete_edge_and_undo_restores() -> None:
 
     undo_delete(g, snap)
     assert e.id.value in g.edges
+
+
+def test_delete_with_incident_edge_lookup_matches_full_scan() -> None:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="A")
+    b = Node(id=NodeId.new(), text="B")
+    c = Node(id=NodeId.new(), text="C")
+    for n in (a, b, c):
+        g.add_node(n)
+    ab = Edge(id=EdgeId.new(), source=a.id, target=b.id)
+    bc = Edge(id=EdgeId.new(), source=b.id, target=c.id)
+    ac = Edge(id=EdgeId.new(), source=a.id, target=c.id)
+    for e in (ab, bc, ac):
+        g.add_edge(e)
+
+    index = VisibilityIndex(g)
+    snap = delete_nodes_and_edges(g, {b.id.value}, set(), index.incident_edges)
+    assert snap.nodes == (b,)
+    assert {e.id.value for e in snap.edges} == {ab.id.value, bc.id.value}
+    assert set(g.edges) == {ac.id.value}
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from brainmap_for_writing.edge_bundling import BundlingConfig, bundle_edges, edge_compatibility, spatial_chunks
+from brainmap_for_writing.layout import LayoutCancelled
+
+
+def test_bundle_edges_pulls_parallel_edges_together_and_keeps_endpoints() -> None:
+    sources = np.array([(0.0, 0.0), (0.0, 40.0), (0.0, 300.0)])
+    targets = np.array([(400.0, 0.0), (400.0, 40.0), (0.0, 700.0)])
+    points = bundle_edges(sources, targets, BundlingConfig(cycles=3))
+
+    assert points.shape == (3, 9, 2)
+    assert np.array_equal(points[:, 0], sources)
+    assert np.array_equal(points[:, -1], targets)
+    gap = np.abs(points[0, 4, 1] - points[1, 4, 1])
+    assert gap < 20.0
+    # The perpendicular edge has no compatible partner and stays straight.
+    assert np.allclose(points[2, :, 0], 0.0)
+
+
+def test_edge_compatibility_detects_reversed_edges() -> None:
+    a0 = np.array([(0.0, 0.0), (0.0, 0.0)])
+    a1 = np.array([(100.0, 0.0), (100.0, 0.0)])
+    b0 = np.array([(100.0, 10.0), (0.0, 0.0)])
+    b1 = np.array([(0.0, 10.0), (0.0, 100.0)])
+    compat, flip = edge_compatibility(a0, a1, b0, b1)
+    assert compat[0] > 0.8
+    assert compat[1] < 1e-6
+    assert flip.tolist() == [True, False]
+
+
+def test_bundle_edges_can_be_cancelled_from_progress() -> None:
+    rng = np.random.default_rng(0)
+    sources = rng.uniform(0, 1000, (50, 2))
+    targets = sources + rng.normal(0, 100, (50, 2))
+    calls = []
+
+    def progress(fraction: float) -> None:
+        calls.append(fraction)
+        if len(calls) > 3:
+            raise LayoutCancelled()
+
+    with pytest.raises(LayoutCancelled):
+        bundle_edges(sources, targets, progress=progress)
+
+
+def test_spatial_chunks_partition_all_edges() -> None:
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 1000, (250, 5, 2))
+    chunks = spatial_chunks(points, 40)
+    assert all(len(c) <= 40 for c in chunks)
+    assert sorted(np.concatenate(chunks).tolist()) == list(range(250))
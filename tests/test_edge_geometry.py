@@ -1,5 +1,12 @@
+import numpy as np
+
 from brainmap_for_writing.core import Edge, EdgeId, NodeId
-from brainmap_for_writing.edge_geometry import compute_parallel_edge_indices, curve_step
+from brainmap_for_writing.edge_geometry import (
+    ParallelEdgeIndex,
+    compute_edge_geometry,
+    compute_parallel_edge_indices,
+    curve_step,
+)
 
 
 def test_parallel_edge_indices_two_edges() -> None:
@@ -27,3 +34,59 @@ def test_curve_step_increases_with_radius_and_width() -> None:
     s3 = curve_step(24.0, 6.0)
     assert s2 > s1
     assert s3 > s2
+
+
+def test_parallel_edge_index_tracks_adds_and_removes() -> None:
+    a = NodeId.new()
+    b = NodeId.new()
+    edges = [Edge(id=EdgeId.new(), source=a, target=b) for _ in range(4)]
+    other = Edge(id=EdgeId.new(), source=b, target=a)
+    index = ParallelEdgeIndex([other])
+
+    live: list[Edge] = [other]
+    for edge in edges:
+        before = {e.id.value: index.curve_index(e.id.value) for e in live}
+        changed = index.add(edge)
+        live.append(edge)
+        expected = compute_parallel_edge_indices(live)
+        assert {e.id.value: index.curve_index(e.id.value) for e in live} == expected
+        assert changed == {k: v for k, v in expected.items() if before.get(k) != v}
+    assert index.curve_index(other.id.value) == 0
+
+    for edge in edges[:3]:
+        changed = index.remove(edge.id.value)
+        live.remove(edge)
+        expected = compute_parallel_edge_indices(live)
+        assert {e.id.value: index.curve_index(e.id.value) for e in live} == expected
+        assert edge.id.value not in changed
+    assert index.curve_index(edges[3].id.value) == 0
+    assert len(index) == 2
+
+
+def test_compute_edge_geometry_straight_curved_and_degenerate() -> None:
+    geometry = compute_edge_geometry(
+        source=[(0.0, 0.0), (0.0, 0.0), (5.0, 5.0)],
+        target=[(100.0, 0.0), (100.0, 0.0), (5.0, 5.0)],
+        source_radius=[10.0, 10.0, 10.0],
+        target_radius=[10.0, 10.0, 10.0],
+        curve_index=[0, 1, 0],
+        edge_width=2.0,
+    )
+    assert len(geometry) == 3
+    assert geometry.valid.tolist() == [True, True, False]
+
+    assert geometry.start[0].tolist() == [16.0, 0.0]
+    assert geometry.end[0].tolist() == [82.0, 0.0]
+    assert geometry.control[0].tolist() == [49.0, 0.0]
+    assert np.allclose(geometry.arrow[0], [(82.0, 0.0), (70.0, 6.0), (70.0, -6.0)])
+    assert geometry.toggle[0, 1] == 0.0
+
+    step = float(curve_step(10.0, 2.0))
+    assert np.allclose(geometry.control[1], (49.0, step))
+    # The toggle lies on the curve: B(t) = (1-t)^2 P0 + 2t(1-t) C + t^2 P2.
+    t = 0.55
+    expected = (1 - t) ** 2 * geometry.start[1] + 2 * t * (1 - t) * geometry.control[1] + t * t * geometry.end[1]
+    assert np.allclose(geometry.toggle[1], expected)
+    tip, left, right = geometry.arrow[1]
+    assert np.allclose(tip, geometry.end[1])
+    assert np.isclose(np.linalg.norm(left - right), 12.0)
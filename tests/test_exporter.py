@@ -0,0 +1,89 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from brainmap_for_writing.core import Edge, EdgeId, Graph, Node, NodeId
+from brainmap_for_writing.exporter import export_txt
+from brainmap_for_writing.importer import get_marker_grammar, import_txt_lines
+
+
+def _signature(graph: Graph) -> list[tuple[str, str]]:
+    return sorted(
+        (n.event_date.isoformat() if n.event_date else "", n.text) for n in graph.iter_nodes()
+    )
+
+
+def test_export_txt_roundtrips_through_importer() -> None:
+    g = Graph()
+    g.add_node(Node(id=NodeId.new(), text="Later\nsecond line", event_date=datetime(2200, 8, 3)))
+    g.add_node(Node(id=NodeId.new(), text="Earlier", event_date=datetime(2200, 7, 10, 12, 30, 5)))
+    g.add_node(Node(id=NodeId.new(), text="Undated A"))
+    g.add_node(Node(id=NodeId.new(), text="Undated B\nline 2"))
+
+    buf = io.StringIO()
+    assert export_txt(g, buf) == 4
+    out = buf.getvalue()
+    assert out.index("【2200.07.10.12.30.05】") < out.index("【2200.08.03】")
+
+    g2 = import_txt_lines(io.StringIO(out))
+    assert _signature(g2) == _signature(g)
+
+
+def test_export_txt_filters_by_date_range_and_visibility() -> None:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="A", event_date=datetime(2200, 1, 1))
+    b = Node(id=NodeId.new(), text="B", event_date=datetime(2200, 2, 1))
+    c = Node(id=NodeId.new(), text="C", event_date=datetime(2200, 3, 1))
+    for n in (a, b, c):
+        g.add_node(n)
+    g.add_node(Node(id=NodeId.new(), text="Undated"))
+
+    buf = io.StringIO()
+    export_txt(g, buf, start=datetime(2200, 1, 15), end=datetime(2200, 3, 1))
+    assert _signature(import_txt_lines(io.StringIO(buf.getvalue()))) == [
+        ("2200-02-01T00:00:00", "B"),
+        ("2200-03-01T00:00:00", "C"),
+    ]
+
+    g.add_edge(Edge(id=EdgeId.new(), source=a.id, target=b.id, collapsed=True))
+    buf = io.StringIO()
+    export_txt(g, buf, visible_only=True)
+    texts = {n.text for n in import_txt_lines(io.StringIO(buf.getvalue())).iter_nodes()}
+    assert texts == {"A", "C", "Undated"}
+
+
+def test_export_txt_roundtrips_undated_text_with_blank_lines() -> None:
+    g = Graph()
+    g.add_node(Node(id=NodeId.new(), text="First paragraph\n\nSecond paragraph\n   \nThird"))
+    g.add_node(Node(id=NodeId.new(), text="Other\n\\\nliteral backslash"))
+
+    buf = io.StringIO()
+    assert export_txt(g, buf) == 2
+    g2 = import_txt_lines(io.StringIO(buf.getvalue()))
+    assert _signature(g2) == _signature(g)
+
+
+def test_export_txt_roundtrips_text_lines_that_look_like_markers() -> None:
+    g = Graph()
+    g.add_node(Node(id=NodeId.new(), text="Quoted\n【2200.01.02】\nend", event_date=datetime(2200, 1, 1)))
+    g.add_node(Node(id=NodeId.new(), text="Escaped\n\\【2200.01.03】\n【2200.13.40】", event_date=datetime(2200, 1, 5)))
+    g.add_node(Node(id=NodeId.new(), text="Undated\n【2200.01.04】"))
+
+    buf = io.StringIO()
+    assert export_txt(g, buf) == 3
+    g2 = import_txt_lines(io.StringIO(buf.getvalue()))
+    assert _signature(g2) == _signature(g)
+
+
+@pytest.mark.parametrize("formats", [["square"], ["cjk", "bracket"], ["iso"], ["stardate"]])
+def test_export_txt_writes_markers_the_projects_formats_read(formats: list[str]) -> None:
+    g = Graph(marker_formats=formats)
+    g.add_node(Node(id=NodeId.new(), text="A", event_date=datetime(2200, 1, 1)))
+    g.add_node(Node(id=NodeId.new(), text="B\n【2200.01.03】", event_date=datetime(2200, 1, 2, 13, 45, 7)))
+    g.add_node(Node(id=NodeId.new(), text="C", event_date=datetime(2204, 12, 31, 23, 59, 59)))
+
+    buf = io.StringIO()
+    assert export_txt(g, buf) == 3
+    g2 = import_txt_lines(io.StringIO(buf.getvalue()), grammar=get_marker_grammar(formats))
+    assert _signature(g2) == _signature(g)
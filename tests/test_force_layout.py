@@ -0,0 +1,79 @@
+import numpy as np
+
+from brainmap_for_writing.core import Edge, EdgeId, Graph, Node, NodeId
+from brainmap_for_writing import force_layout
+from brainmap_for_writing.force_layout import ForceLayout, barnes_hut_repulsion
+
+
+def _exact_repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+    d = pos[:, None, :] - pos[None, :, :]
+    dist2 = (d * d).sum(axis=2) + 1e-6
+    np.fill_diagonal(dist2, np.inf)
+    return (k * d / dist2[:, :, None]).sum(axis=1)
+
+
+def test_barnes_hut_repulsion_approximates_exact_forces() -> None:
+    rng = np.random.default_rng(1)
+    pos = rng.uniform(0, 1000, size=(600, 2))
+    approx = barnes_hut_repulsion(pos, 100.0, leaf_size=2)
+    exact = _exact_repulsion(pos, 100.0)
+    err = np.linalg.norm(approx - exact, axis=1) / (np.linalg.norm(exact, axis=1) + 1e-9)
+    assert np.median(err) < 0.1
+
+
+def test_barnes_hut_repulsion_refines_clusters_next_to_an_outlier(monkeypatch) -> None:
+    rng = np.random.default_rng(2)
+    pos = rng.normal(0, 30, size=(3000, 2))
+    pos[0] = (1e6, 1e6)
+    interactions = [0]
+    accumulate = force_layout._accumulate
+
+    def counting(force, targets, *args) -> None:
+        interactions[0] += len(targets)
+        accumulate(force, targets, *args)
+
+    monkeypatch.setattr(force_layout, "_accumulate", counting)
+    approx = barnes_hut_repulsion(pos, 100.0)
+    exact = _exact_repulsion(pos, 100.0)
+    err = np.linalg.norm(approx - exact, axis=1) / (np.linalg.norm(exact, axis=1) + 1e-9)
+    assert np.median(err) < 0.1
+    # Far cells per level plus a small exact neighbourhood, not all pairs.
+    assert interactions[0] < 300 * len(pos)
+
+
+def test_force_layout_keeps_pinned_nodes_and_pulls_edges() -> None:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="a", x=0, y=0, pinned=True)
+    b = Node(id=NodeId.new(), text="b", x=2000, y=0)
+    c = Node(id=NodeId.new(), text="c", x=0, y=2000)
+    for n in (a, b, c):
+        g.add_node(n)
+    g.add_edge(Edge(id=EdgeId.new(), source=a.id, target=b.id))
+
+    sim = ForceLayout(g)
+    for _ in range(200):
+        sim.step()
+    sim.apply()
+    assert (a.x, a.y) == (0, 0)
+    assert abs(b.x) + abs(b.y) < 1000
+    assert sim.converged
+
+
+def test_force_layout_set_pinned_applies_to_running_simulation() -> None:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="a", x=0, y=0)
+    b = Node(id=NodeId.new(), text="b", x=10, y=0)
+    for n in (a, b):
+        g.add_node(n)
+
+    sim = ForceLayout(g)
+    sim.step()
+    sim.set_pinned(a.id.value, True)
+    sim.set_position(a.id.value, 500.0, 500.0)
+    for _ in range(20):
+        sim.step()
+    assert tuple(sim.positions[sim.index_of(a.id.value)]) == (500.0, 500.0)
+
+    sim.set_pinned(a.id.value, False)
+    sim.step()
+    assert tuple(sim.positions[sim.index_of(a.id.value)]) != (500.0, 500.0)
@@ -0,0 +1,45 @@
+import pytest
+
+from brainmap_for_writing.frame_stats import FrameStats
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_summary_averages_frames_and_timings_in_window() -> None:
+    clock = FakeClock()
+    stats = FrameStats(window=2.0, clock=clock)
+    for paint in (0.010, 0.020, 0.030, 0.040):
+        clock.now += 0.5
+        stats.add_frame(paint, 100)
+        stats.add_timing("edges", 0.002)
+    stats.add_timing("visibility", 0.010)
+
+    summary = stats.summary()
+    assert summary.fps == pytest.approx(2.0)
+    assert summary.paint_ms == pytest.approx(25.0)
+    assert summary.paint_max_ms == pytest.approx(40.0)
+    assert summary.items == pytest.approx(100.0)
+    assert summary.timings["edges"] == pytest.approx(4.0)
+    assert summary.timings["visibility"] == pytest.approx(5.0)
+
+
+def test_old_samples_expire_and_partial_window_is_scaled() -> None:
+    clock = FakeClock()
+    stats = FrameStats(window=1.0, clock=clock)
+    clock.now += 0.25
+    stats.add_frame(0.005, 10)
+    assert stats.summary().fps == pytest.approx(4.0)
+
+    clock.now += 5.0
+    summary = stats.summary()
+    assert summary.fps == 0.0 and summary.timings == {}
+
+    stats.add_frame(0.001, 1)
+    stats.clear()
+    assert stats.summary().fps == 0.0
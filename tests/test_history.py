@@ -0,0 +1,121 @@
+from brainmap_for_writing.core import Edge, EdgeId, Graph, Node, NodeId
+from brainmap_for_writing.edit_ops import delete_nodes_and_edges
+from brainmap_for_writing.history import (
+    AddItems,
+    Command,
+    MoveNodes,
+    RemoveItems,
+    UndoHistory,
+    move_nodes,
+    set_edge_fields,
+    set_node_fields,
+)
+
+
+def _graph() -> tuple[Graph, Node, Node, Edge]:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="A", x=0.0, y=0.0)
+    b = Node(id=NodeId.new(), text="B", x=10.0, y=0.0)
+    g.add_node(a)
+    g.add_node(b)
+    e = Edge(id=EdgeId.new(), source=a.id, target=b.id)
+    g.add_edge(e)
+    return g, a, b, e
+
+
+def test_field_edits_store_only_changed_fields_and_round_trip() -> None:
+    g, a, _, e = _graph()
+    history = UndoHistory()
+
+    change = set_node_fields(g, a.id.value, text="A", note="hello", color="#ff0000")
+    assert change is not None
+    assert change.before == {"note": "", "color": None}
+    assert set_node_fields(g, a.id.value, note="hello") is None
+    history.push(Command("Edit", (change,)))
+    edge_change = set_edge_fields(g, e.id.value, collapsed=True)
+    assert edge_change is not None
+    history.push(Command("Collapse", (edge_change,)))
+
+    history.undo(g)
+    assert e.collapsed is False
+    history.undo(g)
+    assert (a.note, a.color) == ("", None)
+    assert history.undo(g) is None
+
+    history.redo(g)
+    history.redo(g)
+    assert (a.note, a.color, e.collapsed) == ("hello", "#ff0000", True)
+    assert not history.can_redo()
+
+
+def test_drags_within_merge_window_coalesce() -> None:
+    g, a, b, _ = _graph()
+    now = [0.0]
+    history = UndoHistory(merge_window=1.0, clock=lambda: now[0])
+    key = ("move", (a.id.value,))
+
+    for step in range(1, 6):
+        change = move_nodes(g, [(a.id.value, float(step), 0.0)])
+        assert change is not None
+        history.push(Command("Move", (change,), merge_key=key))
+        now[0] += 0.1
+    assert len(history) == 1
+
+    now[0] += 5.0
+    history.push(Command("Move", (move_nodes(g, [(a.id.value, 99.0, 0.0)]),), merge_key=key))
+    assert len(history) == 2
+
+    history.undo(g)
+    history.undo(g)
+    assert (a.x, a.y) == (0.0, 0.0)
+    history.redo(g)
+    assert (a.x, a.y) == (5.0, 0.0)
+
+    # A push after undo/redo never merges into the entry below it.
+    history.push(Command("Move", (move_nodes(g, [(a.id.value, 7.0, 0.0)]),), merge_key=key))
+    assert len(history) == 2
+    assert not history.can_redo()
+
+
+def test_import_undo_removes_exactly_the_added_items() -> None:
+    g, a, _, _ = _graph()
+    nodes = tuple(Node(id=NodeId.new(), text=str(i)) for i in range(1000))
+    edges = tuple(Edge(id=EdgeId.new(), source=a.id, target=n.id) for n in nodes)
+    for node in nodes:
+        g.add_node(node)
+    g.add_edges(edges)
+    history = UndoHistory()
+    history.push(Command("Import", (AddItems(nodes=nodes, edges=edges),)))
+
+    history.undo(g)
+    assert len(g.nodes) == 2
+    assert len(g.edges) == 1
+    history.redo(g)
+    assert len(g.nodes) == 1002
+    assert len(g.edges) == 1001
+
+
+def test_delete_undo_via_remove_items() -> None:
+    g, _, b, e = _graph()
+    history = UndoHistory()
+    snapshot = delete_nodes_and_edges(g, {b.id.value}, set())
+    history.push(Command("Delete", (RemoveItems.from_snapshot(snapshot),)))
+    assert e.id.value not in g.edges
+
+    history.undo(g)
+    assert g.nodes[b.id.value] is b
+    assert g.edges[e.id.value] is e
+
+
+def test_byte_budget_evicts_oldest_entries() -> None:
+    g, a, _, _ = _graph()
+    history = UndoHistory(byte_budget=2000)
+    for i in range(50):
+        change = MoveNodes(node_ids=(a.id.value,), before=((float(i), 0.0),), after=((float(i + 1), 0.0),))
+        history.push(Command("Move", (change,)))
+    kept = len(history)
+    assert 1 <= kept < 50
+    assert history.nbytes <= 2000
+    while history.undo(g) is not None:
+        pass
+    assert a.x == 50.0 - kept
@@ -2,7 +2,8 @@ from datetime import date, datetime
 
 import pytest
 
-from brainmap_for_writing.importer import ImportErrorDetail, import_txt_lines
+from brainmap_for_writing.core import Graph
+from brainmap_for_writing.importer import ImportErrorDetail, get_marker_grammar, import_txt_lines, import_txt_lines_lenient
 
 
 def test_import_txt_lines_creates_dated_nodes() -> None:
@@ -52,3 +53,77 @@ def test_import_txt_lines_creates_undated_blocks_split_by_blank_lines() -> None:
 def test_import_txt_lines_empty_raises() -> None:
     with pytest.raises(ImportErrorDetail):
         import_txt_lines(["\n", "\n"])
+
+
+def test_import_txt_lines_auto_link_chains_dated_nodes() -> None:
+    lines = [
+        "【2200.01.01】\n",
+        "A\n",
+        "【2200.02.01】\n",
+        "B\n",
+        "【2200.03.01】\n",
+        "C\n",
+    ]
+    graph = import_txt_lines(lines, auto_link=True)
+    by_text = {n.text: n.id.value for n in graph.iter_nodes()}
+    pairs = {(e.source.value, e.target.value) for e in graph.iter_edges()}
+    assert pairs == {(by_text["A"], by_text["B"]), (by_text["B"], by_text["C"])}
+
+
+def test_import_txt_lines_with_alternate_marker_formats() -> None:
+    grammar = get_marker_grammar(["bracket", "square", "cjk", "stardate"])
+    lines = [
+        "【2200.01.01】\n",
+        "A\n",
+        "[2200-02-03 04:05]\n",
+        "B\n",
+        "2200年3月4日\n",
+        "C\n",
+        "Stardate 2201.5\n",
+        "D\n",
+    ]
+    graph = import_txt_lines(lines, grammar=grammar)
+    by_text = {n.text: n.event_date for n in graph.iter_nodes()}
+    assert by_text["A"] == datetime(2200, 1, 1)
+    assert by_text["B"] == datetime(2200, 2, 3, 4, 5)
+    assert by_text["C"] == datetime(2200, 3, 4)
+    assert by_text["D"] == datetime(2201, 7, 2, 12)
+
+
+def test_default_grammar_ignores_other_formats() -> None:
+    graph = import_txt_lines(["[2200-01-01]\n", "body\n"])
+    assert [n.event_date for n in graph.iter_nodes()] == [None]
+
+
+def test_import_txt_lines_uses_project_marker_formats() -> None:
+    existing = Graph(marker_formats=["square"])
+    graph = import_txt_lines(["[2200-01-01]\n", "body\n"], existing_graph=existing)
+    assert [n.event_date for n in graph.iter_nodes()] == [datetime(2200, 1, 1)]
+
+
+def test_invalid_alternate_marker_reports_line() -> None:
+    with pytest.raises(ImportErrorDetail) as exc:
+        import_txt_lines(["x\n", "2200年2月30日\n"], grammar=get_marker_grammar(["cjk"]))
+    assert exc.value.line_number == 2
+
+
+def test_import_txt_lines_lenient_collects_all_errors() -> None:
+    lines = [
+        "【2200.01.01】\n",
+        "A\n",
+        "【2200.02.30】\n",
+        "dropped\n",
+        "【2200.03.01】\n",
+        "C\n",
+        "  【2200.13.01】\n",
+        "also dropped\n",
+    ]
+    report = import_txt_lines_lenient(lines)
+    assert not report.ok
+    assert [(e.line_number, e.span) for e in report.errors] == [(3, (0, 12)), (7, (2, 14))]
+    assert sorted(n.text for n in report.graph.iter_nodes()) == ["A", "C"]
+
+
+def test_import_txt_lines_lenient_reports_empty_input() -> None:
+    report = import_txt_lines_lenient(["\n"])
+    assert [e.message for e in report.errors] == ["No nodes could be imported"]
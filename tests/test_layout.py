@@ -1,7 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from brainmap_for_writing.core import Graph, Node, NodeId
-from brainmap_for_writing.layout import assign_default_layout, assign_default_layout_for_new_nodes
+import pytest
+
+from brainmap_for_writing.core import Edge, EdgeId, Graph, Node, NodeId
+from brainmap_for_writing.layout import (
+    LayoutCancelled,
+    LayoutConfig,
+    assign_default_layout,
+    assign_default_layout_for_new_nodes,
+    assign_layered_layout,
+    assign_timeline_layout,
+    layout_snapshot,
+    remove_overlaps,
+)
 
 
 def test_layout_places_later_dates_more_right() -> None:
@@ -24,3 +35,206 @@ def test_layout_for_new_nodes_does_not_move_existing() -> None:
 
     assign_default_layout_for_new_nodes(g, [new_node.id.value])
     assert (existing.x, existing.y) == (111, 222)
+
+
+def test_layout_for_new_nodes_wraps_into_bands_right_of_existing() -> None:
+    g = Graph()
+    g.add_node(Node(id=NodeId.new(), text="a", x=500, y=50))
+    new_nodes = [
+        Node(id=NodeId.new(), text=str(i), event_date=datetime(2200, 1, 1) + timedelta(days=i // 2))
+        for i in range(40)
+    ]
+    for n in new_nodes:
+        g.add_node(n)
+
+    cfg = LayoutConfig(band_columns=5, band_rows=3)
+    assign_default_layout_for_new_nodes(g, [n.id.value for n in new_nodes], cfg)
+
+    assert min(n.x for n in new_nodes) == 500 + cfg.column_width
+    assert max(n.x for n in new_nodes) == 500 + 5 * cfg.column_width
+    assert min(n.y for n in new_nodes) == 50
+    assert len({(n.x, n.y) for n in new_nodes}) == len(new_nodes)
+    by_date = sorted(new_nodes, key=lambda n: n.event_date)
+    assert by_date[0].x == by_date[1].x
+    assert g.bounds is not None and g.bounds.max_x == max(n.x for n in g.iter_nodes())
+
+
+def test_layout_for_new_nodes_uses_maintained_bounds() -> None:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="a", x=10, y=10)
+    g.add_node(a)
+    first = Node(id=NodeId.new(), text="b")
+    g.add_node(first)
+    assign_default_layout_for_new_nodes(g, [first.id.value])
+
+    g.include_position(900, 5)
+    second = Node(id=NodeId.new(), text="c")
+    g.add_node(second)
+    assign_default_layout_for_new_nodes(g, [second.id.value])
+    assert (second.x, second.y) == (900 + LayoutConfig().column_width, 5)
+
+
+def test_layered_layout_respects_edges_and_dates() -> None:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="a")
+    b = Node(id=NodeId.new(), text="b")
+    c = Node(id=NodeId.new(), text="c", event_date=datetime(2200, 1, 1))
+    d = Node(id=NodeId.new(), text="d", event_date=datetime(2200, 2, 1))
+    for n in (a, b, c, d):
+        g.add_node(n)
+    g.add_edge(Edge(id=EdgeId.new(), source=a.id, target=b.id))
+    # Points back in time: laid out as if reversed.
+    g.add_edge(Edge(id=EdgeId.new(), source=d.id, target=c.id))
+
+    assign_layered_layout(g)
+    assert b.x > a.x
+    assert d.x > c.x
+
+
+def test_layered_layout_survives_cycles() -> None:
+    g = Graph()
+    nodes = [Node(id=NodeId.new(), text=str(i)) for i in range(3)]
+    for n in nodes:
+        g.add_node(n)
+    for i in range(3):
+        g.add_edge(Edge(id=EdgeId.new(), source=nodes[i].id, target=nodes[(i + 1) % 3].id))
+    assign_layered_layout(g)
+    assert len({(n.x, n.y) for n in nodes}) == 3
+
+
+def test_layered_layout_removes_simple_crossing() -> None:
+    g = Graph()
+    day1 = datetime(2200, 1, 1)
+    day2 = datetime(2200, 1, 2)
+    s1 = Node(id=NodeId("node_a"), text="s1", event_date=day1)
+    s2 = Node(id=NodeId("node_b"), text="s2", event_date=day1)
+    t1 = Node(id=NodeId("node_c"), text="t1", event_date=day2)
+    t2 = Node(id=NodeId("node_d"), text="t2", event_date=day2)
+    for n in (s1, s2, t1, t2):
+        g.add_node(n)
+    g.add_edge(Edge(id=EdgeId.new(), source=s1.id, target=t2.id))
+    g.add_edge(Edge(id=EdgeId.new(), source=s2.id, target=t1.id))
+
+    assign_layered_layout(g)
+    assert (s1.y < s2.y) == (t2.y < t1.y)
+    assert abs(s1.y - s2.y) >= LayoutConfig().row_height
+
+
+def test_timeline_layout_scales_x_with_time_and_packs_rows() -> None:
+    g = Graph()
+    a = Node(id=NodeId("node_a"), text="a", event_date=datetime(2200, 1, 1))
+    b = Node(id=NodeId("node_b"), text="b", event_date=datetime(2200, 1, 1))
+    c = Node(id=NodeId("node_c"), text="c", event_date=datetime(2200, 1, 11))
+    d = Node(id=NodeId("node_d"), text="d", event_date=datetime(2300, 1, 1))
+    u = Node(id=NodeId("node_u"), text="u")
+    for n in (a, b, c, d, u):
+        g.add_node(n)
+
+    cfg = LayoutConfig(pixels_per_day=10.0, timeline_node_width=50.0)
+    assign_timeline_layout(g, cfg)
+    assert a.x == b.x
+    assert a.y != b.y
+    assert c.x - a.x == 100.0
+    assert c.y == a.y
+    assert d.x - a.x == (datetime(2300, 1, 1) - datetime(2200, 1, 1)).days * 10.0
+    assert u.x < a.x
+
+
+def test_timeline_layout_rows_equal_max_overlap() -> None:
+    g = Graph()
+    start = datetime(2200, 1, 1)
+    for i in range(100):
+        g.add_node(Node(id=NodeId.new(), text=str(i), event_date=start + timedelta(days=i)))
+    cfg = LayoutConfig(pixels_per_day=10.0, timeline_node_width=35.0)
+    assign_timeline_layout(g, cfg)
+    assert len({n.y for n in g.iter_nodes()}) == 4
+
+
+def test_layout_progress_and_cancel_on_snapshot() -> None:
+    g = Graph()
+    nodes = [Node(id=NodeId.new(), text=str(i), event_date=datetime(2200, 1, 1 + i), x=-5, y=-5) for i in range(5)]
+    for n in nodes:
+        g.add_node(n)
+    g.add_edge(Edge(id=EdgeId.new(), source=nodes[0].id, target=nodes[1].id))
+
+    seen: list[float] = []
+    snap = layout_snapshot(g)
+    assign_layered_layout(snap, progress=seen.append)
+    assert seen[-1] == 1.0
+    assert seen == sorted(seen)
+    assert all((n.x, n.y) == (-5, -5) for n in nodes)
+
+    def cancel(_fraction: float) -> None:
+        raise LayoutCancelled()
+
+    with pytest.raises(LayoutCancelled):
+        assign_timeline_layout(layout_snapshot(g), progress=cancel)
+
+
+def test_remove_overlaps_separates_nodes_with_minimal_moves() -> None:
+    g = Graph()
+    nodes = [Node(id=NodeId.new(), text=str(i), x=(i % 5) * 10.0, y=(i // 5) * 10.0) for i in range(25)]
+    far = Node(id=NodeId.new(), text="far", x=5000.0, y=5000.0)
+    for node in nodes + [far]:
+        g.add_node(node)
+
+    moved = remove_overlaps(g, 60.0, 50.0)
+    assert far.id.value not in moved
+    assert (far.x, far.y) == (5000.0, 5000.0)
+    for i, a in enumerate(nodes):
+        for b in nodes[i + 1 :]:
+            assert abs(a.x - b.x) >= 60.0 or abs(a.y - b.y) >= 50.0
+
+
+def test_remove_overlaps_only_moves_selection_and_respects_pins() -> None:
+    g = Graph()
+    fixed = Node(id=NodeId.new(), text="fixed", x=0.0, y=0.0)
+    pinned = Node(id=NodeId.new(), text="pinned", x=70.0, y=0.0, pinned=True)
+    mover = Node(id=NodeId.new(), text="mover", x=10.0, y=5.0)
+    for node in (fixed, pinned, mover):
+        g.add_node(node)
+
+    moved = remove_overlaps(g, 30.0, 30.0, node_ids=[mover.id.value, pinned.id.value])
+    assert moved == {mover.id.value}
+    assert (fixed.x, fixed.y) == (0.0, 0.0)
+    assert (pinned.x, pinned.y) == (70.0, 0.0)
+    for other in (fixed, pinned):
+        assert abs(mover.x - other.x) >= 30.0 or abs(mover.y - other.y) >= 30.0
+
+
+def _overlapping_pairs(nodes: list[Node], width: float, height: float) -> int:
+    nodes = sorted(nodes, key=lambda n: n.x)
+    count = 0
+    for i, a in enumerate(nodes):
+        for b in nodes[i + 1 :]:
+            if b.x - a.x >= width:
+                break
+            if abs(a.y - b.y) < height:
+                count += 1
+    return count
+
+
+def test_remove_overlaps_clears_dense_default_layout_column() -> None:
+    g = Graph()
+    for i in range(3000):
+        g.add_node(Node(id=NodeId.new(), text=str(i)))
+    assign_default_layout(g)
+    nodes = list(g.iter_nodes())
+    assert _overlapping_pairs(nodes, 90.0, 60.0) > 0
+
+    remove_overlaps(g, 90.0, 60.0)
+    assert _overlapping_pairs(nodes, 90.0, 60.0) == 0
+
+
+@pytest.mark.parametrize("count", [50, 2000])
+def test_remove_overlaps_spreads_coincident_nodes(count: int) -> None:
+    g = Graph()
+    anchor = Node(id=NodeId.new(), text="anchor", x=100.0, y=100.0, pinned=True)
+    g.add_node(anchor)
+    for i in range(count):
+        g.add_node(Node(id=NodeId.new(), text=str(i), x=100.0, y=100.0))
+
+    moved = remove_overlaps(g, 60.0, 40.0)
+    assert len(moved) == count
+    assert (anchor.x, anchor.y) == (100.0, 100.0)
+    assert _overlapping_pairs(list(g.iter_nodes()), 60.0, 40.0) == 0
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+from brainmap_for_writing.core import Edge, EdgeId, Graph, Node, NodeId
+from brainmap_for_writing.linking import link_chronologically
+
+
+def test_link_chronologically_chains_dated_nodes_in_order() -> None:
+    g = Graph()
+    c = Node(id=NodeId.new(), text="c", event_date=datetime(2200, 3, 1))
+    a = Node(id=NodeId.new(), text="a", event_date=datetime(2200, 1, 1))
+    u = Node(id=NodeId.new(), text="u")
+    b = Node(id=NodeId.new(), text="b", event_date=datetime(2200, 2, 1))
+    for n in (c, a, u, b):
+        g.add_node(n)
+
+    edges = link_chronologically(g)
+    pairs = {(e.source.value, e.target.value) for e in edges}
+    assert pairs == {(a.id.value, b.id.value), (b.id.value, c.id.value)}
+    assert len(g.edges) == 2
+
+
+def test_link_chronologically_per_color_and_skips_existing() -> None:
+    g = Graph()
+    r1 = Node(id=NodeId.new(), text="r1", event_date=datetime(2200, 1, 1), color="#ff0000")
+    b1 = Node(id=NodeId.new(), text="b1", event_date=datetime(2200, 1, 2), color="#0000ff")
+    r2 = Node(id=NodeId.new(), text="r2", event_date=datetime(2200, 1, 3), color="#ff0000")
+    b2 = Node(id=NodeId.new(), text="b2", event_date=datetime(2200, 1, 4), color="#0000ff")
+    for n in (r1, b1, r2, b2):
+        g.add_node(n)
+    g.add_edge(Edge(id=EdgeId.new(), source=r1.id, target=r2.id))
+
+    edges = link_chronologically(g, per_color=True)
+    assert [(e.source.value, e.target.value) for e in edges] == [(b1.id.value, b2.id.value)]
+    assert len(g.edges) == 2
+
+
+def test_add_edges_validates_before_inserting() -> None:
+    g = Graph()
+    a = Node(id=NodeId.new(), text="a")
+    g.add_node(a)
+    ok = Edge(id=EdgeId.new(), source=a.id, target=a.id)
+    bad = Edge(id=EdgeId.new(), source=a.id, target=NodeId("missing"))
+    with pytest.raises(ValueError):
+        g.add_edges([ok, bad])
+    assert g.edges == {}
@@ -0,0 +1,46 @@
+import numpy as np
+
+from brainmap_for_writing.minimap import BACKGROUND, DOT, MinimapRaster
+from brainmap_for_writing.spatial_index import SpatialGrid
+
+
+def _full_render(grid: SpatialGrid, bounds) -> np.ndarray:
+    raster = MinimapRaster(128, 96, bounds, tile_size=16)
+    raster.redraw(grid)
+    return raster.pixels
+
+
+def test_redraw_of_dirty_tiles_matches_a_full_render() -> None:
+    rng = np.random.default_rng(5)
+    bounds = (0.0, 0.0, 1000.0, 800.0)
+    grid = SpatialGrid(cell_size=64.0)
+    grid.update((f"n{i}", float(x), float(y)) for i, (x, y) in enumerate(rng.uniform(0, 800, (300, 2))))
+    raster = MinimapRaster(128, 96, bounds, tile_size=16)
+    raster.redraw(grid)
+    assert not raster.dirty
+
+    for i in range(0, 300, 37):
+        old = grid.position(f"n{i}")
+        new = tuple(rng.uniform(0, 800, 2))
+        grid.move(f"n{i}", *new)
+        raster.mark((old, new))
+    raster.mark((grid.position("n1"),))
+    grid.remove("n1")
+    rects = raster.redraw(grid)
+
+    assert 0 < len(rects) < 48
+    assert np.array_equal(raster.pixels, _full_render(grid, bounds))
+
+
+def test_points_map_into_the_centred_raster() -> None:
+    raster = MinimapRaster(100, 50, (0.0, 0.0, 100.0, 100.0), tile_size=10)
+    assert raster.scale == 0.5
+    assert raster.to_pixels(0.0, 0.0) == (25.0, 0.0)
+    assert raster.to_scene(75.0, 50.0) == (100.0, 100.0)
+    assert raster.contains(50.0, 50.0) and not raster.contains(-60.0, 50.0)
+
+    grid = SpatialGrid()
+    grid.insert("a", 50.0, 50.0)
+    raster.redraw(grid)
+    assert raster.pixels[25, 50] == DOT and raster.pixels[26, 51] == DOT
+    assert raster.pixels[0, 0] == BACKGROUND
@@ -105,3 +105,24 @@ def test_load_project_defaults_node_memory_and_story_path(tmp_path: Path) -> Non
     n = g.get_node(NodeId("node_1"))
     assert n.memory_block == ""
     assert n.story_txt_path is None
+
+
+def test_marker_formats_roundtrip(tmp_path: Path) -> None:
+    g = Graph(marker_formats=["bracket", "square"])
+    p = tmp_path / "p.json"
+    save_project(p, g)
+    assert load_project(p).marker_formats == ["bracket", "square"]
+
+
+def test_pinned_roundtrip_and_default(tmp_path: Path) -> None:
+    g = Graph()
+    pinned = Node(id=NodeId.new(), text="p", pinned=True)
+    g.add_node(pinned)
+    p = tmp_path / "p.json"
+    save_project(p, g)
+    assert load_project(p).get_node(pinned.id).pinned is True
+
+    raw = json.loads(p.read_text(encoding="utf-8"))
+    del raw["nodes"][0]["pinned"]
+    p.write_text(json.dumps(raw), encoding="utf-8")
+    assert load_project(p).get_node(pinned.id).pinned is False
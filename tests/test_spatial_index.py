@@ -0,0 +1,46 @@
+import random
+
+from brainmap_for_writing.core import Graph, Node, NodeId
+from brainmap_for_writing.spatial_index import SpatialGrid
+
+
+def test_query_matches_brute_force_after_moves_and_removals() -> None:
+    rng = random.Random(3)
+    grid = SpatialGrid(cell_size=50.0)
+    points = {}
+    for i in range(400):
+        points[f"n{i}"] = (rng.uniform(-500, 500), rng.uniform(-500, 500))
+        grid.insert(f"n{i}", *points[f"n{i}"])
+    for i in range(0, 400, 3):
+        points[f"n{i}"] = (rng.uniform(-500, 500), rng.uniform(-500, 500))
+        grid.move(f"n{i}", *points[f"n{i}"])
+    for i in range(0, 400, 7):
+        del points[f"n{i}"]
+        grid.remove(f"n{i}")
+    grid.remove("missing")
+
+    assert len(grid) == len(points)
+    for _ in range(20):
+        x0, y0 = rng.uniform(-600, 400), rng.uniform(-600, 400)
+        x1, y1 = x0 + rng.uniform(0, 800), y0 + rng.uniform(0, 800)
+        expected = {k for k, (x, y) in points.items() if x0 <= x <= x1 and y0 <= y <= y1}
+        assert set(grid.query(x0, y0, x1, y1)) == expected
+
+
+def test_query_gives_up_past_limit() -> None:
+    grid = SpatialGrid(cell_size=10.0)
+    grid.update((f"n{i}", float(i), 0.0) for i in range(100))
+    assert grid.query(-1, -1, 200, 1, limit=99) is None
+    assert len(grid.query(-1, -1, 200, 1, limit=100)) == 100
+    assert sorted(grid.query(4.5, -1, 7.5, 1, limit=5)) == ["n5", "n6", "n7"]
+
+
+def test_from_graph_indexes_node_positions() -> None:
+    graph = Graph()
+    a = Node(id=NodeId.new(), text="a", x=10.0, y=10.0)
+    b = Node(id=NodeId.new(), text="b", x=2000.0, y=-30.0)
+    graph.add_node(a)
+    graph.add_node(b)
+    grid = SpatialGrid.from_graph(graph)
+    assert a.id.value in grid and b.id.value in grid
+    assert grid.query(0, 0, 100, 100) == [a.id.value]
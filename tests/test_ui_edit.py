@@ -0,0 +1,67 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from brainmap_for_writing import ui  # noqa: E402
+from brainmap_for_writing.core import Graph, Node, NodeId  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_toolbar_node_edit_can_be_undone_and_redone(app, monkeypatch) -> None:
+    window = ui.MainWindow()
+    graph = Graph()
+    node = Node(id=NodeId.new(), text="before", event_date=datetime(2024, 1, 1))
+    graph.add_node(node)
+    window._graph = graph
+    window._scene.load_graph(graph)
+    item = window._scene._node_items[node.id.value]
+    item.setSelected(True)
+
+    monkeypatch.setattr(ui.NodeEditDialog, "exec", lambda self: QtWidgets.QDialog.Accepted)
+    monkeypatch.setattr(ui.NodeEditDialog, "get_values", lambda self: (datetime(2024, 2, 2), "after"))
+    window._edit_selected_node()
+    assert graph.nodes[node.id.value].text == "after"
+    assert graph.nodes[node.id.value].event_date == datetime(2024, 2, 2)
+
+    window._scene.undo()
+    assert graph.nodes[node.id.value].text == "before"
+    assert graph.nodes[node.id.value].event_date == datetime(2024, 1, 1)
+
+    window._scene.redo()
+    assert graph.nodes[node.id.value].text == "after"
+    assert graph.nodes[node.id.value].event_date == datetime(2024, 2, 2)
+    window.close()
+
+
+def test_force_layout_run_is_one_undo_step(app) -> None:
+    window = ui.MainWindow()
+    graph = Graph()
+    for i in range(20):
+        graph.add_node(Node(id=NodeId.new(), text=str(i), x=float(i % 5), y=float(i // 5)))
+    window._graph = graph
+    window._scene.load_graph(graph)
+    start = {nid: (n.x, n.y) for nid, n in graph.nodes.items()}
+
+    window._toggle_force_layout(True)
+    deadline = time.monotonic() + 30.0
+    while window._force_worker is not None and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert window._force_worker is None
+    end = {nid: (n.x, n.y) for nid, n in graph.nodes.items()}
+    assert end != start
+
+    window._scene.undo()
+    assert {nid: (n.x, n.y) for nid, n in graph.nodes.items()} == start
+    window._scene.redo()
+    assert {nid: (n.x, n.y) for nid, n in graph.nodes.items()} == end
+    window.close()
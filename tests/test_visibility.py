@@ -1,5 +1,7 @@
+import random
+
 from brainmap_for_writing.core import Edge, EdgeId, Graph, Node, NodeId
-from brainmap_for_writing.visibility import compute_visible_nodes
+from brainmap_for_writing.visibility import VisibilityIndex, compute_visible_nodes
 
 
 def test_build_ai_prompt_uses_upstream_memory_and_target_text() -> None:
@@ -102,3 +104,101 @@ def test_collapse_one_branch_keeps_other_branch() -> None:
     e1.collapsed = True
     visible = compute_visible_nodes(g)
     assert visible == {a.id.value, c.id.value}
+
+
+def test_visibility_index_reports_deltas_for_toggles() -> None:
+    g = Graph()
+    a, b, c, d = (Node(id=NodeId.new(), text=t) for t in "ABCD")
+    for n in (a, b, c, d):
+        g.add_node(n)
+    ab = Edge(id=EdgeId.new(), source=a.id, target=b.id)
+    bc = Edge(id=EdgeId.new(), source=b.id, target=c.id)
+    ad = Edge(id=EdgeId.new(), source=a.id, target=d.id)
+    dc = Edge(id=EdgeId.new(), source=d.id, target=c.id)
+    for e in (ab, bc, ad, dc):
+        g.add_edge(e)
+
+    index = VisibilityIndex(g)
+    delta = index.set_collapsed(ab.id.value, True)
+    assert delta.hidden == {b.id.value}
+    assert not delta.shown
+    delta = index.set_collapsed(ad.id.value, True)
+    assert delta.hidden == {c.id.value, d.id.value}
+    delta = index.set_collapsed(ab.id.value, False)
+    assert delta.shown == {b.id.value, c.id.value}
+    assert not index.set_collapsed(ab.id.value, False)
+    assert index.visible == compute_visible_nodes(g)
+
+
+def test_visibility_index_matches_full_recompute_with_cycles() -> None:
+    rng = random.Random(7)
+    for _ in range(20):
+        g = Graph()
+        nodes = [Node(id=NodeId.new(), text=str(i)) for i in range(12)]
+        for n in nodes:
+            g.add_node(n)
+        edges = []
+        for _ in range(18):
+            s, t = rng.sample(nodes, 2)
+            edge = Edge(id=EdgeId.new(), source=s.id, target=t.id)
+            g.add_edge(edge)
+            edges.append(edge)
+
+        index = VisibilityIndex(g)
+        assert index.visible == compute_visible_nodes(g)
+        for _ in range(40):
+            edge = rng.choice(edges)
+            before = set(index.visible)
+            delta = index.set_collapsed(edge.id.value, not edge.collapsed)
+            expected = compute_visible_nodes(g)
+            assert index.visible == expected
+            assert delta.shown == expected - before
+            assert delta.hidden == before - expected
+
+
+def test_visibility_index_add_and_remove_items_match_full_recompute() -> None:
+    from brainmap_for_writing.edit_ops import delete_nodes_and_edges, undo_delete
+
+    rng = random.Random(5)
+    for trial in range(60):
+        g = Graph()
+        nodes = [Node(id=NodeId.new(), text=str(i)) for i in range(14)]
+        for n in nodes:
+            g.add_node(n)
+        for _ in range(rng.randint(5, 25)):
+            i, j = rng.sample(range(14), 2)
+            if trial % 2 == 0 and i > j:
+                i, j = j, i
+            g.add_edge(Edge(id=EdgeId.new(), source=nodes[i].id, target=nodes[j].id, collapsed=rng.random() < 0.2))
+
+        index = VisibilityIndex(g)
+        deleted = []
+        for _ in range(10):
+            before = set(index.visible)
+            before_nodes = set(g.nodes)
+            if rng.random() < 0.4 and g.nodes:
+                snap = delete_nodes_and_edges(g, {rng.choice(list(g.nodes))}, set(), index.incident_edges)
+                delta = index.remove_items(snap.nodes, snap.edges)
+                deleted.append(snap)
+            elif deleted and rng.random() < 0.5:
+                snap = deleted.pop()
+                undo_delete(g, snap)
+                delta = index.add_items(snap.nodes, snap.edges)
+            else:
+                new = [Node(id=NodeId.new(), text="") for _ in range(rng.randint(0, 2))]
+                for n in new:
+                    g.add_node(n)
+                ids = list(g.nodes)
+                edges = []
+                for _ in range(rng.randint(0, 3) if len(ids) > 1 else 0):
+                    s, t = rng.sample(ids, 2)
+                    edge = Edge(id=EdgeId.new(), source=NodeId(s), target=NodeId(t), collapsed=rng.random() < 0.2)
+                    g.add_edge(edge)
+                    edges.append(edge)
+                delta = index.add_items(new, edges)
+
+            expected = compute_visible_nodes(g)
+            present = set(g.nodes)
+            assert index.visible == expected
+            assert delta.shown == expected - before
+            assert delta.hidden == ((before & present) | (present - before_nodes)) - expected